@@ -0,0 +1,134 @@
+"""
+Unique-viewer counting: HyperLogLog sketch vs a naive viewer-id array.
+
+    python -m benchmarks.hll_benchmark [--views 1000000] [--unique 200000]
+                                       [--views-per-flush 1000]
+
+한 포스트에 views 번의 조회가 unique 명의 방문자에게서 온다고 가정하고 비교한다.
+- array: 조회마다 viewers 배열에 $addToSet (배열 전체를 검사하고, 새 방문자면 문서를 다시 씀)
+- hll: BufferedPostRepository 처럼 메모리 스케치에 모았다가 views_per_flush 마다
+  저장된 스케치(2 KB)와 합쳐 한 번 씀
+저장 엔진은 문서 단위로 다시 쓰므로, 쓰기 비용은 (쓰기 횟수, 다시 쓴 문서 바이트) 로 본다.
+"""
+
+import argparse
+import random
+import time
+
+import bson
+from bson import Binary, ObjectId
+
+from src.infrastructure.hyperloglog import STANDARD_ERROR, HyperLogLog
+
+MAX_DOCUMENT_BYTES = 16 * 1024 * 1024
+
+
+def view_stream(views: int, unique: int) -> list[str]:
+    rng = random.Random(0)
+    viewers = [f"user:{ObjectId()}" for _ in range(unique)]
+    # 모든 방문자가 한 번은 조회하고 나머지는 무작위로 다시 조회
+    stream = viewers + [rng.choice(viewers) for _ in range(views - unique)]
+    rng.shuffle(stream)
+    return stream
+
+
+def array_element_bytes(index: int, viewer_id: str) -> int:
+    # BSON 배열 원소: type(1) + key(인덱스 문자열 + NUL) + string(길이 4 + 본문 + NUL)
+    return 1 + len(str(index)) + 1 + 4 + len(viewer_id.encode()) + 1
+
+
+def measure_array(stream: list[str]):
+    viewers: list[str] = []
+    seen: set[str] = set()
+    array_bytes = 0
+    writes = 0
+    rewritten_bytes = 0
+    scanned = 0
+
+    started = time.perf_counter()
+    for viewer_id in stream:
+        # $addToSet 은 배열을 처음부터 비교하므로 원소 수만큼 검사
+        scanned += len(viewers)
+        if viewer_id in seen:
+            continue
+        seen.add(viewer_id)
+        array_bytes += array_element_bytes(len(viewers), viewer_id)
+        viewers.append(viewer_id)
+        writes += 1
+        rewritten_bytes += array_bytes
+    elapsed = time.perf_counter() - started
+
+    document_bytes = len(bson.encode({"viewers": viewers}))
+    return {
+        "count": len(viewers),
+        "document_bytes": document_bytes,
+        "writes": writes,
+        "rewritten_bytes": rewritten_bytes,
+        "scanned": scanned,
+        "seconds": elapsed,
+    }
+
+
+def measure_hll(stream: list[str], views_per_flush: int):
+    stored = HyperLogLog()
+    buffered = HyperLogLog()
+    writes = 0
+
+    started = time.perf_counter()
+    for i, viewer_id in enumerate(stream, 1):
+        buffered.add(viewer_id)
+        if i % views_per_flush == 0 or i == len(stream):
+            if stored.merge(buffered):
+                writes += 1
+            buffered = HyperLogLog()
+    elapsed = time.perf_counter() - started
+
+    document_bytes = len(
+        bson.encode(
+            {"viewers_hll": Binary(stored.to_bytes()), "unique_viewers": 0}
+        )
+    )
+    return {
+        "count": stored.estimate(),
+        "document_bytes": document_bytes,
+        "writes": writes,
+        "rewritten_bytes": writes * document_bytes,
+        "seconds": elapsed,
+    }
+
+
+def main(views: int, unique: int, views_per_flush: int):
+    stream = view_stream(views, unique)
+    print(f"{views:,} views from {unique:,} viewers")
+
+    array = measure_array(stream)
+    hll = measure_hll(stream, views_per_flush)
+
+    for label, result in (("array", array), ("hll", hll)):
+        print(
+            f"{label:<6} count {result['count']:>9,}"
+            f"   document {result['document_bytes'] / 1024:>9,.1f} KB"
+            f"   writes {result['writes']:>8,}"
+            f"   rewritten {result['rewritten_bytes'] / 1024 / 1024:>10,.1f} MB"
+            f"   client {result['seconds'] / views * 1e6:5.2f} µs/view"
+        )
+
+    error = (hll["count"] - unique) / unique
+    too_large = array["document_bytes"] > MAX_DOCUMENT_BYTES
+    print(
+        f"array scans {array['scanned'] / views:,.0f} elements per $addToSet on average"
+        + ("  (exceeds the 16 MB document limit)" if too_large else "")
+    )
+    print(
+        f"hll error {error:+.2%} (standard error ±{STANDARD_ERROR:.1%},"
+        f" ~95% within ±{2 * STANDARD_ERROR:.1%})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--views", type=int, default=1_000_000)
+    parser.add_argument("--unique", type=int, default=200_000)
+    parser.add_argument("--views-per-flush", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.views, args.unique, args.views_per_flush)
@@ -0,0 +1,123 @@
+"""
+Per-document cost of building entities from stored documents.
+
+    python -m benchmarks.hydration_benchmark
+
+저장 문서 -> 엔티티 변환 방식별 비용 비교
+- validate: hydrate (pydantic-core 검증, 현재 방식)
+- construct: 검증 없이 필요한 타입 변환만 파이썬에서 하고 model_construct
+"""
+
+import copy
+import timeit
+from datetime import date, datetime, timedelta
+
+from bson import ObjectId
+
+from src.domain.entities.chat import ChatMessage, ChatSession, MessageRole
+from src.domain.entities.diary import Diary, Emotion
+from src.infrastructure.hydration import hydrate
+from src.infrastructure.mongo_chat_repository import MongoChatRepository
+
+
+def diary_document() -> dict:
+    diary = Diary(
+        id="",
+        user_id=str(ObjectId()),
+        chat_session_id=str(ObjectId()),
+        title="비 오는 날의 산책",
+        content="오늘은 비가 와서 우산을 쓰고 천천히 동네를 걸었다. " * 20,
+        writed_at=date(2026, 3, 1),
+        emotion=Emotion.PEACEFUL,
+        tags=["산책", "비"],
+    )
+    document = diary.model_dump(mode="json", exclude={"id"})
+    document["_id"] = ObjectId()
+    return document
+
+
+def chat_document(message_count: int) -> dict:
+    user_id = str(ObjectId())
+    started_at = datetime(2026, 3, 1, 21, 0)
+    messages = [
+        ChatMessage(
+            user_id=user_id,
+            role=MessageRole.user if i % 2 == 0 else MessageRole.assistant,
+            content=f"{i}번째 메시지입니다. 오늘 있었던 일을 이야기해 주세요.",
+            created_at=started_at + timedelta(seconds=i),
+        )
+        for i in range(message_count)
+    ]
+    session = ChatSession(id="", user_id=user_id, messages=messages)
+    document = session.model_dump(mode="json", exclude={"id", "messages"})
+    document["messages"] = [
+        MongoChatRepository._message_to_document(message) for message in messages
+    ]
+    document["_id"] = ObjectId()
+    return document
+
+
+def construct_diary(document: dict) -> Diary:
+    return Diary.model_construct(
+        id=str(document["_id"]),
+        user_id=document["user_id"],
+        chat_session_id=document["chat_session_id"],
+        title=document["title"],
+        content=document["content"],
+        writed_at=date.fromisoformat(document["writed_at"]),
+        thumbnail_url=document["thumbnail_url"],
+        created_at=datetime.fromisoformat(document["created_at"]),
+        updated_at=datetime.fromisoformat(document["updated_at"]),
+        user_wrote_this_diary_directly=document["user_wrote_this_diary_directly"],
+        emotion=Emotion(document["emotion"]),
+        saved=document["saved"],
+        tags=document["tags"],
+    )
+
+
+def construct_chat_session(document: dict) -> ChatSession:
+    return ChatSession.model_construct(
+        id=str(document["_id"]),
+        user_id=document["user_id"],
+        active=document["active"],
+        messages=[
+            ChatMessage.model_construct(
+                id=str(message["_id"]),
+                user_id=message["user_id"],
+                role=MessageRole(message["role"]),
+                content=message["content"],
+                created_at=datetime.fromisoformat(message["created_at"]),
+            )
+            for message in document["messages"]
+        ],
+        summary=document["summary"],
+        summarized_count=document["summarized_count"],
+        expires_at=document["expires_at"],
+        created_at=datetime.fromisoformat(document["created_at"]),
+        updated_at=datetime.fromisoformat(document["updated_at"]),
+    )
+
+
+def measure(label: str, model: type, construct, document: dict, number: int):
+    # hydrate 는 문서를 수정하므로 매번 복사본 사용 (복사 비용은 양쪽에서 제외)
+    copies = [copy.deepcopy(document) for _ in range(number)]
+    assert hydrate(model, copy.deepcopy(document)) == construct(document)
+
+    validate_s = timeit.timeit(lambda: hydrate(model, copies.pop()), number=number)
+    construct_s = timeit.timeit(lambda: construct(document), number=number)
+    print(
+        f"{label:<28} validate {validate_s / number * 1e6:9.1f} µs"
+        f"   construct {construct_s / number * 1e6:9.1f} µs"
+    )
+
+
+if __name__ == "__main__":
+    measure("Diary", Diary, construct_diary, diary_document(), 20000)
+    for count in (10, 100, 500):
+        measure(
+            f"ChatSession ({count} messages)",
+            ChatSession,
+            construct_chat_session,
+            chat_document(count),
+            300,
+        )
@@ -0,0 +1,209 @@
+"""
+Round trips and latency of one diary write (DiaryService.write_diary).
+
+    python -m benchmarks.write_diary_benchmark [--rtt-ms 2] [--llm-ms 1500] [--writes 20]
+
+호출마다 rtt (LLM 호출은 llm-ms) 만큼 대기하는 가짜 저장소로 실행해, DB 왕복 수와
+LLM 호출 수, 일기 한 편을 쓰는 데 걸린 시간을 비교한다. 무료 체험 유저 기준.
+- baseline: 변경 전 구현의 호출 순서 그대로 (세션 전체 조회 2번, 감정 분석을 요청 안에서 실행,
+  결제 내역 조회, 유저를 읽고 문서 전체를 다시 저장)
+- current (cold): 현재 DiaryService.write_diary, entitlement 캐시가 비어 있을 때
+  (실제 CachedEntitlementRepository + MongoEntitlementRepository 로
+  entitlements -> payments_logs 를 차례로 조회)
+- current (warm): 구독 없음이 negative 캐시에 남아 있을 때
+current 의 감정 분석은 백그라운드 작업으로 옮겨졌으므로 요청 시간에는 포함되지 않는다
+(작업 자체의 DB 왕복과 LLM 호출은 이 측정에 없음).
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, List, cast
+
+from bson import ObjectId
+
+from src.domain.entities.chat import ChatMessage, ChatSession, MessageRole
+from src.domain.entities.diary import Diary, Emotion
+from src.domain.entities.user import User
+from src.domain.services.conversation_window import ConversationWindow
+from src.domain.services.diary_service import DiaryService
+from src.infrastructure.cached_entitlement_repository import (
+    CachedEntitlementRepository,
+)
+from src.infrastructure.mongo_entitlement_repository import MongoEntitlementRepository
+from src.infrastructure.ttl_cache import TTLCache
+
+DIARY_MESSAGE = """[TITLE_START]
+비 오는 저녁
+[TITLE_END]
+
+[CONTENT_START]
+창문을 타고 흐르는 빗물을 오래 바라보았다. 하루가 천천히 가라앉았다.
+[CONTENT_END]"""
+
+LLM = "llm"
+
+
+class RemoteStub:
+    """Fake repository: every async call costs one round trip of rtt seconds."""
+
+    def __init__(self, calls: List[str], prefix: str, rtt: float, **results: Any):
+        self.calls = calls
+        self.prefix = prefix
+        self.rtt = rtt
+        self.results = results
+
+    def __getattr__(self, name: str) -> Callable:
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            self.calls.append(f"{self.prefix}.{name}")
+            await asyncio.sleep(self.rtt)
+            result = self.results.get(name)
+            return result(*args) if callable(result) else result
+
+        return call
+
+
+class Fixture:
+    def __init__(self, calls: List[str], rtt: float, llm_rtt: float):
+        self.user = User(id=str(ObjectId()), email="bench@example.com", password="x")
+        self.message = ChatMessage(
+            user_id=self.user.id, role=MessageRole.assistant, content=DIARY_MESSAGE
+        )
+        self.session = ChatSession(
+            id=str(ObjectId()),
+            user_id=self.user.id,
+            messages=[self.message],
+        )
+
+        def stub(prefix: str, latency: float = rtt, **results: Any) -> Any:
+            return cast(Any, RemoteStub(calls, prefix, latency, **results))
+
+        self.stub = stub
+        self.llm = stub(LLM, llm_rtt, analyze=Emotion.PEACEFUL)
+
+        # 실제 entitlement 저장소를 가짜 컬렉션 위에서 실행 (구독 없는 유저)
+        entitlement_db = {
+            "dailylog": {
+                MongoEntitlementRepository.collection_name: stub("entitlements"),
+                MongoEntitlementRepository.payments_collection_name: stub(
+                    "payments_logs"
+                ),
+            }
+        }
+        self.entitlement_cache: TTLCache = TTLCache(max_size=100, ttl_seconds=300)
+        self.entitlement_negative_cache: TTLCache = TTLCache(
+            max_size=100, ttl_seconds=60
+        )
+        self.entitlement_repository = CachedEntitlementRepository(
+            MongoEntitlementRepository(cast(Any, entitlement_db)),
+            self.entitlement_cache,
+            self.entitlement_negative_cache,
+        )
+
+    def service(self) -> DiaryService:
+        stub = self.stub
+        return DiaryService(
+            diary_repository=stub("diaries", create=lambda diary: diary),
+            chat_repository=stub("chats", find_message=self.message),
+            ai_chat_bot=stub(LLM),
+            image_generator=stub(LLM),
+            image_storage=stub("r2"),
+            entitlement_repository=self.entitlement_repository,
+            user_repository=stub("users", decrement_free_trial=True),
+            emotion_analyzer=self.llm,
+            job_queue=stub("jobs"),
+            conversation_window=ConversationWindow(),
+            conversation_summarizer=stub(LLM),
+            emotion_rollup_repository=stub("emotion_rollups"),
+            change_generation_repository=stub("change_generations"),
+        )
+
+
+async def baseline_write_diary(fixture: Fixture, session_id: str, message_id: str):
+    # 변경 전 구현의 호출 순서 (repository 메서드 하나가 DB 왕복 하나)
+    chats = fixture.stub("chats", find_session=fixture.session)
+    diaries = fixture.stub("diaries", create=lambda diary: diary)
+    payments = fixture.stub("payments_logs", find_by_user_id=[])
+    users = fixture.stub("users", find_by_id=fixture.user)
+
+    # find_message 는 세션 전체를 읽어서 메시지를 찾음
+    session = await chats.find_session(session_id)
+    content = session.messages[0].content
+    # 감정 분석을 요청 안에서 기다림
+    emotion = await fixture.llm.analyze(content)
+    diary = Diary(
+        id=str(ObjectId()),
+        user_id=session.user_id,
+        chat_session_id=session_id,
+        title="비 오는 저녁",
+        content=content,
+        emotion=emotion,
+    )
+    await diaries.create(diary)
+    # end_chat_session 이 세션 전체를 다시 읽은 뒤 비활성화
+    session = await chats.find_session(session_id)
+    await chats.end_session(session)
+    # 구독 여부를 결제 내역에서 확인
+    payments_logs = await payments.find_by_user_id(session.user_id, None, 1)
+    if not payments_logs:
+        # 유저를 읽고 문서 전체를 replace
+        user = await users.find_by_id(session.user_id)
+        user.free_trial_count -= 1
+        await users.update(user)
+
+
+async def current_write_diary(fixture: Fixture, session_id: str, message_id: str):
+    await fixture.service().write_diary(session_id, message_id)
+
+
+async def measure(
+    label: str,
+    write: Callable,
+    rtt: float,
+    llm_rtt: float,
+    writes: int,
+    warm_cache: bool = False,
+):
+    calls: List[str] = []
+    fixture = Fixture(calls, rtt, llm_rtt)
+    if warm_cache:
+        await fixture.entitlement_repository.has_active_subscription(fixture.user.id)
+        calls.clear()
+
+    elapsed = 0.0
+    for _ in range(writes):
+        if not warm_cache:
+            fixture.entitlement_cache.clear()
+            fixture.entitlement_negative_cache.clear()
+        started = time.perf_counter()
+        await write(fixture, fixture.session.id, fixture.message.id)
+        elapsed += time.perf_counter() - started
+
+    per_write = calls[: len(calls) // writes]
+    db_calls = [call for call in per_write if not call.startswith(f"{LLM}.")]
+    print(
+        f"{label:<16} db round trips {len(db_calls):2d}"
+        f"   llm calls {len(per_write) - len(db_calls)}"
+        f"   latency {elapsed / writes * 1000:8.2f} ms"
+        f"   ({', '.join(per_write)})"
+    )
+
+
+async def main(rtt_ms: float, llm_ms: float, writes: int):
+    rtt = rtt_ms / 1000
+    llm_rtt = llm_ms / 1000
+    print(f"rtt {rtt_ms} ms, llm {llm_ms} ms, {writes} writes (free-trial user)")
+    await measure("baseline", baseline_write_diary, rtt, llm_rtt, writes)
+    await measure("current (cold)", current_write_diary, rtt, llm_rtt, writes)
+    await measure(
+        "current (warm)", current_write_diary, rtt, llm_rtt, writes, warm_cache=True
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--llm-ms", type=float, default=1500.0)
+    parser.add_argument("--writes", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rtt_ms, args.llm_ms, args.writes))
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+
+from src.infrastructure.database import (
+    close_mongo_connection,
+    connect_to_mongo,
+    get_database,
+)
+from src.infrastructure.mongo_entitlement_repository import (
+    MongoEntitlementRepository,
+)
+from src.infrastructure.mongo_refresh_token_repository import (
+    MongoRefreshTokenRepository,
+)
+from src.presentation.container import Container
+
+
+async def rebuild_rollups(container: Container, args: argparse.Namespace):
+    # diaries 에서 emotion_rollups 를 처음부터 다시 계산 (증분 갱신이 어긋났을 때 복구용)
+    count = await container.emotion_rollup_repository.rebuild(args.user_id)
+    target = f"user {args.user_id}" if args.user_id else "all users"
+    print(f"✅ Rebuilt {count} emotion rollup buckets for {target}")
+
+
+async def reindex_search(container: Container, args: argparse.Namespace):
+    # 검색 n-gram 이 없는 기존 일기(또는 토크나이저 변경 후 전체)를 다시 색인
+    count = await container.diary_repository.reindex_search(args.user_id)
+    print(f"✅ Reindexed search grams for {count} diaries")
+
+
+async def backfill_expiry(container: Container, args: argparse.Namespace):
+    # expires_at 필드 도입 이전에 저장된 refresh token 도 TTL 로 정리되도록 채움
+    # 백필은 Mongo 전용 유지보수 작업이라 인터페이스가 아닌 구현체로 실행
+    repository = MongoRefreshTokenRepository(container.db.client)
+    count = await repository.backfill_expires_at(
+        container.jwt_provider.refresh_token_lifetime
+    )
+    print(f"✅ Set expires_at on {count} refresh tokens")
+
+
+async def backfill_entitlements(container: Container, args: argparse.Namespace):
+    # entitlements 도입 이전의 결제 내역으로 유저별 구독 상태를 채움
+    repository = MongoEntitlementRepository(container.db.client)
+    count = await repository.backfill()
+    print(f"✅ Rebuilt entitlements for {count} users from payments_logs")
+
+
+async def check_indexes(container: Container, args: argparse.Namespace):
+    registry = container.index_registry
+    if args.apply:
+        created = await registry.ensure()
+        print(f"✅ Created {len(created)} missing indexes: {created}")
+        for name in registry.failed_indexes():
+            print(f"⚠️  {name}: {registry.index_status[name]}")
+
+    report = await registry.drift()
+    for collection_name, drift in report["collections"].items():
+        required = set(drift["required_drift"])
+        for name in drift["missing"]:
+            label = " (required)" if name in required else ""
+            print(f"⚠️  {collection_name}.{name}: missing{label}")
+        for name, differences in drift["changed"].items():
+            label = " (required)" if name in required else ""
+            print(
+                f"⚠️  {collection_name}.{name}: changed{label}"
+                f" ({'; '.join(differences)})"
+            )
+        for name in drift["extra"]:
+            print(f"   {collection_name}.{name}: not declared by any repository")
+
+    if report["ok"]:
+        print("✅ All required indexes are present")
+    else:
+        raise SystemExit(1)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollups = subparsers.add_parser(
+        "rebuild-rollups", help="Regenerate emotion_rollups from diaries"
+    )
+    rollups.add_argument("--user-id", default=None, help="Only rebuild this user")
+    rollups.set_defaults(handler=rebuild_rollups)
+
+    search = subparsers.add_parser(
+        "reindex-search", help="Recompute diary search grams"
+    )
+    search.add_argument("--user-id", default=None, help="Only reindex this user")
+    search.set_defaults(handler=reindex_search)
+
+    expiry = subparsers.add_parser(
+        "backfill-expiry", help="Set expires_at on legacy refresh tokens"
+    )
+    expiry.set_defaults(handler=backfill_expiry)
+
+    entitlements = subparsers.add_parser(
+        "backfill-entitlements", help="Rebuild entitlements from payments_logs"
+    )
+    entitlements.set_defaults(handler=backfill_entitlements)
+
+    indexes = subparsers.add_parser(
+        "check-indexes", help="Diff declared indexes against the database"
+    )
+    indexes.add_argument(
+        "--apply", action="store_true", help="Create missing indexes first"
+    )
+    indexes.set_defaults(handler=check_indexes)
+
+    return parser
+
+
+async def run(args: argparse.Namespace):
+    await connect_to_mongo()
+    database = get_database()
+    if database is None:
+        raise RuntimeError("Database connection not available")
+
+    container = Container(database)
+    try:
+        await args.handler(container, args)
+    finally:
+        await container.close()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    # 예: python cli.py rebuild-rollups --user-id <user_id>
+    asyncio.run(run(build_parser().parse_args()))
@@ -2,9 +2,23 @@ import os
 import uvicorn
 from src.presentation.api import app
 
+# Railway 프록시는 사설망에서 접속하므로 사설 대역만 신뢰해서 X-Forwarded-For 를 해석
+# (클라이언트가 직접 넣은 값은 신뢰한 프록시 뒤쪽 값이 아니면 무시됨)
+DEFAULT_FORWARDED_ALLOW_IPS = (
+    "127.0.0.1,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,100.64.0.0/10,fd00::/8"
+)
+
 
 if __name__ == "__main__":
     # Railway는 PORT 환경 변수를 동적으로 할당
     # 로컬 개발에서는 기본값 8000 사용
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv(
+            "FORWARDED_ALLOW_IPS", DEFAULT_FORWARDED_ALLOW_IPS
+        ),
+    )
@@ -0,0 +1,59 @@
+from typing import Any
+
+from pydantic import BaseModel, PrivateAttr
+
+
+class ChangeTracking(BaseModel):
+    """
+    Entity base that records which fields changed since it was loaded.
+
+    필드에 값을 대입하면 변경 필드로, increment 로 늘린 필드는 증감량으로 기록해
+    repository 가 문서 전체 대신 바뀐 필드만 $set / $inc 로 저장할 수 있게 한다.
+    리스트를 제자리에서 수정(append 등)한 경우는 감지하지 못하므로 새 값을 대입해야 한다.
+    """
+
+    # model_copy 가 private 값을 얕게 복사하므로 불변 값으로 두고 매번 새로 대입
+    # (대입마다 호출되므로 private 속성은 __pydantic_private__ 로 직접 접근)
+    _changed: frozenset[str] = PrivateAttr(default=frozenset())
+    _increments: dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any):
+        if name in type(self).__pydantic_fields__:
+            private = self.__pydantic_private__
+            assert private is not None
+            if name not in private["_changed"]:
+                private["_changed"] = private["_changed"] | {name}
+            if name in private["_increments"]:
+                # 대입한 값이 증감량보다 우선
+                private["_increments"] = {
+                    field: amount
+                    for field, amount in private["_increments"].items()
+                    if field != name
+                }
+        super().__setattr__(name, value)
+
+    def increment(self, name: str, amount: int = 1):
+        value = getattr(self, name) + amount
+        if name in self._changed:
+            setattr(self, name, value)
+            return
+
+        super().__setattr__(name, value)
+        self._increments = {
+            **self._increments,
+            name: self._increments.get(name, 0) + amount,
+        }
+
+    def changed_fields(self) -> frozenset[str]:
+        return self._changed
+
+    def increments(self) -> dict[str, int]:
+        return dict(self._increments)
+
+    def has_changes(self) -> bool:
+        return bool(self._changed or self._increments)
+
+    def mark_clean(self):
+        """Forget recorded changes (after they were written)."""
+        self._changed = frozenset()
+        self._increments = {}
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
 from bson import ObjectId
 from pydantic import BaseModel, Field
@@ -25,5 +25,10 @@ class ChatSession(BaseModel):
     user_id: str = Field()
     active: bool = Field(default=True)
     messages: List[ChatMessage] = Field()
+    # 이전 대화의 누적 요약과, 요약에 포함된 (system 제외) 메시지 수
+    summary: Optional[str] = Field(default=None)
+    summarized_count: int = Field(default=0)
+    # 일기로 이어지지 않은 세션의 자동 삭제 시각 (None 이면 보관)
+    expires_at: Optional[datetime] = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
@@ -3,6 +3,8 @@ from enum import Enum
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from src.domain.entities.change_tracking import ChangeTracking
+
 
 class Emotion(str, Enum):
     HAPPY = "happy"  # 기쁨, 행복
@@ -27,7 +29,7 @@ class Emotion(str, Enum):
             return 0
 
 
-class Diary(BaseModel):
+class Diary(ChangeTracking):
     id: str = Field()
     user_id: str = Field()
     chat_session_id: str = Field()
@@ -41,3 +43,28 @@ class Diary(BaseModel):
     emotion: Optional[Emotion] = Field(default=None)
     saved: bool = Field(default=False)
     tags: List[str] = Field(default=[])
+
+
+class DiarySummary(BaseModel):
+    """Neighbouring diary reference for next/prev navigation"""
+
+    id: str = Field()
+    writed_at: date = Field()
+    title: Optional[str] = Field(default=None)
+
+
+class EmotionTimelineEntry(BaseModel):
+    """Minimal diary projection for the emotion timeline chart"""
+
+    diary_id: str = Field()
+    writed_at: date = Field()
+    emotion: Emotion = Field()
+    title: Optional[str] = Field(default=None)
+
+
+class EmotionTimeline(BaseModel):
+    entries: List[EmotionTimelineEntry] = Field()
+    # 감정별 일기 수 (많은 순으로 정렬)
+    emotion_counts: dict[str, int] = Field(default_factory=dict)
+    start: Optional[date] = Field(default=None)
+    end: Optional[date] = Field(default=None)
@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class RollupGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+    def bucket_start(self, day: date) -> date:
+        """Start date of the bucket containing day (weeks start on Monday)."""
+        if self is RollupGranularity.WEEK:
+            return day - timedelta(days=day.weekday())
+        elif self is RollupGranularity.MONTH:
+            return day.replace(day=1)
+        else:
+            return day
+
+    def bucket_end(self, day: date) -> date:
+        """Last date of the bucket containing day."""
+        start = self.bucket_start(day)
+        if self is RollupGranularity.WEEK:
+            return start + timedelta(days=6)
+        elif self is RollupGranularity.MONTH:
+            return (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        else:
+            return day
+
+
+class EmotionRollup(BaseModel):
+    """Pre-aggregated emotion counts of one user for one day/week/month bucket"""
+
+    user_id: str = Field()
+    granularity: RollupGranularity = Field()
+    bucket: date = Field(description="First day of the bucket")
+    total_count: int = Field(default=0)
+    emotion_counts: dict[str, int] = Field(default_factory=dict)
+    # 평균 감정 점수 계산용 (Emotion.score 합계)
+    score_sum: int = Field(default=0)
@@ -0,0 +1,22 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.domain.entities.payments_log import UserGrade
+
+
+class Entitlement(BaseModel):
+    user_id: str
+    grade: UserGrade = Field(default=UserGrade.ONE_DIARY_ONE_DAY)
+    # 구독이 끝나는 시각 (end_date 다음 날 0시, 이 시각부터 만료)
+    valid_until: datetime
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    @staticmethod
+    def valid_until_for(end_date: date) -> datetime:
+        # 결제 내역은 end_date 당일까지 유효 (end_date >= today)
+        return datetime.combine(end_date + timedelta(days=1), time.min)
+
+    def is_active(self, now: Optional[datetime] = None) -> bool:
+        return (now or datetime.now()) < self.valid_until
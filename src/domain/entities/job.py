@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, Field
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"  # 실행 대기 (run_at 이후 실행 가능)
+    RUNNING = "running"  # 워커가 점유 중 (locked_until 까지)
+    DEAD = "dead"  # 최대 재시도 횟수 초과 (dead letter)
+
+
+class Job(BaseModel):
+    """Background job persisted in the jobs collection"""
+
+    id: str = Field(default_factory=lambda: str(ObjectId()))
+    name: str = Field(description="Handler name (e.g. diary.analyze_emotion)")
+    payload: dict = Field(default_factory=dict)
+    status: JobStatus = Field(default=JobStatus.PENDING)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=5)
+    run_at: datetime = Field(default_factory=_utcnow)
+    locked_until: Optional[datetime] = Field(default=None)
+    last_error: Optional[str] = Field(default=None)
+    # dead 작업의 자동 삭제 시각 (TTL 인덱스, 그 외 상태에서는 None)
+    expires_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
@@ -0,0 +1,18 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a cursor-paginated list"""
+
+    items: List[T] = Field()
+    next_cursor: Optional[str] = Field(
+        default=None, description="Opaque cursor for the next page (None if last)"
+    )
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
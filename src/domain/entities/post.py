@@ -1,10 +1,12 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from src.domain.entities.change_tracking import ChangeTracking
 
-class Post(BaseModel):
+
+class Post(ChangeTracking):
     """Community post entity for public board"""
 
     id: str
@@ -12,6 +14,10 @@ class Post(BaseModel):
     title: Optional[str] = Field(default=None, description="Post title")
     content: str = Field(description="Post content")
     view_count: int = Field(default=0, description="View count")
+    unique_viewers: int = Field(
+        default=0,
+        description="Approximate distinct viewers (HyperLogLog, ~2.3% standard error)",
+    )
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
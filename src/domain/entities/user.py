@@ -2,7 +2,9 @@ from datetime import date
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+
+from src.domain.entities.change_tracking import ChangeTracking
 
 
 class Gender(str, Enum):
@@ -11,7 +13,7 @@ class Gender(str, Enum):
     OTHER = "other"
 
 
-class User(BaseModel):
+class User(ChangeTracking):
     id: str = Field(description="User ID (MongoDB ObjectId)")
     email: str = Field(min_length=10, description="User's Email")
     password: str = Field(description="User's Password")
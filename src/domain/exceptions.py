@@ -48,3 +48,18 @@ class NonAuthorizedError(DomainException):
 class AccessTokenExpiredError(DomainException):
     def __init__(self):
         super().__init__("AccessTokenExpiredError")
+
+
+class HasherBusyError(DomainException):
+    def __init__(self):
+        super().__init__("Too many password hashing requests in flight")
+
+
+class InvalidCursorError(DomainException):
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
+
+
+class ConcurrentUpdateError(DomainException):
+    def __init__(self):
+        super().__init__("Gave up after repeated concurrent update conflicts")
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from src.domain.entities.chat import ChatMessage, ChatSession
 
@@ -7,3 +8,8 @@ class AIChatBot(ABC):
     @abstractmethod
     async def send(self, chat: ChatSession) -> ChatMessage:
         pass
+
+    @abstractmethod
+    def stream(self, chat: ChatSession) -> AsyncIterator[str]:
+        """Yield reply text deltas as soon as the model produces them."""
+        pass
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class ChangeGenerationRepository(ABC):
+    """Per-user version token that changes whenever one of their diaries does."""
+
+    @abstractmethod
+    async def get(self, user_id: str) -> str:
+        pass
+
+    @abstractmethod
+    async def bump(self, user_id: str):
+        pass
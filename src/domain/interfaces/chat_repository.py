@@ -13,6 +13,11 @@ class ChatRepository(ABC):
     async def find_active_session(self, user_id: str) -> Optional[ChatSession]:
         pass
 
+    @abstractmethod
+    async def find_active_session_version(self, user_id: str) -> Optional[str]:
+        """Token that changes whenever the active session does, without loading it."""
+        pass
+
     @abstractmethod
     async def add_message(
         self, session: ChatSession, message: ChatMessage
@@ -20,13 +25,53 @@ class ChatRepository(ABC):
         pass
 
     @abstractmethod
-    async def end_session(self, session: ChatSession):
+    async def add_turn(
+        self,
+        session_id: str,
+        user_message: ChatMessage,
+        assistant_message: ChatMessage,
+    ) -> tuple[ChatMessage, ChatMessage]:
+        """Append a user message and its reply in a single write."""
+        pass
+
+    @abstractmethod
+    async def update_summary(
+        self,
+        session_id: str,
+        summary: str,
+        summarized_count: int,
+        expected_summarized_count: int,
+    ) -> bool:
+        """Store a new summary if no other summary was written in between."""
+        pass
+
+    @abstractmethod
+    async def end_session(self, session_id: str, retain: bool = False):
+        """
+        Deactivate a session.
+
+        Unless retain is set (the session became a diary), the session keeps
+        its idle expiry and is purged once it passes.
+        """
         pass
 
     @abstractmethod
     async def find_session(self, session_id: str) -> ChatSession:
         pass
 
+    @abstractmethod
+    async def find_session_window(
+        self, session_id: str, max_messages: int
+    ) -> ChatSession:
+        """
+        Load a session with only what a reply needs.
+
+        messages holds the system messages and at most max_messages of the
+        newest unsummarized messages; summarized_count is 0 because the
+        summarized messages are left out.
+        """
+        pass
+
     @abstractmethod
     async def find_message(self, session_id: str, message_id: str) -> ChatMessage:
         pass
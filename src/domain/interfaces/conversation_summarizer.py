@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from src.domain.entities.chat import ChatMessage
+
+
+class ConversationSummarizer(ABC):
+    @abstractmethod
+    async def summarize(
+        self, previous_summary: Optional[str], messages: List[ChatMessage]
+    ) -> str:
+        """
+        Fold messages into the running conversation summary.
+
+        Args:
+            previous_summary: Summary of the turns before messages, if any
+            messages: Oldest unsummarized messages, in order
+
+        Returns:
+            str: The updated summary covering both
+        """
+        pass
@@ -2,7 +2,8 @@ from abc import ABC, abstractmethod
 from datetime import date
 from typing import List, Optional
 
-from src.domain.entities.diary import Diary
+from src.domain.entities.diary import Diary, DiarySummary, Emotion, EmotionTimeline
+from src.domain.entities.page import Page
 
 
 class DiaryRepository(ABC):
@@ -20,8 +21,8 @@ class DiaryRepository(ABC):
 
     @abstractmethod
     async def get_diary_list(
-        self, user_id: str, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
+        self, user_id: str, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
         pass
 
     @abstractmethod
@@ -29,32 +30,55 @@ class DiaryRepository(ABC):
         pass
 
     @abstractmethod
-    async def delete(self, diary: Diary):
+    async def set_saved(self, id: str, saved: bool) -> Diary:
+        """Set the saved flag without reading first; returns the updated diary."""
+        pass
+
+    @abstractmethod
+    async def set_tags(self, id: str, tags: List[str]) -> Diary:
+        """Replace the tags and their search grams in one write; returns the diary."""
+        pass
+
+    @abstractmethod
+    async def set_emotion(self, id: str, emotion: Emotion) -> Diary:
+        """Set the emotion; returns the diary as it was before the change."""
         pass
 
     @abstractmethod
-    async def get_next_diary(self, diary: Diary) -> Optional[Diary]:
+    async def delete(self, diary: Diary):
         pass
 
     @abstractmethod
-    async def get_prev_diary(self, diary: Diary) -> Optional[Diary]:
+    async def find_with_neighbours(
+        self, id: str
+    ) -> tuple[Diary, Optional[DiarySummary], Optional[DiarySummary]]:
+        """
+        Get a diary with the same user's next (newer) and prev (older) diaries.
+
+        Raises NotFoundError when the diary does not exist.
+        """
         pass
 
     @abstractmethod
     async def get_emotions_timeline(
         self, user_id: str, start_date: Optional[date], end_date: Optional[date]
-    ) -> List[Diary]:
-        """Get diaries with emotion data for timeline visualization."""
+    ) -> EmotionTimeline:
+        """Get emotion timeline entries and per-emotion counts."""
         pass
 
     @abstractmethod
     async def search(
-        self, user_id: str, query: str, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
+        self, user_id: str, query: str, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
+        pass
+
+    @abstractmethod
+    async def reindex_search(self, user_id: Optional[str] = None) -> int:
+        """Recompute stored search grams (all users if None); returns diary count."""
         pass
 
     @abstractmethod
     async def get_saved_diaries(
-        self, user_id: str, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
+        self, user_id: str, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
         pass
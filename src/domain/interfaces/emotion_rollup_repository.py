@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Optional
+
+from src.domain.entities.diary import Emotion
+from src.domain.entities.emotion_rollup import EmotionRollup, RollupGranularity
+
+
+class EmotionRollupRepository(ABC):
+    @abstractmethod
+    async def apply(self, changes: List[tuple[str, date, Emotion, int]]):
+        """
+        Apply count deltas to every granularity's bucket.
+
+        Args:
+            changes: (user_id, writed_at, emotion, delta) entries; delta is +1 or -1
+        """
+        pass
+
+    @abstractmethod
+    async def find(
+        self,
+        user_id: str,
+        granularity: RollupGranularity,
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[EmotionRollup]:
+        """Get buckets overlapping the date range, oldest first."""
+        pass
+
+    @abstractmethod
+    async def rebuild(self, user_id: Optional[str] = None) -> int:
+        """Regenerate rollups from diaries (all users if None); returns bucket count."""
+        pass
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from src.domain.entities.entitlement import Entitlement
+from src.domain.entities.payments_log import UserGrade
+
+
+class EntitlementRepository(ABC):
+    """Per-user subscription state derived from the payments log."""
+
+    @abstractmethod
+    async def find_by_user_id(self, user_id: str) -> Optional[Entitlement]:
+        pass
+
+    @abstractmethod
+    async def grant(
+        self, user_id: str, grade: UserGrade, valid_until: datetime
+    ) -> Entitlement:
+        pass
+
+    @abstractmethod
+    async def has_active_subscription(self, user_id: str) -> bool:
+        pass
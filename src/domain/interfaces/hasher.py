@@ -3,9 +3,14 @@ from abc import ABC, abstractmethod
 
 class Hasher(ABC):
     @abstractmethod
-    def hash(self, value: str) -> str:
+    async def hash(self, value: str) -> str:
         pass
 
     @abstractmethod
-    def verify(self, value: str, hashed: str) -> bool:
+    async def verify(self, value: str, hashed: str) -> bool:
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, hashed: str) -> bool:
+        """Return True if the hash was made with outdated parameters."""
         pass
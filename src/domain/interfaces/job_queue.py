@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+
+from src.domain.entities.job import Job
+
+
+class JobQueue(ABC):
+    @abstractmethod
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict,
+        max_attempts: int = 5,
+        delay_seconds: float = 0,
+    ) -> Job:
+        """
+        Schedule a job to be run by a background worker.
+
+        Args:
+            name: Registered handler name
+            payload: JSON-serializable arguments for the handler
+            max_attempts: Attempts before the job is dead-lettered
+            delay_seconds: Delay before the job becomes runnable
+
+        Returns:
+            Job: The persisted job
+        """
+        pass
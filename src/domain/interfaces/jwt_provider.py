@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import timedelta
 
 
 class JWTProvider(ABC):
@@ -10,6 +11,12 @@ class JWTProvider(ABC):
     def generate_refresh_token(self, user_id: str) -> str:
         pass
 
+    @property
+    @abstractmethod
+    def refresh_token_lifetime(self) -> timedelta:
+        """How long a refresh token stays valid after it is issued."""
+        pass
+
     @abstractmethod
     def verify_token(self, token: str) -> dict:
         pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Optional
 
+from src.domain.entities.page import Page
 from src.domain.entities.post import Post
 
 
@@ -14,13 +15,42 @@ class PostRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_list(self, cursor_id: Optional[str], size: int) -> List[Post]:
+    async def exists(self, post_id: str) -> bool:
+        """Whether the post exists, without loading it."""
+        pass
+
+    @abstractmethod
+    async def get_list(self, cursor: Optional[str], size: int) -> Page[Post]:
         pass
 
     @abstractmethod
     async def update(self, post: Post) -> Post:
         pass
 
+    @abstractmethod
+    async def increment_view_count(self, post_id: str):
+        pass
+
+    @abstractmethod
+    async def add_view_counts(self, counts: dict[str, int]):
+        """Apply aggregated view increments (post_id -> views) in one write."""
+        pass
+
+    @abstractmethod
+    async def add_viewer(self, post_id: str, viewer_id: str):
+        """Record a viewer in the post's unique-viewer sketch."""
+        pass
+
+    @abstractmethod
+    async def merge_viewer_sketches(self, sketches: dict[str, bytes]):
+        """
+        Merge HyperLogLog registers (post_id -> registers) into stored sketches.
+
+        Raises ConcurrentUpdateError if a sketch could not be stored because of
+        repeated write conflicts; merging again later is safe.
+        """
+        pass
+
     @abstractmethod
     async def delete(self, post_id: str):
         pass
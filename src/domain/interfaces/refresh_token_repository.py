@@ -1,18 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
 
 
 class RefreshTokenRepository(ABC):
     @abstractmethod
-    async def create(self, token: str, user_id: str):
+    async def create(self, token: str, user_id: str, expires_at: datetime):
+        """
+        Store a refresh token for a new device (token family).
+
+        It is purged automatically after expires_at.
+        """
         pass
 
     @abstractmethod
-    async def delete(self, token: str):
+    async def rotate(
+        self, token: str, user_id: str, new_token: str, expires_at: datetime
+    ) -> bool:
+        """
+        Atomically replace token with new_token in the same family.
+
+        Returns False when token is unknown, already rotated or expired.
+        """
         pass
 
     @abstractmethod
-    async def find_tokens_by_user_id(self, user_id: str) -> List[str]:
+    async def delete(self, token: str):
         pass
 
     @abstractmethod
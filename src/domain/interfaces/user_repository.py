@@ -22,3 +22,8 @@ class UserRepository(ABC):
     @abstractmethod
     async def update(self, user: User) -> User:
         pass
+
+    @abstractmethod
+    async def decrement_free_trial(self, user_id: str) -> bool:
+        """Use one free trial; False when the user has none left."""
+        pass
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from typing import Optional
 from src.domain.entities.user import User
 from src.domain.exceptions import (
@@ -38,21 +39,32 @@ class AuthService:
         if user_id is None:
             raise UserNotFoundError()
 
-        tokens = await self.refresh_token_repository.find_tokens_by_user_id(user_id)
+        access_token = self.jwt_provider.generate_access_token(user_id)
+        new_refresh_token = self.jwt_provider.generate_refresh_token(user_id)
+
+        # 기존 토큰 검증과 교체를 한 번의 조회로 처리 (같은 기기의 다른 토큰은 유지)
+        rotated = await self.refresh_token_repository.rotate(
+            refresh_token, user_id, new_refresh_token, self._refresh_token_expiry()
+        )
 
-        if tokens.__contains__(refresh_token) is False:
+        if rotated is False:
             raise NotFoundError()
 
-        await self.refresh_token_repository.delete_by_user_id(user_id)
+        return {"accessToken": access_token, "refreshToken": new_refresh_token}
 
+    def _refresh_token_expiry(self) -> datetime:
+        # 토큰과 같은 시점에 만료되도록 저장 (TTL 인덱스로 자동 삭제)
+        return datetime.now(timezone.utc) + self.jwt_provider.refresh_token_lifetime
+
+    async def _issue_tokens(self, user_id: str) -> dict:
         access_token = self.jwt_provider.generate_access_token(user_id)
         refresh_token = self.jwt_provider.generate_refresh_token(user_id)
 
-        await self.refresh_token_repository.create(refresh_token, user_id)
-
-        result = {"accessToken": access_token, "refreshToken": refresh_token}
+        await self.refresh_token_repository.create(
+            refresh_token, user_id, self._refresh_token_expiry()
+        )
 
-        return result
+        return {"accessToken": access_token, "refreshToken": refresh_token}
 
     async def login(self, email: str, password: str) -> dict:
         user = await self.user_repository.find_by_email(email)
@@ -60,19 +72,18 @@ class AuthService:
         if user is None:
             raise UserNotFoundError()
 
-        is_password_correct = self.hasher.verify(password, user.password)
+        is_password_correct = await self.hasher.verify(password, user.password)
 
         if is_password_correct is False:
             raise PasswordNotCorrectError()
 
-        await self.refresh_token_repository.delete_by_user_id(user.id)
-
-        access_token = self.jwt_provider.generate_access_token(user.id)
-        refresh_token = self.jwt_provider.generate_refresh_token(user.id)
-
-        await self.refresh_token_repository.create(refresh_token, user.id)
+        # 해싱 비용(work factor) 설정이 바뀌었다면 로그인 시점에 다시 해싱
+        if self.hasher.needs_rehash(user.password):
+            user.password = await self.hasher.hash(password)
+            await self.user_repository.update(user)
 
-        return {"accessToken": access_token, "refreshToken": refresh_token}
+        # 다른 기기의 로그인은 유지하고 이 기기용 토큰 family 를 새로 발급
+        return await self._issue_tokens(user.id)
 
     async def register(self, email: str, password: str) -> dict:
         if await self.user_repository.find_by_email(email) is not None:
@@ -83,7 +94,7 @@ class AuthService:
         if password.__len__() < password_min_length:
             raise PasswordLengthNotEnoughError(password_min_length)
 
-        password = self.hasher.hash(password)
+        password = await self.hasher.hash(password)
 
         # Create user entity
         user = User(
@@ -95,9 +106,5 @@ class AuthService:
 
         # Save user to database
         user = await self.user_repository.create(user)
-        access_token = self.jwt_provider.generate_access_token(user.id)
-        refresh_token = self.jwt_provider.generate_refresh_token(user.id)
-
-        await self.refresh_token_repository.create(refresh_token, user.id)
 
-        return {"accessToken": access_token, "refreshToken": refresh_token}
+        return await self._issue_tokens(user.id)
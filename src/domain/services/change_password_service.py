@@ -41,7 +41,7 @@ class ChangePasswordService:
         if user is None:
             raise NotFoundError()
 
-        hashed_new_password = self.hasher.hash(new_password)
+        hashed_new_password = await self.hasher.hash(new_password)
 
         user.password = hashed_new_password
 
@@ -0,0 +1,79 @@
+from typing import List
+
+from src.domain.entities.chat import ChatMessage, ChatSession, MessageRole
+
+# 메시지 구분에 드는 고정 토큰 (빈 메시지도 이만큼은 차지)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class ConversationWindow:
+    """
+    Token-bounded view of a chat session for the LLM.
+
+    system 메시지는 항상 유지하고, 요약된 이전 대화는 session.summary 로 대체한다.
+    요약되지 않은 대화는 token_budget 안에서 최근 메시지부터 원문 그대로 포함한다.
+    """
+
+    def __init__(self, token_budget: int = 6000, min_recent_messages: int = 6):
+        self.token_budget = token_budget
+        self.min_recent_messages = min_recent_messages
+
+    @staticmethod
+    def estimate_tokens(message: ChatMessage) -> int:
+        # 토크나이저 없이 보수적으로 추정: UTF-8 3바이트 ≈ 1토큰 (한글 1글자 ≈ 1토큰)
+        # + 메시지 구분에 드는 고정 오버헤드
+        return len(message.content.encode("utf-8")) // 3 + MESSAGE_OVERHEAD_TOKENS
+
+    @property
+    def max_messages(self) -> int:
+        """Most unsummarized messages build() or messages_to_summarize() can need."""
+        # 예산을 채우는 최소 크기 메시지 수 + 예산과 관계없이 유지하는 최근 메시지 수
+        # (이보다 많이 남아 있으면 이미 예산을 넘었으므로 요약 대상 판단에도 충분)
+        return (
+            self.token_budget // MESSAGE_OVERHEAD_TOKENS + self.min_recent_messages + 1
+        )
+
+    def _pending_messages(self, session: ChatSession) -> List[ChatMessage]:
+        conversation = [m for m in session.messages if m.role != MessageRole.system]
+        return conversation[session.summarized_count :]
+
+    def _take_recent(self, messages: List[ChatMessage], budget: int) -> List[ChatMessage]:
+        kept: List[ChatMessage] = []
+        used = 0
+        for message in reversed(messages):
+            tokens = self.estimate_tokens(message)
+            # 최소 개수는 예산과 관계없이 유지
+            if len(kept) >= self.min_recent_messages and used + tokens > budget:
+                break
+            kept.append(message)
+            used += tokens
+        kept.reverse()
+        return kept
+
+    def build(self, session: ChatSession) -> ChatSession:
+        """Return a copy of the session containing only what is sent to the LLM."""
+        messages = [m for m in session.messages if m.role == MessageRole.system]
+
+        if session.summary:
+            messages.append(
+                ChatMessage(
+                    user_id=session.user_id,
+                    role=MessageRole.system,
+                    content=f"[이전 대화 요약]\n{session.summary}",
+                )
+            )
+
+        messages.extend(
+            self._take_recent(self._pending_messages(session), self.token_budget)
+        )
+        return session.model_copy(update={"messages": messages})
+
+    def messages_to_summarize(self, session: ChatSession) -> List[ChatMessage]:
+        """Oldest unsummarized messages to fold into the summary, if over budget."""
+        pending = self._pending_messages(session)
+        if sum(self.estimate_tokens(m) for m in pending) <= self.token_budget:
+            return []
+
+        # 요약 직후 바로 다시 넘치지 않도록 예산의 절반만 원문으로 남긴다
+        recent = self._take_recent(pending, self.token_budget // 2)
+        return pending[: len(pending) - len(recent)]
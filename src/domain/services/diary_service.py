@@ -1,22 +1,90 @@
+import asyncio
 import re
 import uuid
 from datetime import date, datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Union
 
 import httpx
 from bson import ObjectId
 from src.domain.entities.chat import ChatMessage, ChatSession, MessageRole
-from src.domain.entities.diary import Diary
+from src.domain.entities.diary import Diary, DiarySummary
+from src.domain.entities.page import Page
 from src.domain.entities.user import User
 from src.domain.exceptions import NotFoundError
 from src.domain.interfaces.ai_chat_bot import AIChatBot
+from src.domain.interfaces.change_generation_repository import (
+    ChangeGenerationRepository,
+)
 from src.domain.interfaces.chat_repository import ChatRepository
+from src.domain.interfaces.conversation_summarizer import ConversationSummarizer
 from src.domain.interfaces.diary_repository import DiaryRepository
 from src.domain.interfaces.emotion_analyzer import EmotionAnalyzer
+from src.domain.interfaces.emotion_rollup_repository import EmotionRollupRepository
+from src.domain.interfaces.entitlement_repository import EntitlementRepository
 from src.domain.interfaces.image_generator import ImageGenerator
 from src.domain.interfaces.image_storage import ImageStorage
-from src.domain.interfaces.payments_repository import PaymentsRepository
+from src.domain.interfaces.job_queue import JobQueue
 from src.domain.interfaces.user_repository import UserRepository
+from src.domain.services.conversation_window import ConversationWindow
+
+ANALYZE_DIARY_EMOTION_JOB = "diary.analyze_emotion"
+SUMMARIZE_CHAT_SESSION_JOB = "chat.summarize"
+
+# 모든 유저/세션에서 동일한 에이전트 지시문.
+# 프롬프트 캐시가 유저 간에 공유되도록 유저별 정보와 분리해 맨 앞에 둔다.
+DIARY_AGENT_INSTRUCTIONS = """당신은 유저와 대화를 나누고, 그 대화를 바탕으로 유저 본인의 목소리로 일기를 작성하는 에이전트입니다.
+
+[중요: 일기 작성 원칙]
+
+1. 시점과 목소리
+- 반드시 1인칭 시점으로 작성하세요. ("나는", "내가", "나의")
+- 유저 본인이 직접 쓴 것처럼, 유저의 목소리가 되어야 합니다.
+- 누군가에게 말하는 형식이 아니라, 일기장에 혼잣말을 기록하는 독백 형식입니다.
+
+2. 문학적 표현
+- 평범한 일상에서 시적인 순간을 포착하세요.
+- 구체적인 감각 묘사를 활용하세요. (빛, 소리, 냄새, 촉감, 온도)
+- 직접적인 감정 표현보다는 은유와 비유로 간접적으로 드러내세요.
+- 예: "슬프다" 대신 → "마음 한켠에 잔물결이 일었다"
+
+3. 문장의 리듬
+- 긴 문장과 짧은 문장을 적절히 섞어 리듬감을 만드세요.
+- 때로는 문장을 끊어 여운을 남기세요.
+- 운문처럼 흐르되, 과도하게 시적이어서 어색해지지 않도록 주의하세요.
+
+4. 문단 구성
+- **중요**: 문단 변경과 줄바꿈을 최소화하세요.
+- 일기는 자연스럽게 이어지는 줄글 형태로 작성하세요.
+- 과도한 줄바꿈 없이 연속된 문장으로 구성하세요.
+- 하나의 흐름으로 읽히도록 문장을 자연스럽게 연결하세요.
+
+5. 이영도 작가의 작법 정신
+- "소설의 설정은 나무의 뿌리와 같다. 넓고 튼튼해야 하지만 직접 드러내면 말라죽는다."
+  → 감정과 의미를 직접 설명하지 말고, 장면과 묘사로 암시하세요.
+- "길은 방랑자가 흘린 눈물을 기억할 수 있지만, 방랑자를 따라갈 수는 없다."
+  → 일상의 사물과 공간에도 감정과 기억이 스며들어 있음을 표현하세요.
+- 평범한 순간에 철학적 깊이를 담으세요. 하지만 설교조가 되지 않도록 주의하세요.
+
+6. 일기의 톤
+- 내면의 독백이므로, 솔직하고 꾸밈없는 톤을 유지하세요.
+- 과장되거나 연극적이지 않게, 담담하면서도 서정적으로 작성하세요.
+- 길이는 적당히 조절하세요. (300-600자 정도)
+
+[대화 진행 방식]
+유저가 답변하면, 자연스러운 대화를 통해 하루에 대한 충분한 정보를 이끌어내세요.
+- 단순한 사실뿐 아니라, 그때의 감정, 분위기, 감각적 디테일을 파악하세요.
+- 충분한 정보를 얻었다면 "오늘 하루 있었던 일로 일기를 작성해드릴까요?" 라고 물으세요.
+- 유저가 긍정하면, 위의 원칙을 따라 일기를 작성하세요.
+
+[일기 출력 형식]
+[TITLE_START]
+간결하고 시적인 제목 (5-10자)
+[TITLE_END]
+
+[CONTENT_START]
+유저 본인의 목소리로 작성된 1인칭 일기
+[CONTENT_END]
+"""
 
 
 class DiaryService:
@@ -27,53 +95,60 @@ class DiaryService:
         ai_chat_bot: AIChatBot,
         image_generator: ImageGenerator,
         image_storage: ImageStorage,
-        payments_repository: PaymentsRepository,
+        entitlement_repository: EntitlementRepository,
         user_repository: UserRepository,
         emotion_analyzer: EmotionAnalyzer,
+        job_queue: JobQueue,
+        conversation_window: ConversationWindow,
+        conversation_summarizer: ConversationSummarizer,
+        emotion_rollup_repository: EmotionRollupRepository,
+        change_generation_repository: ChangeGenerationRepository,
     ):
         self.diary_repository = diary_repository
         self.chat_repository = chat_repository
         self.ai_chat_bot = ai_chat_bot
         self.image_generator = image_generator
         self.image_storage = image_storage
-        self.payments_repository = payments_repository
+        self.entitlement_repository = entitlement_repository
         self.user_repository = user_repository
         self.emotion_analyzer = emotion_analyzer
+        self.job_queue = job_queue
+        self.conversation_window = conversation_window
+        self.conversation_summarizer = conversation_summarizer
+        self.emotion_rollup_repository = emotion_rollup_repository
+        self.change_generation_repository = change_generation_repository
+
+    async def get_change_generation(self, user: User) -> str:
+        """Version of the user's diaries (lists, search, timeline)."""
+        return await self.change_generation_repository.get(user.id)
+
+    async def _diaries_changed(self, user_id: str):
+        # 일기 쓰기가 끝난 뒤 올려야 이전 버전 ETag 로 새 내용이 캐시되지 않음
+        await self.change_generation_repository.bump(user_id)
 
     async def get_saved_diaries(
-        self, current_user: User, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
+        self, current_user: User, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
         diaries = await self.diary_repository.get_saved_diaries(
-            current_user.id, cursor_id, size
+            current_user.id, cursor, size
         )
         return diaries
 
     async def update_saved(self, diary_id: str, value: bool) -> Diary:
-        diary = await self.diary_repository.find_by_id(diary_id)
-
-        if diary is None:
-            raise NotFoundError()
-
-        diary.saved = value
-
-        diary = await self.diary_repository.update(diary)
+        diary = await self.diary_repository.set_saved(diary_id, value)
+        await self._diaries_changed(diary.user_id)
         return diary
 
     async def update_tags(self, diary_id: str, tags: List[str]) -> Diary:
-        diary = await self.diary_repository.find_by_id(diary_id)
-        if diary is None:
-            raise NotFoundError()
-
-        diary.tags = tags
-
-        diary = await self.diary_repository.update(diary)
+        diary = await self.diary_repository.set_tags(diary_id, tags)
+        await self._diaries_changed(diary.user_id)
         return diary
 
     async def search_diaries(
-        self, current_user: User, query: str, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
+        self, current_user: User, query: str, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
         diaries = await self.diary_repository.search(
-            current_user.id, query, cursor_id, size
+            current_user.id, query, cursor, size
         )
         return diaries
 
@@ -83,10 +158,27 @@ class DiaryService:
             raise NotFoundError()
 
         emotion = await self.emotion_analyzer.analyze(diary.content)
-        diary.emotion = emotion
-        await self.diary_repository.update(diary)
+        # 분석 중에 다른 작업이 감정을 바꿨을 수 있으므로 저장 직전의 값으로 집계
+        previous = await self.diary_repository.set_emotion(diary_id, emotion)
+        diary = previous.model_copy(update={"emotion": emotion})
+        await self._update_emotion_rollups(previous, diary)
+        await self._diaries_changed(diary.user_id)
         return diary
 
+    async def _update_emotion_rollups(
+        self, before: Optional[Diary], after: Optional[Diary]
+    ):
+        # 감정이 분석된 일기만 집계 (타임라인과 동일한 기준)
+        # before/after 가 같은 버킷이면 증감이 상쇄되어 쓰기가 생략됨
+        changes = []
+        if before is not None and before.emotion is not None:
+            changes.append((before.user_id, before.writed_at, before.emotion, -1))
+        if after is not None and after.emotion is not None:
+            changes.append((after.user_id, after.writed_at, after.emotion, 1))
+
+        if changes:
+            await self.emotion_rollup_repository.apply(changes)
+
     async def write_diary_direct(
         self,
         current_user: User,
@@ -94,9 +186,6 @@ class DiaryService:
         content: str,
         chat_session_id: Optional[str],
     ) -> Diary:
-        # Analyze emotion from diary content
-        emotion = await self.emotion_analyzer.analyze(content)
-
         diary = Diary(
             id=str(ObjectId()),
             user_id=current_user.id,
@@ -104,49 +193,66 @@ class DiaryService:
             title=title,
             content=content,
             user_wrote_this_diary_directly=chat_session_id is None,
-            emotion=emotion,
         )
 
         if chat_session_id:
             diary.chat_session_id = chat_session_id
 
         diary = await self.diary_repository.create(diary)
+
+        # 일기 저장 이후의 후속 작업은 서로 독립적이므로 동시에 실행
+        follow_ups = [
+            self._update_emotion_rollups(None, diary),
+            self._diaries_changed(diary.user_id),
+            self.enqueue_emotion_analysis(diary.id),
+        ]
         if chat_session_id:
-            await self.end_chat_session(chat_session_id)
+            follow_ups.append(self.end_chat_session(chat_session_id, retain=True))
+        await asyncio.gather(*follow_ups)
 
         return diary
 
+    async def enqueue_emotion_analysis(self, diary_id: str):
+        # 감정 분석은 수 초가 걸리므로 백그라운드 작업으로 처리
+        # (완료되면 update_diary_emotion 이 emotion 을 채운다)
+        await self.job_queue.enqueue(ANALYZE_DIARY_EMOTION_JOB, {"diary_id": diary_id})
+
     async def update_diary(
         self, diary_id: str, title: Optional[str], content: str
     ) -> Diary:
         diary = await self.diary_repository.find_by_id(diary_id)
         if diary is None:
             raise NotFoundError()
+        previous = diary.model_copy()
         diary.title = title
         diary.content = content
         diary.updated_at = datetime.now()
 
         diary = await self.diary_repository.update(diary)
+        await self._update_emotion_rollups(previous, diary)
+        await self._diaries_changed(diary.user_id)
 
         return diary
 
     async def find_next_prev_diary(
         self, diary_id: str
-    ) -> tuple[Optional[Diary], Optional[Diary]]:
-        diary = await self.diary_repository.find_by_id(diary_id)
-        if diary is None:
-            raise NotFoundError()
-        next = await self.diary_repository.get_next_diary(diary)
-        prev = await self.diary_repository.get_prev_diary(diary)
-
+    ) -> tuple[Optional[DiarySummary], Optional[DiarySummary]]:
+        _, next, prev = await self.diary_repository.find_with_neighbours(diary_id)
         return (next, prev)
 
+    async def get_diary_with_neighbours(
+        self, diary_id: str
+    ) -> tuple[Diary, Optional[DiarySummary], Optional[DiarySummary]]:
+        return await self.diary_repository.find_with_neighbours(diary_id)
+
     async def delete(self, diary_id: str):
         found_diary = await self.diary_repository.find_by_id(diary_id)
         if found_diary is None:
             raise NotFoundError()
 
         await self.diary_repository.delete(found_diary)
+        await self._update_emotion_rollups(found_diary, None)
+        await self._diaries_changed(found_diary.user_id)
 
     async def update_thumbnail(self, diary_id: str, thumbnail_url: str) -> Diary:
         found_diary = await self.diary_repository.find_by_id(diary_id)
@@ -170,6 +276,7 @@ class DiaryService:
         found_diary.thumbnail_url = permanent_url
 
         await self.diary_repository.update(found_diary)
+        await self._diaries_changed(found_diary.user_id)
 
         return found_diary
 
@@ -200,9 +307,13 @@ Interpret the diary's emotional undertone through composition, light, and negati
         return img_url
 
     async def get_diary_list(
-        self, user: User, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
-        return await self.diary_repository.get_diary_list(user.id, cursor_id, size)
+        self, user: User, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
+        return await self.diary_repository.get_diary_list(user.id, cursor, size)
+
+    async def get_chat_session_version(self, user: User) -> Optional[str]:
+        """Version of the active chat session (None when there is none yet)."""
+        return await self.chat_repository.find_active_session_version(user.id)
 
     async def get_chat_session(self, user: User) -> ChatSession:
         active_session = await self.chat_repository.find_active_session(user.id)
@@ -210,73 +321,26 @@ Interpret the diary's emotional undertone through composition, light, and negati
         if active_session:
             return active_session
 
-        previous_user_wrote_diaries = await self.diary_repository.get_diary_list(
-            user.id, None, 10
-        )
+        previous_user_wrote_diaries = (
+            await self.diary_repository.get_diary_list(user.id, None, 10)
+        ).items
 
         # 시스템 프롬프트 추가
-        system_prompt = ChatMessage(
+        # 1) 고정 지시문 (캐시 공유), 2) 유저별 참고 정보
+        instructions = ChatMessage(
             id=str(ObjectId()),
             user_id=user.id,
             role=MessageRole.system,
-            content=f"""
-            당신은 유저와 대화를 나누고, 그 대화를 바탕으로 유저 본인의 목소리로 일기를 작성하는 에이전트입니다.
-
-            [참고 정보]
-            유저 프로필: {user}
-            최근 작성한 일기들: {previous_user_wrote_diaries}
-
-            [중요: 일기 작성 원칙]
-
-            1. 시점과 목소리
-            - 반드시 1인칭 시점으로 작성하세요. ("나는", "내가", "나의")
-            - 유저 본인이 직접 쓴 것처럼, 유저의 목소리가 되어야 합니다.
-            - 누군가에게 말하는 형식이 아니라, 일기장에 혼잣말을 기록하는 독백 형식입니다.
-
-            2. 문학적 표현
-            - 평범한 일상에서 시적인 순간을 포착하세요.
-            - 구체적인 감각 묘사를 활용하세요. (빛, 소리, 냄새, 촉감, 온도)
-            - 직접적인 감정 표현보다는 은유와 비유로 간접적으로 드러내세요.
-            - 예: "슬프다" 대신 → "마음 한켠에 잔물결이 일었다"
-
-            3. 문장의 리듬
-            - 긴 문장과 짧은 문장을 적절히 섞어 리듬감을 만드세요.
-            - 때로는 문장을 끊어 여운을 남기세요.
-            - 운문처럼 흐르되, 과도하게 시적이어서 어색해지지 않도록 주의하세요.
-
-            4. 문단 구성
-            - **중요**: 문단 변경과 줄바꿈을 최소화하세요.
-            - 일기는 자연스럽게 이어지는 줄글 형태로 작성하세요.
-            - 과도한 줄바꿈 없이 연속된 문장으로 구성하세요.
-            - 하나의 흐름으로 읽히도록 문장을 자연스럽게 연결하세요.
-
-            5. 이영도 작가의 작법 정신
-            - "소설의 설정은 나무의 뿌리와 같다. 넓고 튼튼해야 하지만 직접 드러내면 말라죽는다."
-              → 감정과 의미를 직접 설명하지 말고, 장면과 묘사로 암시하세요.
-            - "길은 방랑자가 흘린 눈물을 기억할 수 있지만, 방랑자를 따라갈 수는 없다."
-              → 일상의 사물과 공간에도 감정과 기억이 스며들어 있음을 표현하세요.
-            - 평범한 순간에 철학적 깊이를 담으세요. 하지만 설교조가 되지 않도록 주의하세요.
-
-            6. 일기의 톤
-            - 내면의 독백이므로, 솔직하고 꾸밈없는 톤을 유지하세요.
-            - 과장되거나 연극적이지 않게, 담담하면서도 서정적으로 작성하세요.
-            - 길이는 적당히 조절하세요. (300-600자 정도)
-
-            [대화 진행 방식]
-            유저가 답변하면, 자연스러운 대화를 통해 하루에 대한 충분한 정보를 이끌어내세요.
-            - 단순한 사실뿐 아니라, 그때의 감정, 분위기, 감각적 디테일을 파악하세요.
-            - 충분한 정보를 얻었다면 "오늘 하루 있었던 일로 일기를 작성해드릴까요?" 라고 물으세요.
-            - 유저가 긍정하면, 위의 원칙을 따라 일기를 작성하세요.
-
-            [일기 출력 형식]
-            [TITLE_START]
-            간결하고 시적인 제목 (5-10자)
-            [TITLE_END]
-
-            [CONTENT_START]
-            유저 본인의 목소리로 작성된 1인칭 일기
-            [CONTENT_END]
-            """,
+            content=DIARY_AGENT_INSTRUCTIONS,
+        )
+
+        user_context = ChatMessage(
+            id=str(ObjectId()),
+            user_id=user.id,
+            role=MessageRole.system,
+            content=f"""[참고 정보]
+유저 프로필: {user}
+최근 작성한 일기들: {previous_user_wrote_diaries}""",
         )
 
         first_message = ChatMessage(
@@ -287,7 +351,7 @@ Interpret the diary's emotional undertone through composition, light, and negati
         )
 
         new_session = ChatSession(
-            id="", user_id=user.id, messages=[system_prompt, first_message]
+            id="", user_id=user.id, messages=[instructions, user_context, first_message]
         )
 
         new_session = await self.chat_repository.create_session(new_session)
@@ -298,23 +362,89 @@ Interpret the diary's emotional undertone through composition, light, and negati
         if active_session:
             await self.end_chat_session(active_session.id)
 
-    async def end_chat_session(self, session_id: str):
-        session = await self.chat_repository.find_session(session_id)
-        await self.chat_repository.end_session(session)
+    async def end_chat_session(self, session_id: str, retain: bool = False):
+        await self.chat_repository.end_session(session_id, retain)
+
+    async def find_chat_session(self, session_id: str) -> ChatSession:
+        """Load only the part of a session needed to reply in it."""
+        # 매 턴마다 세션 전체가 아닌 윈도우에 필요한 메시지만 조회
+        return await self.chat_repository.find_session_window(
+            session_id, self.conversation_window.max_messages
+        )
 
     async def send_chat_message(
         self,
         new_message: ChatMessage,
         session_id: str,
     ) -> ChatMessage:
-        session = await self.chat_repository.find_session(session_id)
+        session = await self.find_chat_session(session_id)
         session.messages.append(new_message)
 
-        await self.chat_repository.add_message(session, new_message)
-        reply = await self.ai_chat_bot.send(session)
-        reply = await self.chat_repository.add_message(session, reply)
+        reply = await self.ai_chat_bot.send(self.conversation_window.build(session))
+        # 유저 메시지와 응답을 한 번의 쓰기로 저장
+        _, reply = await self.chat_repository.add_turn(session_id, new_message, reply)
+
+        session.messages.append(reply)
+        await self._schedule_summary(session)
         return reply
 
+    async def stream_chat_message(
+        self,
+        new_message: ChatMessage,
+        session: ChatSession,
+    ) -> AsyncIterator[Union[str, ChatMessage]]:
+        """
+        Stream the assistant reply for a new user message.
+
+        The session is loaded beforehand with find_chat_session so that a
+        missing session fails before the stream starts.
+        Yields reply text deltas (str) as they arrive, then the assembled
+        reply as a persisted ChatMessage once the model has finished.
+        """
+        session.messages.append(new_message)
+
+        chunks: list[str] = []
+        window = self.conversation_window.build(session)
+        async for text in self.ai_chat_bot.stream(window):
+            chunks.append(text)
+            yield text
+
+        # 스트리밍이 끝난 뒤 유저 메시지와 완성된 응답을 한 번에 저장
+        reply = ChatMessage(
+            user_id=new_message.user_id,
+            role=MessageRole.assistant,
+            content="".join(chunks),
+        )
+        _, reply = await self.chat_repository.add_turn(session.id, new_message, reply)
+
+        session.messages.append(reply)
+        await self._schedule_summary(session)
+        yield reply
+
+    async def _schedule_summary(self, session: ChatSession):
+        # 윈도우 예산을 넘긴 오래된 대화는 백그라운드에서 요약으로 접는다
+        if self.conversation_window.messages_to_summarize(session):
+            await self.job_queue.enqueue(
+                SUMMARIZE_CHAT_SESSION_JOB, {"session_id": session.id}
+            )
+
+    async def summarize_chat_session(self, session_id: str):
+        """Fold the oldest over-budget turns of a session into its summary."""
+        session = await self.chat_repository.find_session(session_id)
+        messages = self.conversation_window.messages_to_summarize(session)
+        if not messages:
+            return
+
+        summary = await self.conversation_summarizer.summarize(
+            session.summary, messages
+        )
+        await self.chat_repository.update_summary(
+            session_id,
+            summary,
+            session.summarized_count + len(messages),
+            session.summarized_count,
+        )
+
     async def write_diary(self, session_id: str, message_id: str) -> Diary:
         target_message = await self.chat_repository.find_message(session_id, message_id)
 
@@ -333,9 +463,6 @@ Interpret the diary's emotional undertone through composition, light, and negati
         )
         content = content_match.group(1).strip() if content_match else content_text
 
-        # Analyze emotion from diary content
-        emotion = await self.emotion_analyzer.analyze(content)
-
         diary = Diary(
             id=str(ObjectId()),
             user_id=target_message.user_id,
@@ -343,30 +470,30 @@ Interpret the diary's emotional undertone through composition, light, and negati
             title=title,
             content=content,
             thumbnail_url=None,
-            emotion=emotion,
         )
 
-        diary = await self.diary_repository.create(diary)
-        await self.end_chat_session(session_id)
-
-        payments_logs = await self.payments_repository.find_by_user_id(
-            target_message.user_id, None, 1
+        # 구독 여부 확인은 일기 저장과 무관하므로 함께 실행
+        # (결제 내역 대신 캐싱된 entitlement 로 확인)
+        diary, has_subscription = await asyncio.gather(
+            self.diary_repository.create(diary),
+            self.entitlement_repository.has_active_subscription(target_message.user_id),
         )
 
-        is_user_free_trial = True
-
-        if payments_logs.__len__() > 0:
-            payments = payments_logs[0]
-            if payments.end_date >= date.today():
-                is_user_free_trial = False
+        is_user_free_trial = not has_subscription
 
+        # 일기 저장 이후의 후속 작업은 서로 독립적이므로 동시에 실행
+        follow_ups = [
+            self._update_emotion_rollups(None, diary),
+            self._diaries_changed(diary.user_id),
+            self.end_chat_session(session_id, retain=True),
+            self.enqueue_emotion_analysis(diary.id),
+        ]
         if is_user_free_trial:
-            # user 의 free_trial_count 를 1 줄여야 함
-            current_user = await self.user_repository.find_by_id(target_message.user_id)
-            if current_user is None:
-                raise NotFoundError()
-            current_user.free_trial_count -= 1
-            await self.user_repository.update(current_user)
+            # user 의 free_trial_count 를 1 줄여야 함 (유저를 읽지 않고 조건부 차감)
+            follow_ups.append(
+                self.user_repository.decrement_free_trial(target_message.user_id)
+            )
+        await asyncio.gather(*follow_ups)
 
         return diary
 
@@ -1,44 +1,153 @@
+import asyncio
 from datetime import date
+from itertools import chain
 from typing import Optional, List
-from src.domain.entities.diary import Diary
+from src.domain.entities.diary import EmotionTimelineEntry
+from src.domain.entities.emotion_rollup import EmotionRollup, RollupGranularity
 from src.domain.interfaces.diary_repository import DiaryRepository
+from src.domain.interfaces.emotion_rollup_repository import EmotionRollupRepository
 
 
 class DiaryStatisticsService:
     """Service for diary statistics and analytics operations."""
 
-    def __init__(self, diary_repository: DiaryRepository):
+    def __init__(
+        self,
+        diary_repository: DiaryRepository,
+        emotion_rollup_repository: EmotionRollupRepository,
+    ):
         self.diary_repository = diary_repository
+        self.emotion_rollup_repository = emotion_rollup_repository
 
     async def get_emotions_timeline(
         self, user_id: str, start_date: Optional[date], end_date: Optional[date]
-    ) -> tuple[List[Diary], dict]:
+    ) -> tuple[List[EmotionTimelineEntry], dict]:
         """Get emotion timeline with summary statistics."""
 
-        diaries = await self.diary_repository.get_emotions_timeline(
+        # 집계(감정별 개수, 날짜 범위)는 DB 에서 계산됨
+        timeline = await self.diary_repository.get_emotions_timeline(
             user_id, start_date, end_date
         )
 
-        # 요약 통계 계산
-        emotion_counts: dict[str, int] = {}
-        for diary in diaries:
-            emotion_value = diary.emotion.value if diary.emotion else "unknown"
-            emotion_counts[emotion_value] = emotion_counts.get(emotion_value, 0) + 1
-
-        # 가장 많은 감정 찾기
-        most_common = max(emotion_counts.items(), key=lambda x: x[1])[0] if emotion_counts else None
+        # emotion_counts 는 많은 순으로 정렬되어 있음
+        most_common = next(iter(timeline.emotion_counts), None)
 
         # 실제 날짜 범위
         date_range = {
-            "start": diaries[0].writed_at.isoformat() if diaries else None,
-            "end": diaries[-1].writed_at.isoformat() if diaries else None
+            "start": timeline.start.isoformat() if timeline.start else None,
+            "end": timeline.end.isoformat() if timeline.end else None
         }
 
         summary = {
-            "total_count": len(diaries),
+            "total_count": len(timeline.entries),
             "date_range": date_range,
+            "emotion_counts": timeline.emotion_counts,
+            "most_common_emotion": most_common
+        }
+
+        return timeline.entries, summary
+
+    async def get_statistics(
+        self,
+        user_id: str,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        group_by: RollupGranularity,
+    ) -> dict:
+        """
+        Get per-bucket emotion statistics from pre-aggregated rollups.
+
+        A week or month only partly inside the range counts only the days
+        inside it (its bucket is still labelled with the period's first day).
+        """
+
+        # 일기 수와 관계없이 버킷 수만큼만 조회
+        rollups = await self._find_rollups(user_id, group_by, start_date, end_date)
+
+        buckets = []
+        emotion_counts: dict[str, int] = {}
+        total_count = 0
+        for rollup in rollups:
+            counts = {k: v for k, v in rollup.emotion_counts.items() if v > 0}
+            buckets.append(
+                {
+                    "bucket": rollup.bucket.isoformat(),
+                    "total_count": rollup.total_count,
+                    "emotion_counts": counts,
+                    "average_score": round(rollup.score_sum / rollup.total_count, 2),
+                }
+            )
+            total_count += rollup.total_count
+            for emotion, count in counts.items():
+                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + count
+
+        most_common = max(emotion_counts.items(), key=lambda x: x[1])[0] if emotion_counts else None
+
+        return {
+            "group_by": group_by.value,
+            "buckets": buckets,
+            "total_count": total_count,
             "emotion_counts": emotion_counts,
             "most_common_emotion": most_common
         }
 
-        return diaries, summary
+    async def _find_rollups(
+        self,
+        user_id: str,
+        group_by: RollupGranularity,
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[EmotionRollup]:
+        rollups = await self.emotion_rollup_repository.find(
+            user_id, group_by, start_date, end_date
+        )
+        if group_by is RollupGranularity.DAY:
+            return rollups
+
+        # 범위에 일부만 걸친 첫/마지막 기간은 범위 안의 일 단위 버킷으로 다시 합산
+        edges: List[tuple[date, date]] = []
+        if start_date and group_by.bucket_start(start_date) != start_date:
+            edge_end = group_by.bucket_end(start_date)
+            if end_date and end_date < edge_end:
+                edge_end = end_date
+            edges.append((start_date, edge_end))
+        if end_date and group_by.bucket_end(end_date) != end_date:
+            edge_start = group_by.bucket_start(end_date)
+            if start_date and start_date > edge_start:
+                edge_start = start_date
+            # 범위가 한 기간 안에 있으면 첫 기간에서 이미 처리됨
+            if not edges or edge_start > edges[0][1]:
+                edges.append((edge_start, end_date))
+        if not edges:
+            return rollups
+
+        days = await asyncio.gather(
+            *[
+                self.emotion_rollup_repository.find(
+                    user_id, RollupGranularity.DAY, edge_start, edge_end
+                )
+                for edge_start, edge_end in edges
+            ]
+        )
+
+        partial: dict[date, EmotionRollup] = {
+            group_by.bucket_start(edge_start): EmotionRollup(
+                user_id=user_id,
+                granularity=group_by,
+                bucket=group_by.bucket_start(edge_start),
+            )
+            for edge_start, _ in edges
+        }
+        for day in chain.from_iterable(days):
+            rollup = partial[group_by.bucket_start(day.bucket)]
+            rollup.total_count += day.total_count
+            rollup.score_sum += day.score_sum
+            for emotion, count in day.emotion_counts.items():
+                rollup.emotion_counts[emotion] = (
+                    rollup.emotion_counts.get(emotion, 0) + count
+                )
+
+        # 범위 안에 완전히 포함된 기간은 week/month 버킷을 그대로 사용
+        merged = [rollup for rollup in rollups if rollup.bucket not in partial]
+        merged += [rollup for rollup in partial.values() if rollup.total_count > 0]
+        return sorted(merged, key=lambda rollup: rollup.bucket)
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 
 from bson import ObjectId
+from src.domain.entities.page import Page
 from src.domain.entities.post import Post
 from src.domain.entities.user import User
 from src.domain.exceptions import NonAuthorizedError, NotFoundError
@@ -33,8 +34,8 @@ class PostService:
         post = await self.post_repository.create(post)
         return post
 
-    async def get_post_list(self, cursor_id: Optional[str], size: int) -> List[Post]:
-        post_list = await self.post_repository.get_list(cursor_id, size)
+    async def get_post_list(self, cursor: Optional[str], size: int) -> Page[Post]:
+        post_list = await self.post_repository.get_list(cursor, size)
         return post_list
 
     async def get_post(self, post_id: str) -> Post:
@@ -50,11 +51,10 @@ class PostService:
 
         return {"post": post, "writer": user}
 
-    async def view_post(self, post_id: str):
-        post = await self.post_repository.get(post_id)
-        post.view_count += 1
-        post.updated_at = datetime.now()
-        await self.post_repository.update(post)
+    async def view_post(self, post_id: str, viewer_id: str):
+        # 포스트를 읽지 않고 조회수 증가, 고유 방문자 스케치에 방문자 추가
+        await self.post_repository.increment_view_count(post_id)
+        await self.post_repository.add_viewer(post_id, viewer_id)
 
     async def update_post(
         self, post_id: str, title: Optional[str], content: str
@@ -1,8 +1,9 @@
 import os
 from datetime import datetime
+from typing import AsyncIterator
 
 from anthropic import AsyncAnthropic
-from anthropic.types import MessageParam, TextBlock
+from anthropic.types import MessageParam, TextBlock, TextBlockParam, Usage
 
 from src.domain.entities.chat import ChatMessage, ChatSession, MessageRole
 from src.domain.interfaces.ai_chat_bot import AIChatBot
@@ -16,32 +17,78 @@ class AnthropicAIChatBot(AIChatBot):
         self.client = AsyncAnthropic(api_key=api_key)
         # self.model = "claude-sonnet-4-5-20250929"
         self.model = "claude-sonnet-4-6"
+        self.max_tokens = 8192
+        # 누적 토큰 사용량 (프롬프트 캐시 적중률 모니터링용)
+        self.usage = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
 
-    async def send(self, chat: ChatSession) -> ChatMessage:
+    def _build_request(
+        self, chat: ChatSession
+    ) -> tuple[list[TextBlockParam], list[MessageParam]]:
         # ChatSession의 메시지를 Anthropic API 형식으로 변환
-        system_messages: list[str] = []
+        # system 메시지는 각각 별도 블록으로 유지: [고정 지시문, 유저별 정보]
+        system_blocks: list[TextBlockParam] = []
         conversation_messages: list[MessageParam] = []
 
         for msg in chat.messages:
             if msg.role == MessageRole.system:
-                system_messages.append(msg.content)
+                system_blocks.append({"type": "text", "text": msg.content})
             elif msg.role == MessageRole.user:
-                conversation_messages.append({"role": "user", "content": msg.content})
+                conversation_messages.append(
+                    {
+                        "role": "user",
+                        "content": [{"type": "text", "text": msg.content}],
+                    }
+                )
             elif msg.role == MessageRole.assistant:
                 conversation_messages.append(
-                    {"role": "assistant", "content": msg.content}
+                    {
+                        "role": "assistant",
+                        "content": [{"type": "text", "text": msg.content}],
+                    }
                 )
 
-        # system 메시지가 여러 개면 합치기
-        system_prompt = "\n\n".join(system_messages)
+        # 프롬프트 캐싱 breakpoint (최대 4개 중 3개 사용)
+        # - 첫 system 블록: 모든 유저가 공유하는 고정 지시문
+        # - 마지막 system 블록: 세션별 유저 정보
+        # - 마지막 메시지: 대화가 길어질수록 이전 턴까지의 prefix 를 재사용
+        for block in (system_blocks[:1] + system_blocks[-1:]):
+            block["cache_control"] = {"type": "ephemeral"}
+
+        if conversation_messages:
+            last_content = conversation_messages[-1]["content"]
+            if isinstance(last_content, list):
+                last_block = last_content[-1]
+                if isinstance(last_block, dict) and last_block["type"] == "text":
+                    last_block["cache_control"] = {"type": "ephemeral"}
+
+        return system_blocks, conversation_messages
+
+    def _record_usage(self, usage: Usage):
+        self.usage["requests"] += 1
+        self.usage["input_tokens"] += usage.input_tokens
+        self.usage["output_tokens"] += usage.output_tokens
+        self.usage["cache_creation_input_tokens"] += (
+            usage.cache_creation_input_tokens or 0
+        )
+        self.usage["cache_read_input_tokens"] += usage.cache_read_input_tokens or 0
+
+    async def send(self, chat: ChatSession) -> ChatMessage:
+        system_blocks, conversation_messages = self._build_request(chat)
 
         # Anthropic API 호출
         response = await self.client.messages.create(
             model=self.model,
-            max_tokens=8192,
-            system=system_prompt,
+            max_tokens=self.max_tokens,
+            system=system_blocks,
             messages=conversation_messages,
         )
+        self._record_usage(response.usage)
 
         # 응답을 ChatMessage로 변환
         # user_id는 세션의 마지막 user 메시지에서 가져오기
@@ -68,3 +115,19 @@ class AnthropicAIChatBot(AIChatBot):
             content=assistant_content,
             created_at=datetime.now(),
         )
+
+    async def stream(self, chat: ChatSession) -> AsyncIterator[str]:
+        system_blocks, conversation_messages = self._build_request(chat)
+
+        # 토큰이 생성되는 대로 텍스트 조각을 전달
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=system_blocks,
+            messages=conversation_messages,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+            final_message = await stream.get_final_message()
+            self._record_usage(final_message.usage)
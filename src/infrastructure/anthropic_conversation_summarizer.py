@@ -0,0 +1,56 @@
+import os
+from typing import List, Optional
+
+from anthropic import AsyncAnthropic
+from anthropic.types import TextBlock
+
+from src.domain.entities.chat import ChatMessage, MessageRole
+from src.domain.interfaces.conversation_summarizer import ConversationSummarizer
+
+
+class AnthropicConversationSummarizer(ConversationSummarizer):
+    def __init__(self):
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+        self.client = AsyncAnthropic(api_key=api_key)
+        # 요약은 백그라운드 작업이므로 가볍고 빠른 모델 사용
+        self.model = "claude-haiku-4-5"
+        self.max_tokens = 1024
+
+    async def summarize(
+        self, previous_summary: Optional[str], messages: List[ChatMessage]
+    ) -> str:
+        system_prompt = """당신은 일기 작성을 위한 대화를 요약하는 도우미입니다.
+
+기존 요약과 이어지는 대화를 읽고, 둘을 합친 하나의 요약을 작성하세요.
+
+중요:
+- 나중에 일기를 쓸 수 있도록 유저가 말한 사건, 사람, 장소, 시간을 빠짐없이 남기세요
+- 그때의 감정, 분위기, 감각적 디테일(빛, 소리, 냄새 등)도 유지하세요
+- 유저가 쓴 인상적인 표현은 가능한 그대로 인용하세요
+- 요약문만 출력하고, 다른 설명은 덧붙이지 마세요"""
+
+        speaker = {MessageRole.user: "유저", MessageRole.assistant: "AI"}
+        transcript = "\n".join(
+            f"{speaker.get(m.role, m.role.value)}: {m.content}" for m in messages
+        )
+
+        response = await self.client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=system_prompt,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"기존 요약:\n{previous_summary or '(없음)'}\n\n이어지는 대화:\n{transcript}",
+                }
+            ],
+        )
+
+        for item in response.content:
+            if isinstance(item, TextBlock):
+                return item.text.strip()
+
+        # 빈 응답이면 작업을 실패시켜 재시도 (요약 범위를 넘기지 않음)
+        raise ValueError("Summarizer returned no text")
@@ -1,12 +1,68 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 import bcrypt
 
+from src.domain.exceptions import HasherBusyError
 from src.domain.interfaces.hasher import Hasher
 
+T = TypeVar("T")
+
 
 class BcryptHasher(Hasher):
-    """Password hasher using bcrypt algorithm"""
+    """
+    Password hasher using bcrypt algorithm
+
+    bcrypt 연산은 수백 ms 동안 CPU 를 점유하므로 이벤트 루프가 아닌
+    전용 스레드 풀에서 실행한다. bcrypt 는 해싱 중 GIL 을 해제하므로
+    스레드 풀로도 여러 코어를 사용할 수 있다.
+    (InterpreterPoolExecutor 는 bcrypt 확장 모듈이 서브 인터프리터를
+    지원하지 않아 사용하지 않는다.)
+    """
+
+    def __init__(
+        self,
+        rounds: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.rounds = rounds or int(os.getenv("BCRYPT_ROUNDS", "12"))
+        max_workers = max_workers or int(
+            os.getenv("BCRYPT_MAX_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        # 실행 중 + 대기 중인 작업의 최대 개수 (초과 시 HasherBusyError)
+        self.max_pending = max_pending or int(
+            os.getenv("BCRYPT_MAX_PENDING", str(max_workers * 8))
+        )
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        # 이벤트 루프 스레드에서만 증감하므로 락이 필요 없다
+        if self._pending >= self.max_pending:
+            raise HasherBusyError()
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    def _hash_sync(self, value: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed = bcrypt.hashpw(value.encode("utf-8"), salt)
+        return hashed.decode("utf-8")
+
+    @staticmethod
+    def _verify_sync(value: str, hashed: str) -> bool:
+        return bcrypt.checkpw(value.encode("utf-8"), hashed.encode("utf-8"))
 
-    def hash(self, value: str) -> str:
+    async def hash(self, value: str) -> str:
         """
         Hash a password using bcrypt
 
@@ -16,11 +72,9 @@ class BcryptHasher(Hasher):
         Returns:
             Hashed password as string
         """
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(value.encode("utf-8"), salt)
-        return hashed.decode("utf-8")
+        return await self._run(self._hash_sync, value)
 
-    def verify(self, value: str, hashed: str) -> bool:
+    async def verify(self, value: str, hashed: str) -> bool:
         """
         Verify a password against a hash
 
@@ -31,4 +85,15 @@ class BcryptHasher(Hasher):
         Returns:
             True if password matches, False otherwise
         """
-        return bcrypt.checkpw(value.encode("utf-8"), hashed.encode("utf-8"))
+        return await self._run(self._verify_sync, value, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Check whether the stored hash uses a different cost than configured"""
+        # bcrypt 해시 형식: $2b$<rounds>$<salt+hash>
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,209 @@
+import asyncio
+from typing import Optional
+
+from src.domain.entities.page import Page
+from src.domain.entities.post import Post
+from src.domain.exceptions import NotFoundError
+from src.domain.interfaces.post_repository import PostRepository
+from src.infrastructure.hyperloglog import HyperLogLog
+from src.infrastructure.ttl_cache import TTLCache
+
+
+class BufferedPostRepository(PostRepository):
+    """
+    PostRepository decorator that coalesces view increments in memory.
+
+    조회수 증가는 post_id -> 증가량 버퍼에 더하기만 하고, flush_interval 마다
+    add_view_counts (bulk_write $inc 한 번) 로 저장한다. 조회 결과에는 아직 저장되지
+    않은 증가량을 더해서 반환한다.
+    고유 방문자도 포스트별 HyperLogLog 스케치에 모았다가 flush 때 저장된 스케치와
+    합친다 (unique_viewers 는 마지막 flush 기준).
+    없는 포스트의 조회는 버퍼에 넣지 않고 NotFoundError (존재 확인은 잠시 캐싱).
+    이벤트 루프 단일 스레드에서만 사용하므로 별도의 락은 두지 않는다.
+    프로세스가 비정상 종료되면 마지막 flush 이후의 증가량은 유실된다.
+    """
+
+    def __init__(
+        self,
+        repository: PostRepository,
+        flush_interval_seconds: float = 5,
+        known_posts_ttl_seconds: float = 60,
+        known_posts_max_size: int = 10000,
+    ):
+        self.repository = repository
+        self.flush_interval_seconds = flush_interval_seconds
+        # 존재가 확인된 post_id (같은 포스트의 반복 조회는 DB 를 거치지 않음)
+        # 다른 프로세스에서 삭제된 포스트는 최대 TTL 동안 버퍼에 들어가지만
+        # 저장 시 $inc 가 아무 문서에도 적용되지 않으므로 무해하다
+        self._known_posts: TTLCache[str, bool] = TTLCache(
+            max_size=known_posts_max_size, ttl_seconds=known_posts_ttl_seconds
+        )
+        self.flushed_views = 0
+        self.failed_flushes = 0
+        self._pending: dict[str, int] = {}
+        # 저장 중인 증가량 (저장이 끝나기 전까지는 조회 결과에 계속 더함)
+        self._flushing: dict[str, int] = {}
+        self._viewers: dict[str, HyperLogLog] = {}
+        self._flush_in_progress = False
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def buffered_views(self, post_id: str) -> int:
+        return self._pending.get(post_id, 0) + self._flushing.get(post_id, 0)
+
+    def _with_buffered_views(self, post: Post) -> Post:
+        views = self.buffered_views(post.id)
+        if views == 0:
+            return post
+        # model_copy(update=) 는 변경 필드로 기록되지 않으므로 update 시 view_count 를 덮어쓰지 않음
+        return post.model_copy(update={"view_count": post.view_count + views})
+
+    async def create(self, post: Post) -> Post:
+        return await self.repository.create(post)
+
+    async def get(self, post_id: str) -> Post:
+        return self._with_buffered_views(await self.repository.get(post_id))
+
+    async def exists(self, post_id: str) -> bool:
+        if self._known_posts.get(post_id):
+            return True
+
+        exists = await self.repository.exists(post_id)
+        if exists:
+            self._known_posts.set(post_id, True)
+        return exists
+
+    async def get_list(self, cursor: Optional[str], size: int) -> Page[Post]:
+        page = await self.repository.get_list(cursor, size)
+        page.items = [self._with_buffered_views(post) for post in page.items]
+        return page
+
+    async def update(self, post: Post) -> Post:
+        return await self.repository.update(post)
+
+    async def increment_view_count(self, post_id: str):
+        # 없는 포스트(잘못된 id 포함)의 증가량은 버퍼에 넣지 않음
+        if not await self.exists(post_id):
+            raise NotFoundError()
+
+        self._pending[post_id] = self._pending.get(post_id, 0) + 1
+        self._ensure_flusher()
+
+    async def add_view_counts(self, counts: dict[str, int]):
+        await self.repository.add_view_counts(counts)
+
+    async def add_viewer(self, post_id: str, viewer_id: str):
+        if not await self.exists(post_id):
+            raise NotFoundError()
+
+        if post_id not in self._viewers:
+            self._viewers[post_id] = HyperLogLog()
+        self._viewers[post_id].add(viewer_id)
+        self._ensure_flusher()
+
+    async def merge_viewer_sketches(self, sketches: dict[str, bytes]):
+        await self.repository.merge_viewer_sketches(sketches)
+
+    async def delete(self, post_id: str):
+        # 저장 중인 증가량도 제거 (저장이 실패해도 버퍼로 되돌아오지 않음)
+        self._known_posts.invalidate(post_id)
+        self._pending.pop(post_id, None)
+        self._flushing.pop(post_id, None)
+        self._viewers.pop(post_id, None)
+        await self.repository.delete(post_id)
+
+    def _ensure_flusher(self):
+        # 첫 조회수 증가 시 flush 태스크 시작 (API/워커 어느 프로세스에서든 동작)
+        if self._task is None and not self._stopping.is_set():
+            self._task = asyncio.create_task(self._run(), name="post-view-flusher")
+
+    async def flush(self) -> int:
+        """Write buffered increments now; returns the number of views written."""
+        if self._flush_in_progress:
+            return 0
+
+        self._flush_in_progress = True
+        try:
+            written = await self._flush_view_counts()
+            await self._flush_viewer_sketches()
+        finally:
+            self._flush_in_progress = False
+
+        return written
+
+    async def _flush_view_counts(self) -> int:
+        if not self._pending:
+            return 0
+
+        batch = self._pending
+        self._flushing, self._pending = batch, {}
+        try:
+            await self.repository.add_view_counts(batch)
+        except Exception:
+            # 실패한 증가량은 버퍼로 되돌려 다음 flush 에서 다시 저장
+            for post_id, views in batch.items():
+                self._pending[post_id] = self._pending.get(post_id, 0) + views
+            raise
+        finally:
+            self._flushing = {}
+
+        written = sum(batch.values())
+        self.flushed_views += written
+        return written
+
+    async def _flush_viewer_sketches(self):
+        if not self._viewers:
+            return
+
+        sketches, self._viewers = self._viewers, {}
+        try:
+            await self.repository.merge_viewer_sketches(
+                {post_id: sketch.to_bytes() for post_id, sketch in sketches.items()}
+            )
+        except Exception:
+            # 스케치 병합은 여러 번 반영돼도 결과가 같으므로 일부가 저장됐더라도 전부 되돌림
+            for post_id, sketch in sketches.items():
+                if post_id not in self._viewers:
+                    self._viewers[post_id] = HyperLogLog()
+                self._viewers[post_id].merge(sketch)
+            raise
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=self.flush_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.flush()
+            except Exception as e:
+                self.failed_flushes += 1
+                print(f"⚠️  Failed to flush post view counts: {e}")
+
+    async def stop(self):
+        """Flush what is buffered and stop the periodic flush task."""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            dropped = sum(self._pending.values())
+            print(
+                f"⚠️  Dropped {dropped} post views and {len(self._viewers)} "
+                f"viewer sketches on shutdown: {e}"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "pending_posts": len(self._pending),
+            "pending_views": sum(self._pending.values()),
+            "pending_viewer_sketches": len(self._viewers),
+            "flushed_views": self.flushed_views,
+            "failed_flushes": self.failed_flushes,
+        }
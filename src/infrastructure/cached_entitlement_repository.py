@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Optional
+
+from src.domain.entities.entitlement import Entitlement
+from src.domain.entities.payments_log import UserGrade
+from src.domain.interfaces.entitlement_repository import EntitlementRepository
+from src.infrastructure.ttl_cache import TTLCache
+
+
+class CachedEntitlementRepository(EntitlementRepository):
+    """
+    Read-through cache in front of another EntitlementRepository.
+
+    구독 중인 유저는 cache 에 캐싱하며, 캐시 항목은 valid_until 에 정확히 만료된다
+    (기본 TTL 이 더 짧으면 기본 TTL).
+    구독이 없다는 결과는 negative_cache 에 짧은 TTL 로만 캐싱한다: 다른 프로세스나
+    외부에서 저장된 결제는 무효화할 방법이 없으므로 최대 그 TTL 만큼 늦게 반영된다.
+    grant 시 해당 유저의 두 캐시를 모두 무효화한다.
+    """
+
+    def __init__(
+        self,
+        repository: EntitlementRepository,
+        cache: TTLCache[str, Entitlement],
+        negative_cache: TTLCache[str, bool],
+    ):
+        self.repository = repository
+        self.cache = cache
+        self.negative_cache = negative_cache
+
+    def _invalidate(self, user_id: str):
+        self.cache.invalidate(user_id)
+        self.negative_cache.invalidate(user_id)
+
+    def _remember(self, user_id: str, entitlement: Optional[Entitlement]):
+        if entitlement is None or not entitlement.is_active():
+            self.negative_cache.set(user_id, True)
+            return
+
+        remaining = (entitlement.valid_until - datetime.now()).total_seconds()
+        self.cache.set(
+            user_id, entitlement, ttl_seconds=min(self.cache.ttl_seconds, remaining)
+        )
+
+    async def find_by_user_id(self, user_id: str) -> Optional[Entitlement]:
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return cached
+        if self.negative_cache.get(user_id):
+            return None
+
+        entitlement = await self.repository.find_by_user_id(user_id)
+        self._remember(user_id, entitlement)
+        return entitlement
+
+    async def grant(
+        self, user_id: str, grade: UserGrade, valid_until: datetime
+    ) -> Entitlement:
+        self._invalidate(user_id)
+        try:
+            entitlement = await self.repository.grant(user_id, grade, valid_until)
+        finally:
+            self._invalidate(user_id)
+
+        self._remember(user_id, entitlement)
+        return entitlement
+
+    async def has_active_subscription(self, user_id: str) -> bool:
+        entitlement = await self.find_by_user_id(user_id)
+        return entitlement is not None and entitlement.is_active()
@@ -0,0 +1,53 @@
+from typing import Optional
+
+from src.domain.entities.user import User
+from src.domain.interfaces.user_repository import UserRepository
+from src.infrastructure.ttl_cache import TTLCache
+
+
+class CachedUserRepository(UserRepository):
+    """
+    Read-through cache in front of another UserRepository.
+
+    find_by_id 결과를 프로세스 내 TTL/LRU 캐시에 보관하고,
+    update 시 해당 유저의 캐시를 무효화한다 (write-through invalidation).
+    워커 프로세스 간 캐시는 공유되지 않으므로 TTL 은 짧게 유지한다.
+    """
+
+    def __init__(self, repository: UserRepository, cache: TTLCache[str, User]):
+        self.repository = repository
+        self.cache = cache
+
+    async def create(self, user: User) -> User:
+        return await self.repository.create(user)
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        return await self.repository.find_by_email(email)
+
+    async def find_by_id(self, id: str) -> Optional[User]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            # 호출자가 엔티티를 수정할 수 있으므로 복사본을 반환
+            return cached.model_copy(deep=True)
+
+        user = await self.repository.find_by_id(id)
+        if user is not None:
+            self.cache.set(id, user.model_copy(deep=True))
+
+        return user
+
+    async def update(self, user: User) -> User:
+        self.cache.invalidate(user.id)
+        try:
+            return await self.repository.update(user)
+        finally:
+            self.cache.invalidate(user.id)
+
+    async def decrement_free_trial(self, user_id: str) -> bool:
+        try:
+            return await self.repository.decrement_free_trial(user_id)
+        finally:
+            self.cache.invalidate(user_id)
+
+    def invalidate(self, user_id: str):
+        self.cache.invalidate(user_id)
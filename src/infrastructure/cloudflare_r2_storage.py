@@ -1,16 +1,34 @@
+import asyncio
 import os
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from typing import Callable, TypeVar
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from src.domain.interfaces.image_storage import ImageStorage
+from src.infrastructure.latency_metrics import LatencyMetrics
 
 # Disable SSL warnings in development
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+T = TypeVar("T")
+
+MB = 1024 * 1024
+
 
 class CloudflareR2Storage(ImageStorage):
+    """
+    Cloudflare R2 (S3 호환) 이미지 저장소.
+
+    boto3 는 동기 클라이언트이므로 모든 네트워크 호출을 전용 스레드 풀에서
+    실행해 이벤트 루프를 막지 않는다. boto3 client 는 thread-safe 하며
+    하나의 클라이언트가 커넥션 풀을 공유한다.
+    """
+
     def __init__(self):
         account_id = os.getenv("CLOUDFLARE_ACCOUNT_ID")
         access_key_id = os.getenv("CLOUDFLARE_R2_ACCESS_KEY_ID")
@@ -26,14 +44,31 @@ class CloudflareR2Storage(ImageStorage):
         self.bucket_name = bucket_name
         self.public_domain = public_domain
 
+        # 동시 업로드/삭제 개수 제한 (executor 스레드 수, semaphore 크기)
+        self.max_concurrency = int(os.getenv("R2_MAX_CONCURRENCY", "8"))
+        # 이 크기 이상이면 multipart 업로드 사용
+        self.multipart_threshold = int(os.getenv("R2_MULTIPART_THRESHOLD_MB", "8")) * MB
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.multipart_threshold,
+            multipart_chunksize=int(os.getenv("R2_MULTIPART_CHUNK_MB", "8")) * MB,
+            max_concurrency=int(os.getenv("R2_MULTIPART_CONCURRENCY", "4")),
+        )
+
+        self.metrics = LatencyMetrics()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="r2"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
         # R2 endpoint format: https://<account_id>.r2.cloudflarestorage.com
         endpoint_url = f"https://{account_id}.r2.cloudflarestorage.com"
 
-        # Create boto3 config to disable SSL verification in development
-        from botocore.config import Config
-
+        # 동시에 도는 업로드마다 multipart 파트 스레드가 각자 커넥션을 쓰므로
+        # 최악의 경우(모든 업로드가 multipart)에 맞춰 풀 크기를 잡는다
         config = Config(
             signature_version="s3v4",
+            max_pool_connections=self.max_concurrency
+            * max(1, self.transfer_config.max_request_concurrency),
         )
 
         self.s3_client = boto3.client(
@@ -46,6 +81,36 @@ class CloudflareR2Storage(ImageStorage):
             verify=False,  # Disable SSL verification for Docker environment
         )
 
+    async def _run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        async with self._semaphore:
+            with self.metrics.measure(operation):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _upload_sync(self, image_data: bytes, file_name: str):
+        if len(image_data) >= self.multipart_threshold:
+            # 큰 파일은 multipart 로 나누어 병렬 업로드
+            self.s3_client.upload_fileobj(
+                BytesIO(image_data),
+                self.bucket_name,
+                file_name,
+                ExtraArgs={"ContentType": "image/png"},
+                Config=self.transfer_config,
+            )
+        else:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=file_name,
+                Body=image_data,
+                ContentType="image/png",  # DALL-E generates PNG
+            )
+
+    def _delete_sync(self, file_name: str):
+        self.s3_client.delete_object(
+            Bucket=self.bucket_name,
+            Key=file_name,
+        )
+
     async def upload(self, image_data: bytes, file_name: str) -> str:
         """
         Upload image to Cloudflare R2.
@@ -62,12 +127,7 @@ class CloudflareR2Storage(ImageStorage):
         """
         try:
             # Upload to R2
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_name,
-                Body=BytesIO(image_data),
-                ContentType="image/png",  # DALL-E generates PNG
-            )
+            await self._run("upload", self._upload_sync, image_data, file_name)
 
             # Return public URL
             if self.public_domain:
@@ -102,9 +162,10 @@ class CloudflareR2Storage(ImageStorage):
             else:
                 file_name = file_name_or_url
 
-            self.s3_client.delete_object(
-                Bucket=self.bucket_name,
-                Key=file_name,
-            )
+            await self._run("delete", self._delete_sync, file_name)
         except ClientError as e:
             raise Exception(f"Failed to delete image from R2: {str(e)}")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.s3_client.close()
@@ -0,0 +1,73 @@
+from typing import Any, Generic, List, Optional, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def _nested_model(annotation: Any) -> tuple[Optional[type[BaseModel]], bool]:
+    """(model, is_list) when a field holds a nested model or a list of them."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin is list:
+        item_args = get_args(annotation)
+        model, _ = _nested_model(item_args[0]) if item_args else (None, False)
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+class Hydrator(Generic[T]):
+    """
+    Builds entities from stored documents.
+
+    저장 문서와 엔티티의 차이는 _id -> id 뿐이므로 (중첩 모델 포함) 어떤 필드에
+    중첩 문서가 있는지 모델별로 한 번만 계산해 두고, 이름만 바꾼 뒤
+    pydantic-core 검증기로 만든다.
+    검증을 건너뛰는 model_construct 는 pydantic v2 에서 오히려 느리다
+    (benchmarks/hydration_benchmark.py 참고).
+    """
+
+    def __init__(self, model: type[T]):
+        self.model = model
+        self.nested: List[tuple[str, Hydrator, bool]] = []
+        for name, field in model.model_fields.items():
+            nested_model, is_list = _nested_model(field.annotation)
+            if nested_model is not None:
+                self.nested.append((name, hydrator(nested_model), is_list))
+
+    def rename(self, document: dict) -> dict:
+        # 조회 결과는 호출한 쪽에서 다시 쓰지 않으므로 복사 없이 그대로 수정
+        if "_id" in document:
+            document["id"] = str(document.pop("_id"))
+        for name, nested, is_list in self.nested:
+            value = document.get(name)
+            if not value:
+                continue
+            if is_list:
+                for item in value:
+                    nested.rename(item)
+            else:
+                nested.rename(value)
+        return document
+
+    def __call__(self, document: dict) -> T:
+        return self.model.model_validate(self.rename(document))
+
+
+_hydrators: dict[type, Hydrator] = {}
+
+
+def hydrator(model: type[T]) -> Hydrator[T]:
+    # 모델별 중첩 필드 정보는 처음 사용할 때 한 번만 계산
+    if model not in _hydrators:
+        _hydrators[model] = Hydrator(model)
+    return _hydrators[model]
+
+
+def hydrate(model: type[T], document: dict) -> T:
+    """Entity from a stored document (the _id becomes the string id, in place)."""
+    return hydrator(model)(document)
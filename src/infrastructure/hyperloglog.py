@@ -0,0 +1,71 @@
+import hashlib
+import math
+from typing import Optional
+
+# 레지스터 수 m = 2^PRECISION = 2048 (레지스터당 1 byte, 스케치 하나가 2 KB)
+PRECISION = 11
+REGISTER_COUNT = 1 << PRECISION
+
+# 표준 오차 1.04 / sqrt(m) ≈ 2.3% (추정치의 약 95% 가 실제 값의 ±4.6% 이내)
+STANDARD_ERROR = 1.04 / math.sqrt(REGISTER_COUNT)
+
+_ALPHA = 0.7213 / (1 + 1.079 / REGISTER_COUNT)
+_RANK_BITS = 64 - PRECISION
+
+
+class HyperLogLog:
+    """
+    Fixed-size sketch that estimates the number of distinct items added.
+
+    64-bit 해시의 상위 PRECISION 비트로 레지스터를 고르고, 나머지 비트의
+    (선행 0 의 개수 + 1) 중 최댓값을 레지스터에 기록한다.
+    두 스케치의 합집합은 레지스터별 최댓값이므로 여러 프로세스에서 모은 스케치를
+    순서와 상관없이 합칠 수 있다 (같은 값을 여러 번 더해도 결과가 같다).
+    """
+
+    def __init__(self, registers: Optional[bytes] = None):
+        if registers is not None and len(registers) != REGISTER_COUNT:
+            raise ValueError(
+                f"Expected {REGISTER_COUNT} registers, got {len(registers)}"
+            )
+        self.registers = bytearray(registers or REGISTER_COUNT)
+
+    @staticmethod
+    def _hash(item: str) -> int:
+        # 프로세스마다 달라지는 hash() 대신 고정된 해시 사용
+        digest = hashlib.blake2b(item.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns True when the sketch changed."""
+        hashed = self._hash(item)
+        index = hashed >> _RANK_BITS
+        remainder = hashed & ((1 << _RANK_BITS) - 1)
+        rank = _RANK_BITS - remainder.bit_length() + 1
+
+        if rank <= self.registers[index]:
+            return False
+        self.registers[index] = rank
+        return True
+
+    def merge(self, other: "HyperLogLog") -> bool:
+        """Union with another sketch in place; returns True when it changed."""
+        merged = bytes(map(max, self.registers, other.registers))
+        if merged == self.registers:
+            return False
+        self.registers[:] = merged
+        return True
+
+    def estimate(self) -> int:
+        harmonic_sum = sum(2.0**-register for register in self.registers)
+        estimate = _ALPHA * REGISTER_COUNT * REGISTER_COUNT / harmonic_sum
+
+        # 값이 작을 때는 빈 레지스터 수로 계산하는 linear counting 이 더 정확
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * REGISTER_COUNT and empty > 0:
+            estimate = REGISTER_COUNT * math.log(REGISTER_COUNT / empty)
+
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
@@ -0,0 +1,196 @@
+import asyncio
+from typing import List, Optional, Protocol
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel, Field
+from pymongo import IndexModel
+
+
+class IndexSpec(BaseModel):
+    """Index a repository needs on its collection"""
+
+    name: str = Field()
+    keys: List[tuple[str, int]] = Field()
+    unique: bool = Field(default=False)
+    partial_filter: Optional[dict] = Field(default=None)
+    expire_after_seconds: Optional[int] = Field(default=None)
+    # 없으면 데이터가 틀어지는 인덱스 (생성에 실패하면 ready 가 되지 않음)
+    # 그 외(조회 성능, TTL 정리)는 실패해도 보고만 한다
+    required: bool = Field(default=False)
+
+    def to_index_model(self) -> IndexModel:
+        options: dict = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.partial_filter is not None:
+            options["partialFilterExpression"] = self.partial_filter
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        return IndexModel(self.keys, **options)
+
+    def differences(self, live: dict) -> List[str]:
+        """Compare against an entry of collection.index_information()."""
+        differences = []
+        if [(field, int(direction)) for field, direction in live["key"]] != self.keys:
+            differences.append(f"keys {live['key']} != {self.keys}")
+        if bool(live.get("unique", False)) != self.unique:
+            differences.append(f"unique {live.get('unique', False)} != {self.unique}")
+        if live.get("partialFilterExpression") != self.partial_filter:
+            differences.append(
+                f"partialFilterExpression {live.get('partialFilterExpression')}"
+                f" != {self.partial_filter}"
+            )
+        if live.get("expireAfterSeconds") != self.expire_after_seconds:
+            differences.append(
+                f"expireAfterSeconds {live.get('expireAfterSeconds')}"
+                f" != {self.expire_after_seconds}"
+            )
+        return differences
+
+
+class IndexedRepository(Protocol):
+    collection_name: str
+    indexes: List[IndexSpec]
+
+
+class IndexRegistry:
+    """
+    Builds and verifies the indexes declared by each repository.
+
+    - start: 앱 시작을 막지 않도록 백그라운드 태스크로 누락된 인덱스 생성
+    - drift: 선언된 인덱스와 실제 인덱스 비교 (missing / changed / extra)
+    이름이 같은데 정의가 다른 인덱스는 자동으로 지우지 않고 drift 로만 보고한다.
+    인덱스마다 따로 생성하므로 하나가 실패해도 (예: 기존 데이터의 unique 위반)
+    나머지는 계속 만들고, required 인덱스가 실패한 경우에만 failed 가 된다.
+    """
+
+    def __init__(
+        self, db: AsyncIOMotorDatabase, repositories: List[type[IndexedRepository]]
+    ):
+        self.db = db
+        self.declared: dict[str, List[IndexSpec]] = {}
+        for repository in repositories:
+            self.declared.setdefault(repository.collection_name, []).extend(
+                repository.indexes
+            )
+        self.state = "pending"
+        self.error: Optional[str] = None
+        # "collection.index" -> "exists" | "created" | "failed: ..."
+        self.index_status: dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._build(), name="index-build")
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _build(self):
+        self.state = "building"
+        created = await self.ensure()
+
+        failed = self.failed_indexes()
+        required_failed = [name for name, required in failed.items() if required]
+        if required_failed:
+            self.state = "failed"
+            self.error = f"Required indexes failed: {', '.join(required_failed)}"
+            print(f"⚠️  Index creation failed: {self.error}")
+        elif failed:
+            self.state = "degraded"
+            self.error = f"Optional indexes failed: {', '.join(failed)}"
+            print(f"⚠️  Database indexes ready ({len(created)} created), {self.error}")
+        else:
+            self.state = "ready"
+            self.error = None
+            print(f"✅ Database indexes ready ({len(created)} created)")
+
+    def failed_indexes(self) -> dict[str, bool]:
+        """Indexes whose creation failed -> whether they are required."""
+        required = {
+            f"{collection_name}.{spec.name}": spec.required
+            for collection_name, specs in self.declared.items()
+            for spec in specs
+        }
+        return {
+            name: required[name]
+            for name, status in self.index_status.items()
+            if status.startswith("failed")
+        }
+
+    async def ensure(self) -> List[str]:
+        """Create declared indexes that do not exist yet; returns created names."""
+        created: List[str] = []
+        for collection_name, specs in self.declared.items():
+            collection = self.db[collection_name]
+            try:
+                live = await collection.index_information()
+            except Exception as e:
+                for spec in specs:
+                    self.index_status[f"{collection_name}.{spec.name}"] = (
+                        f"failed: {type(e).__name__}: {e}"
+                    )
+                continue
+
+            for spec in specs:
+                name = f"{collection_name}.{spec.name}"
+                if spec.name in live:
+                    self.index_status[name] = "exists"
+                    continue
+                try:
+                    created += await collection.create_indexes(
+                        [spec.to_index_model()]
+                    )
+                    self.index_status[name] = "created"
+                except Exception as e:
+                    self.index_status[name] = f"failed: {type(e).__name__}: {e}"
+                    print(f"⚠️  Failed to create index {name}: {e}")
+        return created
+
+    async def drift(self) -> dict:
+        """Diff declared indexes against live ones, per collection."""
+        collections: dict = {}
+        for collection_name, specs in self.declared.items():
+            live = await self.db[collection_name].index_information()
+            live.pop("_id_", None)
+
+            missing = [spec.name for spec in specs if spec.name not in live]
+            missing_required = [
+                spec.name for spec in specs if spec.required and spec.name not in live
+            ]
+            changed = {
+                spec.name: spec.differences(live[spec.name])
+                for spec in specs
+                if spec.name in live and spec.differences(live[spec.name])
+            }
+            changed_required = [
+                spec.name for spec in specs if spec.required and spec.name in changed
+            ]
+            declared_names = {spec.name for spec in specs}
+            extra = [name for name in live if name not in declared_names]
+
+            if missing or changed or extra:
+                collections[collection_name] = {
+                    "missing": missing,
+                    "changed": changed,
+                    "extra": extra,
+                    "required_drift": missing_required + changed_required,
+                }
+
+        # required 인덱스의 누락/변경만 문제로 봄
+        # (성능용 인덱스와 사용하지 않는 인덱스(extra)는 보고만 함)
+        ok = all(not report["required_drift"] for report in collections.values())
+        return {"ok": ok, "collections": collections}
+
+    async def status(self) -> dict:
+        report = await self.drift()
+        report["build"] = {
+            "state": self.state,
+            "error": self.error,
+            "indexes": dict(self.index_status),
+        }
+        return report
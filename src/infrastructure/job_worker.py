@@ -0,0 +1,97 @@
+import asyncio
+import traceback
+from typing import Awaitable, Callable, Optional
+
+from src.domain.entities.job import Job
+from src.infrastructure.mongo_job_queue import MongoJobQueue
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+
+class JobWorker:
+    """
+    Async worker pool that drains MongoJobQueue.
+
+    API 프로세스 안에서(lifespan) 실행하거나, worker.py 로 별도 프로세스에서
+    실행할 수 있다. 각 워커 태스크는 작업을 하나씩 점유해 실행한다.
+    """
+
+    def __init__(
+        self,
+        queue: MongoJobQueue,
+        handlers: dict[str, JobHandler],
+        concurrency: int = 2,
+        poll_interval_seconds: float = 1.0,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self._stopping = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        print(f"✅ Job worker started (concurrency={self.concurrency})")
+
+    async def stop(self, timeout_seconds: float = 10):
+        """Stop claiming new jobs and wait for in-flight ones to finish."""
+        self._stopping.set()
+        if not self._tasks:
+            return
+
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout_seconds)
+        for task in pending:
+            # 끝나지 않은 작업은 visibility timeout 이후 다시 실행된다
+            task.cancel()
+        self._tasks = []
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.claim()
+            except Exception as e:
+                print(f"⚠️  Failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                await self._sleep()
+                continue
+
+            await self._execute(job)
+
+    async def _sleep(self):
+        try:
+            await asyncio.wait_for(
+                self._stopping.wait(), timeout=self.poll_interval_seconds
+            )
+        except asyncio.TimeoutError:
+            pass
+
+    async def _execute(self, job: Job):
+        if job.attempts > job.max_attempts:
+            # 워커가 죽어 visibility timeout 으로 재점유된 작업이 한도를 넘은 경우
+            await self.queue.fail(job, job.last_error or "visibility timeout exceeded")
+            return
+
+        handler: Optional[JobHandler] = self.handlers.get(job.name)
+        if handler is None:
+            await self.queue.fail(job, f"No handler registered for {job.name}")
+            return
+
+        try:
+            await asyncio.wait_for(
+                handler(job.payload),
+                timeout=self.queue.visibility_timeout.total_seconds(),
+            )
+        except Exception as e:
+            print(f"⚠️  Job {job.name} ({job.id}) failed: {e}")
+            traceback.print_exc()
+            await self.queue.fail(job, f"{type(e).__name__}: {e}")
+            return
+
+        await self.queue.complete(job)
@@ -0,0 +1,89 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.domain.exceptions import InvalidCursorError
+
+
+def encode_cursor(*position: Any) -> str:
+    """Encode the (sort keys..., _id) position of a document as an opaque cursor."""
+    values = [str(v) if isinstance(v, ObjectId) else v for v in position]
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int = 2) -> list:
+    """Decode a cursor into its sort key values; the last one is the _id."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != length:
+            raise ValueError()
+        values[-1] = ObjectId(values[-1])
+        return values
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursorError()
+
+
+def keyset_filter(sort_fields: List[str], position: list) -> dict:
+    """Match documents strictly after position in descending (sort_fields) order."""
+    conditions = []
+    for i, field in enumerate(sort_fields):
+        condition = {sort_fields[j]: position[j] for j in range(i)}
+        condition[field] = {"$lt": position[i]}
+        conditions.append(condition)
+    return {"$or": conditions}
+
+
+async def paginate(
+    collection: AsyncIOMotorCollection,
+    query: dict,
+    sort_field: str,
+    cursor: Optional[str],
+    size: int,
+    projection: Optional[dict] = None,
+) -> tuple[List[dict], Optional[str]]:
+    """
+    Fetch one page sorted by (sort_field, _id) descending.
+
+    (sort_field, _id) 복합 정렬이라 sort_field 값이 같은 문서가 있어도 건너뛰지 않는다.
+    limit+1 개를 조회해 다음 페이지 존재 여부를 판단하므로 페이지당 쿼리는 한 번.
+    """
+    sort_fields = [sort_field, "_id"]
+
+    if cursor:
+        position: Optional[list]
+        if ObjectId.is_valid(cursor):
+            # 이전 버전 클라이언트가 보내는 문서 id 커서 (조회 한 번 추가)
+            cursor_document = await collection.find_one(
+                {"_id": ObjectId(cursor)}, {sort_field: 1}
+            )
+            position = (
+                [cursor_document.get(sort_field), cursor_document["_id"]]
+                if cursor_document
+                else None
+            )
+        else:
+            position = decode_cursor(cursor)
+
+        if position:
+            query = {"$and": [query, keyset_filter(sort_fields, position)]}
+
+    documents = (
+        await collection.find(query, projection)
+        .sort([(field, -1) for field in sort_fields])
+        .limit(size + 1)
+        .to_list(length=size + 1)
+    )
+
+    next_cursor = None
+    if len(documents) > size:
+        documents = documents[:size]
+        last = documents[-1]
+        next_cursor = encode_cursor(last.get(sort_field), last["_id"])
+
+    return documents, next_cursor
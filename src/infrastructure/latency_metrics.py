@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class LatencyMetrics:
+    """Per-operation latency counters (count, errors, avg/max seconds)."""
+
+    def __init__(self):
+        self._stats: dict[str, dict] = {}
+
+    def record(self, operation: str, seconds: float, ok: bool = True):
+        stat = self._stats.setdefault(
+            operation,
+            {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+        )
+        stat["count"] += 1
+        stat["total_seconds"] += seconds
+        stat["max_seconds"] = max(stat["max_seconds"], seconds)
+        if not ok:
+            stat["errors"] += 1
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[None]:
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(operation, time.perf_counter() - started, ok)
+
+    def snapshot(self) -> dict:
+        return {
+            operation: {
+                **stat,
+                "avg_seconds": stat["total_seconds"] / stat["count"],
+            }
+            for operation, stat in self._stats.items()
+        }
@@ -0,0 +1,38 @@
+from uuid import uuid4
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+
+from src.domain.interfaces.change_generation_repository import (
+    ChangeGenerationRepository,
+)
+from src.infrastructure.index_registry import IndexSpec
+
+
+class MongoChangeGenerationRepository(ChangeGenerationRepository):
+    """
+    change_generations 컬렉션: 유저마다 문서 하나 ({_id: user_id, epoch, diaries}).
+
+    epoch 는 문서가 처음 만들어질 때 정해지므로, 문서가 지워졌다 다시 생겨도
+    이전과 같은 버전 토큰이 나오지 않는다.
+    """
+
+    collection_name = "change_generations"
+    indexes: list[IndexSpec] = []
+
+    def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
+
+    async def get(self, user_id: str) -> str:
+        result = await self.collection.find_one({"_id": user_id})
+        if result is None:
+            return "0"
+        return f"{result['epoch']}.{result['diaries']}"
+
+    async def bump(self, user_id: str):
+        await self.collection.update_one(
+            {"_id": user_id},
+            {"$inc": {"diaries": 1}, "$setOnInsert": {"epoch": uuid4().hex}},
+            upsert=True,
+        )
@@ -1,40 +1,100 @@
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
-from src.domain.entities.chat import ChatMessage, ChatSession
+from src.domain.entities.chat import ChatMessage, ChatSession, MessageRole
 from src.domain.exceptions import NotFoundError
 from src.domain.interfaces.chat_repository import ChatRepository
+from src.infrastructure.hydration import hydrate
+from src.infrastructure.index_registry import IndexSpec
 
 
 class MongoChatRepository(ChatRepository):
-    def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
-        self.collection: AsyncIOMotorCollection = db_client[db_name]["chats"]
+    collection_name = "chats"
+    indexes = [
+        # 유저의 활성 세션 조회 (active=True 인 세션만 색인)
+        IndexSpec(
+            name="active_session_by_user_idx",
+            keys=[("user_id", 1)],
+            partial_filter={"active": True},
+        ),
+        # 일기로 이어지지 않은 세션은 마지막 대화 후 idle_ttl 이 지나면 자동 삭제
+        IndexSpec(
+            name="expires_at_ttl_idx", keys=[("expires_at", 1)], expire_after_seconds=0
+        ),
+    ]
+
+    def __init__(
+        self,
+        db_client: AsyncIOMotorClient,
+        db_name: str = "dailylog",
+        idle_ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
+        self.idle_ttl = timedelta(seconds=idle_ttl_seconds)
+
+    def _expires_at(self) -> datetime:
+        # 대화가 이어질 때마다 만료 시각을 뒤로 미룸 (sliding expiry)
+        return datetime.now(timezone.utc) + self.idle_ttl
+
+    @staticmethod
+    def _message_to_document(message: ChatMessage) -> dict:
+        # 메시지는 ObjectId 를 _id 로 저장 (find_message 의 $elemMatch 조회용)
+        message_dict = message.model_dump(mode="json", exclude={"id"})
+        message_dict["_id"] = (
+            ObjectId(message.id) if ObjectId.is_valid(message.id) else ObjectId()
+        )
+        return message_dict
 
     async def create_session(self, session: ChatSession) -> ChatSession:
-        dict = session.model_dump(mode="json", exclude={"id"})
+        dict = session.model_dump(mode="json", exclude={"id", "messages"})
+        dict["messages"] = [
+            self._message_to_document(message) for message in session.messages
+        ]
+        # TTL 인덱스는 Date 타입만 인식하므로 문자열로 덤프된 값을 덮어씀
+        session.expires_at = self._expires_at()
+        dict["expires_at"] = session.expires_at
         result = await self.collection.insert_one(dict)
         session.id = str(result.inserted_id)
+        for message, document in zip(session.messages, dict["messages"]):
+            message.id = str(document["_id"])
         return session
 
+    @staticmethod
+    def _active_session_query(user_id: str) -> dict:
+        # TTL monitor 가 아직 지우지 않은 만료 세션은 제외
+        # (expires_at 이 없는 기존 세션은 그대로 조회)
+        return {
+            "active": True,
+            "user_id": user_id,
+            "$or": [
+                {"expires_at": None},
+                {"expires_at": {"$gt": datetime.now(timezone.utc)}},
+            ],
+        }
+
     async def find_active_session(self, user_id: str) -> Optional[ChatSession]:
-        result = await self.collection.find_one({"active": True, "user_id": user_id})
+        result = await self.collection.find_one(self._active_session_query(user_id))
 
         if result is None:
             return None
 
-        # MongoDB _id를 id로 변환
-        _id = result.pop("_id")
-        result["id"] = str(_id)
+        # 세션과 메시지들의 _id 는 hydrate 에서 id 로 변환
+        return hydrate(ChatSession, result)
 
-        # messages 배열의 각 메시지도 _id를 id로 변환
-        if "messages" in result:
-            for message in result["messages"]:
-                if "_id" in message:
-                    message_id = message.pop("_id")
-                    message["id"] = str(message_id)
+    async def find_active_session_version(self, user_id: str) -> Optional[str]:
+        # 대화/요약이 추가될 때마다 updated_at 이 바뀌므로 (세션 id, updated_at) 로 충분
+        result = await self.collection.find_one(
+            self._active_session_query(user_id), {"updated_at": 1}
+        )
 
-        return ChatSession(**result)
+        if result is None:
+            return None
+
+        return f"{result['_id']}.{result.get('updated_at')}"
 
     async def add_message(
         self, session: ChatSession, message: ChatMessage
@@ -48,43 +108,176 @@ class MongoChatRepository(ChatRepository):
         message_dict["_id"] = object_id
 
         await self.collection.update_one(
-            {"_id": ObjectId(session.id)}, {"$push": {"messages": message_dict}}
+            {"_id": ObjectId(session.id)},
+            {
+                "$push": {"messages": message_dict},
+                "$set": {
+                    "updated_at": datetime.now().isoformat(),
+                    "expires_at": self._expires_at(),
+                },
+            },
         )
 
         message.id = str(object_id)
         return message
 
-    async def end_session(self, session: ChatSession):
-        # active 상태를 False로 변경
-        await self.collection.update_one(
-            {"_id": ObjectId(session.id)}, {"$set": {"active": False}}
+    async def add_turn(
+        self,
+        session_id: str,
+        user_message: ChatMessage,
+        assistant_message: ChatMessage,
+    ) -> tuple[ChatMessage, ChatMessage]:
+        # 유저 메시지와 AI 응답을 한 번의 $push ($each) 로 저장
+        documents = []
+        for message in (user_message, assistant_message):
+            message.id = str(ObjectId())
+            documents.append(self._message_to_document(message))
+
+        result = await self.collection.update_one(
+            {"_id": ObjectId(session_id)},
+            {
+                "$push": {"messages": {"$each": documents}},
+                "$set": {
+                    "updated_at": datetime.now().isoformat(),
+                    "expires_at": self._expires_at(),
+                },
+            },
+        )
+
+        if result.matched_count == 0:
+            raise NotFoundError()
+
+        return user_message, assistant_message
+
+    async def update_summary(
+        self,
+        session_id: str,
+        summary: str,
+        summarized_count: int,
+        expected_summarized_count: int,
+    ) -> bool:
+        # summarized_count 를 조건으로 걸어 동시에 실행된 요약 작업끼리 덮어쓰지 않음
+        # (필드가 없는 기존 세션은 0 으로 취급)
+        expected = (
+            {"$in": [0, None]}
+            if expected_summarized_count == 0
+            else expected_summarized_count
         )
+        result = await self.collection.update_one(
+            {"_id": ObjectId(session_id), "summarized_count": expected},
+            {
+                "$set": {
+                    "summary": summary,
+                    "summarized_count": summarized_count,
+                    "updated_at": datetime.now().isoformat(),
+                }
+            },
+        )
+        return result.modified_count > 0
+
+    async def end_session(self, session_id: str, retain: bool = False):
+        # active 상태를 False로 변경 (세션 문서는 읽지 않음)
+        update: dict = {"$set": {"active": False}}
+        if retain:
+            # 일기가 된 세션은 대화 기록 조회를 위해 만료시키지 않음
+            update["$unset"] = {"expires_at": ""}
+
+        result = await self.collection.update_one({"_id": ObjectId(session_id)}, update)
+
+        if result.matched_count == 0:
+            raise NotFoundError()
 
     async def find_session(self, session_id: str) -> ChatSession:
+        if not ObjectId.is_valid(session_id):
+            raise NotFoundError()
+
         result = await self.collection.find_one({"_id": ObjectId(session_id)})
 
         if result is None:
             raise NotFoundError()
 
-        result["id"] = str(result.pop("_id"))
+        return hydrate(ChatSession, result)
+
+    async def find_session_window(
+        self, session_id: str, max_messages: int
+    ) -> ChatSession:
+        if not ObjectId.is_valid(session_id):
+            raise NotFoundError()
 
-        # messages 배열의 각 메시지도 _id를 id로 변환
-        if "messages" in result:
-            for message in result["messages"]:
-                if "_id" in message:
-                    message_id = message.pop("_id")
-                    message["id"] = str(message_id)
+        # 세션 전체가 아닌 system 메시지 + 요약되지 않은 최근 메시지만 서버에서 잘라서 받음
+        # (요약된 이전 대화는 계속 쌓이므로 매 턴마다 읽지 않음)
+        system = MessageRole.system.value
+        pending = {
+            "$slice": [
+                "$$conversation",
+                {
+                    "$min": [
+                        {"$subtract": ["$$summarized", {"$size": "$$conversation"}]},
+                        0,
+                    ]
+                },
+            ]
+        }
+        pipeline: list = [
+            {"$match": {"_id": ObjectId(session_id)}},
+            {
+                "$project": {
+                    "user_id": 1,
+                    "active": 1,
+                    "summary": 1,
+                    "expires_at": 1,
+                    "created_at": 1,
+                    "updated_at": 1,
+                    "summarized_count": {"$literal": 0},
+                    "messages": {
+                        "$let": {
+                            "vars": {
+                                "conversation": {
+                                    "$filter": {
+                                        "input": "$messages",
+                                        "cond": {"$ne": ["$$this.role", system]},
+                                    }
+                                },
+                                "summarized": {"$ifNull": ["$summarized_count", 0]},
+                            },
+                            "in": {
+                                "$concatArrays": [
+                                    {
+                                        "$filter": {
+                                            "input": "$messages",
+                                            "cond": {"$eq": ["$$this.role", system]},
+                                        }
+                                    },
+                                    {"$slice": [pending, -max_messages]},
+                                ]
+                            },
+                        }
+                    },
+                }
+            },
+        ]
+        results = await self.collection.aggregate(pipeline).to_list(length=1)
 
-        return ChatSession(**result)
+        if not results:
+            raise NotFoundError()
+
+        return hydrate(ChatSession, results[0])
 
     async def find_message(self, session_id: str, message_id: str) -> ChatMessage:
-        found_session = await self.find_session(session_id)
+        # 세션 전체가 아닌, 조건에 맞는 메시지 하나만 projection 으로 조회
+        # (이전 버전에서 생성된 세션의 첫 메시지들은 문자열 id 필드를 가짐)
+        conditions: list[dict] = [{"id": message_id}]
+        if ObjectId.is_valid(message_id):
+            conditions.append({"_id": ObjectId(message_id)})
+
+        element_match = {"$elemMatch": {"$or": conditions}}
 
-        found_message = next(
-            (msg for msg in found_session.messages if msg.id == message_id), None
+        result = await self.collection.find_one(
+            {"_id": ObjectId(session_id), "messages": element_match},
+            {"_id": 0, "messages": element_match},
         )
 
-        if found_message:
-            return found_message
-        else:
+        if result is None or not result.get("messages"):
             raise NotFoundError()
+
+        return hydrate(ChatMessage, result["messages"][0])
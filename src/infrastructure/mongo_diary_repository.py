@@ -2,116 +2,257 @@ from datetime import date
 from typing import List, Optional
 
 from bson import ObjectId
-from src.domain.entities.diary import Diary
-from src.domain.exceptions import NotFoundError
+from src.domain.entities.diary import (
+    Diary,
+    DiarySummary,
+    Emotion,
+    EmotionTimeline,
+    EmotionTimelineEntry,
+)
+from src.domain.entities.page import Page
+from src.domain.exceptions import ConcurrentUpdateError, NotFoundError
 from src.domain.interfaces.diary_repository import DiaryRepository
+from src.infrastructure.hydration import hydrate
+from src.infrastructure.index_registry import IndexSpec
+from src.infrastructure.keyset_cursor import (
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    paginate,
+)
+from src.infrastructure.partial_update import partial_update
+from src.infrastructure.search_grams import document_grams, query_grams
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ReturnDocument, UpdateOne
+
+
+# 검색 인덱스 필드는 읽을 때 제외 (일기 본문보다 클 수 있음)
+READ_PROJECTION = {"search_grams": 0, "title_grams": 0}
+
+# 이전/다음 일기는 이동 버튼에 필요한 필드만 조회
+SUMMARY_PROJECTION = {"_id": 1, "writed_at": 1, "title": 1}
+
+# 검색 시 관련도를 계산하는 최대 후보 수 (가장 최근에 쓴 일기부터)
+# 한 글자 검색어처럼 거의 모든 일기에 맞는 검색도 이 개수만큼만 읽고 정렬한다
+MAX_SEARCH_CANDIDATES = 1000
+
+# 이 필드들이 바뀌면 검색 n-gram 을 다시 계산
+SEARCH_SOURCE_FIELDS = {"title", "content", "tags"}
+
+# 태그 저장 중 제목/본문이 계속 함께 바뀔 때의 최대 재시도 횟수
+MAX_SET_TAGS_ATTEMPTS = 5
 
 
 class MongoDiaryRepository(DiaryRepository):
+    collection_name = "diaries"
+    indexes = [
+        # 감정 타임라인 쿼리 최적화 (user_id + writed_at + emotion)
+        IndexSpec(
+            name="user_date_emotion_idx",
+            keys=[("user_id", 1), ("writed_at", 1), ("emotion", 1)],
+        ),
+        # 일기 목록 keyset 페이지네이션 최적화 (user_id + writed_at + _id 내림차순)
+        IndexSpec(
+            name="user_date_id_desc_idx",
+            keys=[("user_id", 1), ("writed_at", -1), ("_id", -1)],
+        ),
+        # 일기 n-gram 검색 (search_grams 는 배열이므로 multikey 인덱스)
+        # writed_at, _id 까지 포함해 후보를 최신순으로 정렬 없이 읽고 개수를 제한
+        IndexSpec(
+            name="user_search_grams_date_idx",
+            keys=[
+                ("user_id", 1),
+                ("search_grams", 1),
+                ("writed_at", -1),
+                ("_id", -1),
+            ],
+        ),
+    ]
+
     def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
-        self.collection: AsyncIOMotorCollection = db_client[db_name]["diaries"]
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
+
+    @staticmethod
+    def _search_fields(diary: Diary) -> dict:
+        # 제목/본문/태그의 n-gram 을 일기마다 저장 (search 의 multikey 인덱스용)
+        return {
+            "search_grams": document_grams([diary.title or "", diary.content, *diary.tags]),
+            "title_grams": document_grams([diary.title or ""]),
+        }
 
     async def delete(self, diary: Diary):
         await self.collection.delete_one({"_id": ObjectId(diary.id)})
 
     async def update(self, diary: Diary) -> Diary:
-        diary_dict = diary.model_dump(mode="json", exclude={"id"})
-
-        await self.collection.update_one(
-            {"_id": ObjectId(diary.id)}, {"$set": diary_dict}
+        # 문서 전체가 아닌 바뀐 필드만 저장 (본문이 그대로면 본문과 n-gram 은 보내지 않음)
+        search_fields = (
+            self._search_fields(diary)
+            if diary.changed_fields() & SEARCH_SOURCE_FIELDS
+            else {}
         )
+        update = partial_update(diary, **search_fields)
+
+        if update is not None:
+            await self.collection.update_one({"_id": ObjectId(diary.id)}, update)
+            diary.mark_clean()
 
         return diary
 
+    async def _find_one_and_set(
+        self, id: str, fields: dict, return_document: bool = ReturnDocument.AFTER
+    ) -> Diary:
+        # 조회 없이 필드만 바꾸고, 바뀐(또는 바뀌기 전) 문서를 같은 왕복에서 받음
+        result = await self.collection.find_one_and_update(
+            {"_id": ObjectId(id)},
+            {"$set": fields},
+            projection=READ_PROJECTION,
+            return_document=return_document,
+        )
+
+        if result is None:
+            raise NotFoundError()
+
+        return hydrate(Diary, result)
+
+    async def set_saved(self, id: str, saved: bool) -> Diary:
+        return await self._find_one_and_set(id, {"saved": saved})
+
+    async def set_tags(self, id: str, tags: List[str]) -> Diary:
+        # 검색 n-gram 은 제목/본문과 함께 계산되므로 제목/본문을 읽어서 계산한 뒤
+        # 읽은 값이 그대로일 때만 태그와 n-gram 을 한 번에 저장 (compare-and-swap)
+        # (제목은 그대로이므로 title_grams 는 건드리지 않음)
+        for _ in range(MAX_SET_TAGS_ATTEMPTS):
+            source = await self.collection.find_one(
+                {"_id": ObjectId(id)}, {"title": 1, "content": 1}
+            )
+            if source is None:
+                raise NotFoundError()
+
+            title = source.get("title")
+            content = source.get("content", "")
+            result = await self.collection.find_one_and_update(
+                {"_id": ObjectId(id), "title": title, "content": content},
+                {
+                    "$set": {
+                        "tags": tags,
+                        "search_grams": document_grams([title or "", content, *tags]),
+                    }
+                },
+                projection=READ_PROJECTION,
+                return_document=ReturnDocument.AFTER,
+            )
+            if result is not None:
+                return hydrate(Diary, result)
+
+        raise ConcurrentUpdateError()
+
+    async def set_emotion(self, id: str, emotion: Emotion) -> Diary:
+        # 감정 집계(rollup)는 바뀌기 전 감정을 빼야 하므로 이전 문서를 반환
+        return await self._find_one_and_set(
+            id, {"emotion": emotion.value}, ReturnDocument.BEFORE
+        )
+
     async def create(self, diary: Diary) -> Diary:
         dict = diary.model_dump(mode="json", exclude={"id"})
+        dict.update(self._search_fields(diary))
         result = await self.collection.insert_one(dict)
-        dict["id"] = str(result.inserted_id)
-        return Diary(**dict)
+        dict["_id"] = result.inserted_id
+        return hydrate(Diary, dict)
 
     async def find_by_date(self, date: date, user_id: str) -> Optional[Diary]:
         result = await self.collection.find_one(
-            {"writed_at": date.isoformat(), "user_id": user_id}
+            {"writed_at": date.isoformat(), "user_id": user_id}, READ_PROJECTION
         )
 
         if result is None:
             raise NotFoundError()
 
-        result["id"] = str(result.pop("_id"))
-        return Diary(**result)
+        return hydrate(Diary, result)
 
     async def find_by_id(self, id: str) -> Optional[Diary]:
-        result = await self.collection.find_one({"_id": ObjectId(id)})
+        result = await self.collection.find_one({"_id": ObjectId(id)}, READ_PROJECTION)
 
         if result is None:
             raise NotFoundError()
 
-        result["id"] = str(result.pop("_id"))
-        return Diary(**result)
+        return hydrate(Diary, result)
 
     async def get_diary_list(
-        self, user_id: str, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
-        # 해당 사용자의 일기만 조회
-        query: dict = {"user_id": user_id}
-
-        # cursor_id가 있으면 해당 일기의 날짜보다 오래된 일기들만 조회
-        if cursor_id:
-            cursor_diary = await self.collection.find_one({"_id": ObjectId(cursor_id)})
-            if cursor_diary:
-                query["writed_at"] = {"$lt": cursor_diary["writed_at"]}
-
-        # 날짜 기준 내림차순 정렬 (최신 일기가 먼저)
-        cursor = self.collection.find(query).sort("writed_at", -1).limit(size)
-        results = await cursor.to_list(length=size)
-
-        # MongoDB 문서를 Diary 엔티티로 변환
-        diaries = []
-        for result in results:
-            result["id"] = str(result.pop("_id"))
-            diaries.append(Diary(**result))
-
-        return diaries
-
-    async def get_next_diary(self, diary: Diary) -> Optional[Diary]:
-        """현재 일기보다 더 최신 날짜의 일기 반환 (같은 유저)"""
-        result = await self.collection.find_one(
-            {
-                "user_id": diary.user_id,
-                "writed_at": {"$gt": diary.writed_at.isoformat()},
-            },
-            sort=[("writed_at", 1)],  # 오름차순 정렬 (가장 가까운 다음 일기)
+        self, user_id: str, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
+        # 해당 사용자의 일기만, (writed_at, _id) 내림차순 (최신 일기가 먼저)
+        results, next_cursor = await paginate(
+            self.collection,
+            {"user_id": user_id},
+            "writed_at",
+            cursor,
+            size,
+            READ_PROJECTION,
         )
+        return Page(items=self._to_diaries(results), next_cursor=next_cursor)
 
-        if result is None:
-            return None
+    @staticmethod
+    def _to_diaries(results: List[dict]) -> List[Diary]:
+        # MongoDB 문서를 Diary 엔티티로 변환
+        return [hydrate(Diary, result) for result in results]
+
+    def _neighbour_lookup(self, name: str, operator: str, direction: int) -> dict:
+        # 같은 유저의 일기 중 writed_at 이 operator 조건을 만족하는 가장 가까운 하나
+        # (user_id + writed_at 인덱스 사용)
+        return {
+            "$lookup": {
+                "from": self.collection_name,
+                "let": {"user_id": "$user_id", "writed_at": "$writed_at"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "$expr": {
+                                "$and": [
+                                    {"$eq": ["$user_id", "$$user_id"]},
+                                    {operator: ["$writed_at", "$$writed_at"]},
+                                ]
+                            }
+                        }
+                    },
+                    {"$sort": {"writed_at": direction, "_id": direction}},
+                    {"$limit": 1},
+                    {"$project": SUMMARY_PROJECTION},
+                ],
+                "as": name,
+            }
+        }
 
-        result["id"] = str(result.pop("_id"))
-        return Diary(**result)
+    async def find_with_neighbours(
+        self, id: str
+    ) -> tuple[Diary, Optional[DiarySummary], Optional[DiarySummary]]:
+        # 일기와 다음(더 최신)/이전 일기를 한 번의 aggregation 으로 조회
+        pipeline: List[dict] = [
+            {"$match": {"_id": ObjectId(id)}},
+            {"$project": READ_PROJECTION},
+            self._neighbour_lookup("next", "$gt", 1),
+            self._neighbour_lookup("prev", "$lt", -1),
+        ]
+        results = await self.collection.aggregate(pipeline).to_list(length=1)
+
+        if not results:
+            raise NotFoundError()
 
-    async def get_prev_diary(self, diary: Diary) -> Optional[Diary]:
-        """현재 일기보다 이전 날짜의 일기 반환 (같은 유저)"""
-        result = await self.collection.find_one(
-            {
-                "user_id": diary.user_id,
-                "writed_at": {"$lt": diary.writed_at.isoformat()},
-            },
-            sort=[("writed_at", -1)],  # 내림차순 정렬 (가장 가까운 이전 일기)
+        result = results[0]
+        next, prev = result.pop("next"), result.pop("prev")
+        return (
+            hydrate(Diary, result),
+            hydrate(DiarySummary, next[0]) if next else None,
+            hydrate(DiarySummary, prev[0]) if prev else None,
         )
 
-        if result is None:
-            return None
-
-        result["id"] = str(result.pop("_id"))
-        return Diary(**result)
-
     async def get_emotions_timeline(
         self, user_id: str, start_date: Optional[date], end_date: Optional[date]
-    ) -> List[Diary]:
-        """Get diaries with emotion data for timeline visualization."""
+    ) -> EmotionTimeline:
+        """Get emotion timeline entries and counts in one aggregation."""
         # Query 구성
-        query = {
+        query: dict = {
             "user_id": user_id,
             "emotion": {"$ne": None},  # null 감정 제외
         }
@@ -125,55 +266,170 @@ class MongoDiaryRepository(DiaryRepository):
                 date_filter["$lte"] = end_date.isoformat()
             query["writed_at"] = date_filter
 
-        # 성능 최적화: 필요한 필드만 조회
-
-        # 시간순 정렬 (오래된 것부터)
-        cursor = self.collection.find(query).sort("writed_at", 1)
-        results = await cursor.to_list(length=None)
-
-        # Diary 엔티티로 변환
-        diaries = []
-        for result in results:
-            result["id"] = str(result.pop("_id"))
-            diaries.append(Diary(**result))
-
-        return diaries
+        # 본문(content) 없이 필요한 필드만 남기고,
+        # 타임라인과 통계를 $facet 으로 한 번에 계산
+        pipeline = [
+            {"$match": query},
+            {"$project": {"_id": 1, "writed_at": 1, "emotion": 1, "title": 1}},
+            {"$sort": {"writed_at": 1}},  # 시간순 정렬 (오래된 것부터)
+            {
+                "$facet": {
+                    "timeline": [{"$project": {"writed_at": 1, "emotion": 1, "title": 1}}],
+                    "counts": [
+                        {"$group": {"_id": "$emotion", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1, "_id": 1}},
+                    ],
+                    "range": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "start": {"$min": "$writed_at"},
+                                "end": {"$max": "$writed_at"},
+                            }
+                        }
+                    ],
+                }
+            },
+        ]
+
+        # $facet 결과는 항상 문서 하나
+        result = await self.collection.aggregate(pipeline).next()
+        date_range = result["range"][0] if result["range"] else {}
+
+        return EmotionTimeline(
+            entries=[
+                EmotionTimelineEntry(
+                    diary_id=str(entry["_id"]),
+                    writed_at=entry["writed_at"],
+                    emotion=entry["emotion"],
+                    title=entry.get("title"),
+                )
+                for entry in result["timeline"]
+            ],
+            emotion_counts={count["_id"]: count["count"] for count in result["counts"]},
+            start=date_range.get("start"),
+            end=date_range.get("end"),
+        )
 
     async def search(
-        self, user_id: str, query: str, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
-        """Search diaries by title, content, or tags using regex pattern matching."""
-        # 기본 쿼리: 해당 사용자의 일기만 검색
-        search_query: dict = {
-            "user_id": user_id,
-            "$or": [
-                {"title": {"$regex": query, "$options": "i"}},  # 대소문자 무시
-                {"content": {"$regex": query, "$options": "i"}},
-                {"tags": {"$regex": query, "$options": "i"}},  # tags 배열 내 부분 일치
-            ],
+        self, user_id: str, query: str, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
+        """
+        Search diaries by title, content, or tags using the n-gram index.
+
+        Only the newest MAX_SEARCH_CANDIDATES matches are ranked by relevance.
+        """
+        grams = query_grams(query)
+        if not grams:
+            return Page(items=[])
+
+        # 모든 검색어 n-gram 을 포함한 일기 중 최근 MAX_SEARCH_CANDIDATES 개만 후보로
+        # (user_id + search_grams + writed_at 인덱스 순서대로 읽으므로 정렬 없이 제한됨)
+        match: dict = {"user_id": user_id, "search_grams": {"$all": grams}}
+
+        # 관련도: 제목에 포함된 검색어 n-gram 수, 같으면 최신 일기가 먼저
+        # 정렬 전에 정렬 키만 남겨서 본문/n-gram 을 들고 정렬하지 않음
+        sort_fields = ["score", "writed_at", "_id"]
+        pipeline: list = [
+            {"$match": match},
+            {"$sort": {"writed_at": -1, "_id": -1}},
+            {"$limit": MAX_SEARCH_CANDIDATES},
+            {
+                "$project": {
+                    "writed_at": 1,
+                    "score": {
+                        "$size": {
+                            "$filter": {
+                                "input": grams,
+                                "cond": {
+                                    "$in": [
+                                        "$$this",
+                                        {"$ifNull": ["$title_grams", []]},
+                                    ]
+                                },
+                            }
+                        }
+                    },
+                }
+            },
+        ]
+
+        if cursor:
+            position = await self._search_position(cursor, grams)
+            if position:
+                pipeline.append({"$match": keyset_filter(sort_fields, position)})
+
+        pipeline += [
+            {"$sort": {field: -1 for field in sort_fields}},
+            {"$limit": size + 1},
+        ]
+
+        keys = await self.collection.aggregate(pipeline).to_list(length=size + 1)
+
+        next_cursor = None
+        if len(keys) > size:
+            keys = keys[:size]
+            last = keys[-1]
+            next_cursor = encode_cursor(last["score"], last["writed_at"], last["_id"])
+
+        # 페이지에 들어갈 일기만 _id 로 다시 읽어서 정렬 순서대로 배치
+        ids = [key["_id"] for key in keys]
+        documents = {
+            document["_id"]: document
+            async for document in self.collection.find(
+                {"_id": {"$in": ids}}, READ_PROJECTION
+            )
         }
+        results = [documents[key] for key in ids if key in documents]
+        return Page(items=self._to_diaries(results), next_cursor=next_cursor)
 
-        # cursor_id가 있으면 해당 일기의 날짜보다 오래된 일기들만 조회
-        if cursor_id:
-            cursor_diary = await self.collection.find_one({"_id": ObjectId(cursor_id)})
-            if cursor_diary:
-                search_query["writed_at"] = {"$lt": cursor_diary["writed_at"]}
-
-        # 날짜 기준 내림차순 정렬 (최신 일기가 먼저)
-        cursor = self.collection.find(search_query).sort("writed_at", -1).limit(size)
-        results = await cursor.to_list(length=size)
-
-        # MongoDB 문서를 Diary 엔티티로 변환
-        diaries = []
-        for result in results:
-            result["id"] = str(result.pop("_id"))
-            diaries.append(Diary(**result))
+    async def _search_position(self, cursor: str, grams: List[str]) -> Optional[list]:
+        if not ObjectId.is_valid(cursor):
+            return decode_cursor(cursor, length=3)
 
-        return diaries
+        # 이전 버전 클라이언트가 보내는 문서 id 커서: 관련도를 다시 계산
+        cursor_diary = await self.collection.find_one(
+            {"_id": ObjectId(cursor)}, {"writed_at": 1, "title_grams": 1}
+        )
+        if cursor_diary is None:
+            return None
+        score = len(set(cursor_diary.get("title_grams", [])) & set(grams))
+        return [score, cursor_diary["writed_at"], cursor_diary["_id"]]
+
+    async def reindex_search(self, user_id: Optional[str] = None) -> int:
+        query: dict = {"user_id": user_id} if user_id else {}
+        projection = {"title": 1, "content": 1, "tags": 1}
+
+        count = 0
+        operations = []
+        async for document in self.collection.find(query, projection):
+            grams = {
+                "search_grams": document_grams(
+                    [
+                        document.get("title") or "",
+                        document.get("content", ""),
+                        *document.get("tags", []),
+                    ]
+                ),
+                "title_grams": document_grams([document.get("title") or ""]),
+            }
+            operations.append(UpdateOne({"_id": document["_id"]}, {"$set": grams}))
+
+            # 메모리 사용량을 일정하게 유지하도록 나눠서 반영
+            if len(operations) >= 500:
+                await self.collection.bulk_write(operations, ordered=False)
+                count += len(operations)
+                operations = []
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+            count += len(operations)
+
+        return count
 
     async def get_saved_diaries(
-        self, user_id: str, cursor_id: Optional[str], size: int
-    ) -> List[Diary]:
+        self, user_id: str, cursor: Optional[str], size: int
+    ) -> Page[Diary]:
         """저장된 일기 목록 조회 (saved=True인 일기들)"""
         # 기본 쿼리: 해당 사용자의 저장된 일기만 조회
         query: dict = {
@@ -181,20 +437,7 @@ class MongoDiaryRepository(DiaryRepository):
             "saved": True
         }
 
-        # cursor_id가 있으면 해당 일기의 날짜보다 오래된 일기들만 조회
-        if cursor_id:
-            cursor_diary = await self.collection.find_one({"_id": ObjectId(cursor_id)})
-            if cursor_diary:
-                query["writed_at"] = {"$lt": cursor_diary["writed_at"]}
-
-        # 날짜 기준 내림차순 정렬 (최신 일기가 먼저)
-        cursor = self.collection.find(query).sort("writed_at", -1).limit(size)
-        results = await cursor.to_list(length=size)
-
-        # MongoDB 문서를 Diary 엔티티로 변환
-        diaries = []
-        for result in results:
-            result["id"] = str(result.pop("_id"))
-            diaries.append(Diary(**result))
-
-        return diaries
+        results, next_cursor = await paginate(
+            self.collection, query, "writed_at", cursor, size, READ_PROJECTION
+        )
+        return Page(items=self._to_diaries(results), next_cursor=next_cursor)
@@ -6,12 +6,23 @@ from src.domain.entities.email_verification_code import EmailVerificationCode
 from src.domain.interfaces.email_verification_code_repository import (
     EmailVerificationCodeRepository,
 )
+from src.infrastructure.index_registry import IndexSpec
 
 
 class MongoEmailVerificationCodeRepository(EmailVerificationCodeRepository):
+    collection_name = "email_verification_codes"
+    indexes = [
+        # 유저별 인증 코드 조회/삭제
+        IndexSpec(name="user_id_idx", keys=[("user_id", 1)]),
+        # 만료된 인증 코드는 검증되지 않아도 자동 삭제
+        IndexSpec(
+            name="expired_at_ttl_idx", keys=[("expired_at", 1)], expire_after_seconds=0
+        ),
+    ]
+
     def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
         self.collection: AsyncIOMotorCollection = db_client[db_name][
-            "email_verification_codes"
+            self.collection_name
         ]
 
     async def find_by_user_id(self, user_id: str) -> Optional[EmailVerificationCode]:
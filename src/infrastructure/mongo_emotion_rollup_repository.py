@@ -0,0 +1,156 @@
+from collections import defaultdict
+from datetime import date
+from typing import List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+from src.domain.entities.diary import Emotion
+from src.domain.entities.emotion_rollup import EmotionRollup, RollupGranularity
+from src.domain.interfaces.emotion_rollup_repository import EmotionRollupRepository
+from src.infrastructure.index_registry import IndexSpec
+
+
+class MongoEmotionRollupRepository(EmotionRollupRepository):
+    """
+    emotion_rollups 컬렉션: (user_id, granularity, bucket) 마다 문서 하나.
+
+    일기 변경 시 $inc 로 증분 갱신하고, rebuild 로 diaries 에서 전부 다시 계산한다.
+    """
+
+    collection_name = "emotion_rollups"
+    indexes = [
+        # 유저별 버킷 하나, 기간 조회
+        IndexSpec(
+            name="user_granularity_bucket_idx",
+            keys=[("user_id", 1), ("granularity", 1), ("bucket", 1)],
+            unique=True,
+            required=True,
+        ),
+    ]
+
+    def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
+        self.diaries: AsyncIOMotorCollection = db_client[db_name]["diaries"]
+
+    async def apply(self, changes: List[tuple[str, date, Emotion, int]]):
+        # 같은 버킷에 대한 변경은 합쳐서 한 번의 bulk_write 로 반영
+        deltas: dict[tuple[str, RollupGranularity, date], dict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        for user_id, writed_at, emotion, delta in changes:
+            for granularity in RollupGranularity:
+                bucket = granularity.bucket_start(writed_at)
+                increments = deltas[(user_id, granularity, bucket)]
+                increments["total_count"] += delta
+                increments[f"emotion_counts.{emotion.value}"] += delta
+                increments["score_sum"] += delta * emotion.score()
+
+        operations = []
+        for (user_id, granularity, bucket), increments in deltas.items():
+            non_zero = {field: value for field, value in increments.items() if value}
+            if not non_zero:
+                continue
+            operations.append(
+                UpdateOne(
+                    {
+                        "user_id": user_id,
+                        "granularity": granularity.value,
+                        "bucket": bucket.isoformat(),
+                    },
+                    {"$inc": non_zero},
+                    upsert=True,
+                )
+            )
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def find(
+        self,
+        user_id: str,
+        granularity: RollupGranularity,
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[EmotionRollup]:
+        query: dict = {"user_id": user_id, "granularity": granularity.value}
+
+        # 범위의 시작/끝이 걸친 버킷도 포함
+        if start_date or end_date:
+            bucket_filter = {}
+            if start_date:
+                bucket_filter["$gte"] = granularity.bucket_start(start_date).isoformat()
+            if end_date:
+                bucket_filter["$lte"] = end_date.isoformat()
+            query["bucket"] = bucket_filter
+
+        rollups = []
+        async for result in self.collection.find(query, {"_id": 0}).sort("bucket", 1):
+            # 모든 일기가 삭제된 버킷은 제외
+            if result.get("total_count", 0) > 0:
+                rollups.append(EmotionRollup(**result))
+
+        return rollups
+
+    async def rebuild(self, user_id: Optional[str] = None) -> int:
+        scope: dict = {"user_id": user_id} if user_id else {}
+        query: dict = {"emotion": {"$ne": None}, **scope}
+
+        # 다시 계산한 결과에 없는 버킷만 지우기 위해 기존 버킷을 먼저 기록
+        # (rebuild 중에 apply 가 새로 만든 버킷은 지우지 않음)
+        existing: dict[tuple[str, str, str], tuple[object, int]] = {}
+        async for result in self.collection.find(
+            scope, {"user_id": 1, "granularity": 1, "bucket": 1, "total_count": 1}
+        ):
+            key = (result["user_id"], result["granularity"], result["bucket"])
+            existing[key] = (result["_id"], result.get("total_count", 0))
+
+        # 필요한 필드만 스트리밍하며 버킷별로 누적 (메모리는 O(버킷 수))
+        rollups: dict[tuple[str, RollupGranularity, date], EmotionRollup] = {}
+        projection = {"_id": 0, "user_id": 1, "writed_at": 1, "emotion": 1}
+        async for diary in self.diaries.find(query, projection):
+            emotion = Emotion(diary["emotion"])
+            writed_at = date.fromisoformat(diary["writed_at"])
+            for granularity in RollupGranularity:
+                bucket = granularity.bucket_start(writed_at)
+                key = (diary["user_id"], granularity, bucket)
+                rollup = rollups.get(key)
+                if rollup is None:
+                    rollup = EmotionRollup(
+                        user_id=diary["user_id"], granularity=granularity, bucket=bucket
+                    )
+                    rollups[key] = rollup
+                rollup.total_count += 1
+                rollup.emotion_counts[emotion.value] = (
+                    rollup.emotion_counts.get(emotion.value, 0) + 1
+                )
+                rollup.score_sum += emotion.score()
+
+        # 전체를 지우고 다시 넣지 않고 버킷마다 교체 (upsert)
+        # 동시에 실행되는 apply 의 $inc upsert 와 중복 키로 충돌해 중단되지 않는다
+        operations: list = []
+        recomputed = set()
+        for (rollup_user_id, granularity, bucket), rollup in rollups.items():
+            key = (rollup_user_id, granularity.value, bucket.isoformat())
+            recomputed.add(key)
+            operations.append(
+                ReplaceOne(
+                    {"user_id": key[0], "granularity": key[1], "bucket": key[2]},
+                    rollup.model_dump(mode="json"),
+                    upsert=True,
+                )
+            )
+
+        # 더 이상 일기가 없는 버킷 삭제 (그 사이 apply 로 바뀐 버킷은 남겨 둠)
+        operations.extend(
+            DeleteOne({"_id": _id, "total_count": total_count})
+            for key, (_id, total_count) in existing.items()
+            if key not in recomputed
+        )
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+        return len(rollups)
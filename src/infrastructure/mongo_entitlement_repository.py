@@ -0,0 +1,118 @@
+from datetime import datetime
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.domain.entities.entitlement import Entitlement
+from src.domain.entities.payments_log import PaymentsLog, UserGrade
+from src.domain.interfaces.entitlement_repository import EntitlementRepository
+from src.infrastructure.hydration import hydrate
+from src.infrastructure.index_registry import IndexSpec
+
+
+class MongoEntitlementRepository(EntitlementRepository):
+    """
+    entitlements 컬렉션: 유저마다 문서 하나 ({_id: user_id, grade, valid_until}).
+
+    결제 내역이 저장될 때 갱신되므로, 구독 중인 유저는 payments_logs 를
+    조회하지 않아도 된다. entitlement 가 없거나 만료된 경우에는 이 저장소를 거치지 않고
+    저장된 결제가 있을 수 있으므로 최신 결제 내역으로 확인해 채운다 (read-repair).
+    """
+
+    payments_collection_name = "payments_logs"
+
+    collection_name = "entitlements"
+    indexes: list[IndexSpec] = []
+
+    def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
+        self.db = db_client[db_name]
+        self.collection: AsyncIOMotorCollection = self.db[self.collection_name]
+
+    @staticmethod
+    def _from_document(document: dict) -> Entitlement:
+        document["user_id"] = document.pop("_id")
+        return Entitlement.model_validate(document)
+
+    async def _latest_payment(self, user_id: str) -> Optional[PaymentsLog]:
+        # 이전의 쓰기 경로와 같은 기준: 유저의 가장 최근 결제 (_id 내림차순)
+        result = await self.db[self.payments_collection_name].find_one(
+            {"user_id": user_id}, sort=[("_id", DESCENDING)]
+        )
+
+        if result is None:
+            return None
+
+        return hydrate(PaymentsLog, result)
+
+    async def find_by_user_id(self, user_id: str) -> Optional[Entitlement]:
+        result = await self.collection.find_one({"_id": user_id})
+        entitlement = self._from_document(result) if result is not None else None
+
+        if entitlement is not None and entitlement.is_active():
+            return entitlement
+
+        payments = await self._latest_payment(user_id)
+        if payments is None:
+            return entitlement
+
+        valid_until = Entitlement.valid_until_for(payments.end_date)
+        if entitlement is None or entitlement.valid_until < valid_until:
+            entitlement = await self.grant(user_id, payments.grade, valid_until)
+
+        return entitlement
+
+    async def grant(
+        self, user_id: str, grade: UserGrade, valid_until: datetime
+    ) -> Entitlement:
+        # 더 긴 구독 기간일 때만 grade 와 valid_until 을 함께 바꿈
+        # (결제가 순서와 다르게 반영되어도 두 값이 같은 결제에서 옴)
+        filter = {
+            "_id": user_id,
+            "$or": [
+                {"valid_until": {"$lt": valid_until}},
+                {"valid_until": None},
+            ],
+        }
+        update = {
+            "$set": {
+                "grade": grade.value,
+                "valid_until": valid_until,
+                "updated_at": datetime.now(),
+            }
+        }
+
+        try:
+            result = await self.collection.find_one_and_update(
+                filter, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # 문서가 이미 있어 filter 에 걸리지 않았거나 (더 긴 구독), 동시에 만들어진 경우
+            result = await self.collection.find_one_and_update(
+                filter, update, return_document=ReturnDocument.AFTER
+            )
+            if result is None:
+                result = await self.collection.find_one({"_id": user_id})
+
+        return self._from_document(result)
+
+    async def has_active_subscription(self, user_id: str) -> bool:
+        entitlement = await self.find_by_user_id(user_id)
+        return entitlement is not None and entitlement.is_active()
+
+    async def backfill(self) -> int:
+        """Rebuild entitlements from the payments log; returns the user count."""
+        valid_until: dict[str, tuple[datetime, UserGrade]] = {}
+
+        async for document in self.db[self.payments_collection_name].find({}):
+            payments = hydrate(PaymentsLog, document)
+            until = Entitlement.valid_until_for(payments.end_date)
+            current = valid_until.get(payments.user_id)
+            if current is None or current[0] < until:
+                valid_until[payments.user_id] = (until, payments.grade)
+
+        for user_id, (until, grade) in valid_until.items():
+            await self.grant(user_id, grade, until)
+
+        return len(valid_until)
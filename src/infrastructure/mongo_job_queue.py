@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ReturnDocument
+
+from src.domain.entities.job import Job, JobStatus
+from src.domain.interfaces.job_queue import JobQueue
+from src.infrastructure.index_registry import IndexSpec
+
+
+class MongoJobQueue(JobQueue):
+    """
+    Durable job queue on the jobs collection.
+
+    - claim: find_one_and_update 로 원자적으로 작업을 점유 (status=running)
+    - visibility timeout: locked_until 이 지나면 다른 워커가 다시 가져갈 수 있음
+    - 실패 시 지수 백오프로 재시도, max_attempts 초과 시 dead 로 남겨둠
+      (dead 작업은 보관 기간이 지나면 TTL 인덱스로 자동 삭제)
+    - 성공한 작업은 삭제해 컬렉션 크기를 작게 유지
+    """
+
+    collection_name = "jobs"
+    indexes = [
+        # 실행 가능한 작업 점유 쿼리 최적화
+        IndexSpec(name="status_run_at_idx", keys=[("status", 1), ("run_at", 1)]),
+        IndexSpec(
+            name="status_locked_until_idx", keys=[("status", 1), ("locked_until", 1)]
+        ),
+        # dead 작업은 원인 확인을 위해 잠시 남겨두고 expires_at 이 지나면 자동 삭제
+        IndexSpec(
+            name="expires_at_ttl_idx", keys=[("expires_at", 1)], expire_after_seconds=0
+        ),
+    ]
+
+    def __init__(
+        self,
+        db_client: AsyncIOMotorClient,
+        db_name: str = "dailylog",
+        visibility_timeout_seconds: float = 300,
+        backoff_base_seconds: float = 5,
+        backoff_max_seconds: float = 3600,
+        dead_job_retention_seconds: float = 7 * 24 * 3600,
+    ):
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
+        self.visibility_timeout = timedelta(seconds=visibility_timeout_seconds)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.dead_job_retention = timedelta(seconds=dead_job_retention_seconds)
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict,
+        max_attempts: int = 5,
+        delay_seconds: float = 0,
+    ) -> Job:
+        job = Job(
+            name=name,
+            payload=payload,
+            max_attempts=max_attempts,
+            run_at=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+        )
+        job_dict = job.model_dump(exclude={"id"})
+        job_dict["_id"] = ObjectId(job.id)
+        await self.collection.insert_one(job_dict)
+        return job
+
+    async def claim(self) -> Optional[Job]:
+        """Atomically lock the oldest runnable job, or return None."""
+        now = datetime.now(timezone.utc)
+
+        result = await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": JobStatus.PENDING.value, "run_at": {"$lte": now}},
+                    # visibility timeout 이 지난 작업 (워커가 죽은 경우 등)
+                    {"status": JobStatus.RUNNING.value, "locked_until": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "locked_until": now + self.visibility_timeout,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if result is None:
+            return None
+
+        result["id"] = str(result.pop("_id"))
+        return Job(**result)
+
+    async def complete(self, job: Job):
+        # attempts 를 fencing token 으로 사용: 타임아웃 후 다른 워커가
+        # 다시 가져간 작업은 건드리지 않는다
+        await self.collection.delete_one(
+            {"_id": ObjectId(job.id), "attempts": job.attempts}
+        )
+
+    async def fail(self, job: Job, error: str):
+        now = datetime.now(timezone.utc)
+
+        if job.attempts >= job.max_attempts:
+            update: dict = {
+                "status": JobStatus.DEAD.value,
+                "locked_until": None,
+                "last_error": error,
+                "updated_at": now,
+                "expires_at": now + self.dead_job_retention,
+            }
+        else:
+            delay = min(
+                self.backoff_base_seconds * (2 ** (job.attempts - 1)),
+                self.backoff_max_seconds,
+            )
+            update = {
+                "status": JobStatus.PENDING.value,
+                "run_at": now + timedelta(seconds=delay),
+                "locked_until": None,
+                "last_error": error,
+                "updated_at": now,
+            }
+
+        await self.collection.update_one(
+            {"_id": ObjectId(job.id), "attempts": job.attempts}, {"$set": update}
+        )
@@ -2,22 +2,48 @@ from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 
 from typing import Any, Dict, List, Optional
+from src.domain.entities.entitlement import Entitlement
 from src.domain.entities.payments_log import PaymentsLog
 from src.domain.exceptions import NotFoundError
+from src.domain.interfaces.entitlement_repository import EntitlementRepository
 from src.domain.interfaces.payments_repository import PaymentsRepository
+from src.infrastructure.index_registry import IndexSpec
 
 
 class MongoPaymentsRepository(PaymentsRepository):
-    def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
-        self.collection: AsyncIOMotorCollection = db_client[db_name]["payments_logs"]
+    collection_name = "payments_logs"
+    indexes = [
+        # 유저별 결제 내역 (최신순)
+        IndexSpec(name="user_id_desc_idx", keys=[("user_id", 1), ("_id", -1)]),
+    ]
+
+    def __init__(
+        self,
+        db_client: AsyncIOMotorClient,
+        entitlement_repository: Optional[EntitlementRepository] = None,
+        db_name: str = "dailylog",
+    ):
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
+        self.entitlement_repository = entitlement_repository
 
     async def create(self, payments: PaymentsLog):
         id = payments.id
-        dict = payments.model_dump(exclude={"id"})
+        # start_date/end_date 는 date 라 BSON 으로 저장할 수 없으므로 json 모드로 덤프
+        dict = payments.model_dump(mode="json", exclude={"id"})
         dict["_id"] = ObjectId(id)
 
         await self.collection.insert_one(dict)
 
+        # 결제가 저장된 뒤 유저의 구독 상태(entitlement)를 갱신
+        if self.entitlement_repository is not None:
+            await self.entitlement_repository.grant(
+                payments.user_id,
+                payments.grade,
+                Entitlement.valid_until_for(payments.end_date),
+            )
+
     async def find_by_id(self, payments_id: str) -> PaymentsLog:
         result = await self.collection.find_one({"_id": ObjectId(payments_id)})
 
@@ -1,16 +1,39 @@
-from typing import List, Optional
+import asyncio
+from datetime import datetime
+from typing import Optional
 
-from bson import ObjectId
+from bson import Binary, ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import UpdateOne
 
+from src.domain.entities.page import Page
 from src.domain.entities.post import Post
-from src.domain.exceptions import NotFoundError
+from src.domain.exceptions import ConcurrentUpdateError, NotFoundError
 from src.domain.interfaces.post_repository import PostRepository
+from src.infrastructure.hydration import hydrate
+from src.infrastructure.hyperloglog import HyperLogLog
+from src.infrastructure.index_registry import IndexSpec
+from src.infrastructure.keyset_cursor import paginate
+from src.infrastructure.partial_update import partial_update
+
+# 조회 시 고유 방문자 스케치(2 KB)는 제외 (추정치는 unique_viewers 에 함께 저장됨)
+READ_PROJECTION = {"viewers_hll": 0}
+
+# 스케치 병합이 다른 프로세스와 계속 충돌할 때의 최대 재시도 횟수
+MAX_SKETCH_MERGE_ATTEMPTS = 5
 
 
 class MongoPostRepository(PostRepository):
+    collection_name = "posts"
+    indexes = [
+        # created_at + _id 내림차순 keyset 페이지네이션
+        IndexSpec(name="created_at_id_desc_idx", keys=[("created_at", -1), ("_id", -1)]),
+    ]
+
     def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
-        self.collection: AsyncIOMotorCollection = db_client[db_name]["posts"]
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
 
     async def delete(self, post_id: str):
         await self.collection.delete_one({"_id": ObjectId(post_id)})
@@ -19,47 +42,126 @@ class MongoPostRepository(PostRepository):
         """Create a new post"""
         post_dict = post.model_dump(mode="json", exclude={"id"})
         result = await self.collection.insert_one(post_dict)
-        post_dict["id"] = str(result.inserted_id)
-        return Post(**post_dict)
+        post_dict["_id"] = result.inserted_id
+        return hydrate(Post, post_dict)
 
     async def get(self, post_id: str) -> Post:
         """Get post by ID"""
-        result = await self.collection.find_one({"_id": ObjectId(post_id)})
+        result = await self.collection.find_one(
+            {"_id": ObjectId(post_id)}, READ_PROJECTION
+        )
 
         if result is None:
             raise NotFoundError()
 
-        result["id"] = str(result.pop("_id"))
-        return Post(**result)
+        return hydrate(Post, result)
 
-    async def get_list(self, cursor_id: Optional[str], size: int) -> List[Post]:
-        """Get all posts with cursor-based pagination (latest first)"""
-        query: dict = {}
+    async def exists(self, post_id: str) -> bool:
+        if not ObjectId.is_valid(post_id):
+            return False
 
-        # cursor_id가 있으면 해당 포스트보다 오래된 포스트들만 조회
-        if cursor_id:
-            cursor_post = await self.collection.find_one({"_id": ObjectId(cursor_id)})
-            if cursor_post:
-                query["created_at"] = {"$lt": cursor_post["created_at"]}
+        result = await self.collection.find_one({"_id": ObjectId(post_id)}, {"_id": 1})
+        return result is not None
 
-        # 생성일 기준 내림차순 정렬 (최신 포스트가 먼저)
-        cursor = self.collection.find(query).sort("created_at", -1).limit(size)
-        results = await cursor.to_list(length=size)
+    async def get_list(self, cursor: Optional[str], size: int) -> Page[Post]:
+        """Get all posts with keyset pagination (latest first)"""
+        # (created_at, _id) 내림차순 (최신 포스트가 먼저)
+        results, next_cursor = await paginate(
+            self.collection, {}, "created_at", cursor, size, READ_PROJECTION
+        )
 
         # MongoDB 문서를 Post 엔티티로 변환
-        posts = []
-        for result in results:
-            result["id"] = str(result.pop("_id"))
-            posts.append(Post(**result))
+        posts = [hydrate(Post, result) for result in results]
 
-        return posts
+        return Page(items=posts, next_cursor=next_cursor)
 
     async def update(self, post: Post) -> Post:
-        """Update existing post"""
-        post_dict = post.model_dump(mode="json", exclude={"id"})
+        """Update the fields changed since the post was loaded"""
+        update = partial_update(post)
 
-        await self.collection.update_one(
-            {"_id": ObjectId(post.id)}, {"$set": post_dict}
-        )
+        if update is not None:
+            await self.collection.update_one({"_id": ObjectId(post.id)}, update)
+            post.mark_clean()
 
         return post
+
+    async def increment_view_count(self, post_id: str):
+        """Increment view_count without reading the post"""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(post_id)},
+            {
+                "$inc": {"view_count": 1},
+                "$set": {"updated_at": datetime.now().isoformat()},
+            },
+        )
+
+        if result.matched_count == 0:
+            raise NotFoundError()
+
+    async def add_view_counts(self, counts: dict[str, int]):
+        # 포스트별 증가량을 bulk_write 한 번으로 저장 (이미 삭제된 포스트는 무시됨)
+        if not counts:
+            return
+
+        updated_at = datetime.now().isoformat()
+        await self.collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": ObjectId(post_id)},
+                    {"$inc": {"view_count": views}, "$set": {"updated_at": updated_at}},
+                )
+                for post_id, views in counts.items()
+            ],
+            ordered=False,
+        )
+
+    async def add_viewer(self, post_id: str, viewer_id: str):
+        sketch = HyperLogLog()
+        sketch.add(viewer_id)
+        await self._merge_sketch(post_id, sketch)
+
+    async def merge_viewer_sketches(self, sketches: dict[str, bytes]):
+        results = await asyncio.gather(
+            *[
+                self._merge_sketch(post_id, HyperLogLog(registers))
+                for post_id, registers in sketches.items()
+            ],
+            return_exceptions=True,
+        )
+        # 모든 병합이 끝난 뒤 실패를 올려서 호출 측(버퍼)이 스케치를 보관하게 함
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _merge_sketch(self, post_id: str, sketch: HyperLogLog):
+        # 바이너리 레지스터는 서버에서 합칠 수 없으므로 읽어서 합친 뒤
+        # 읽은 값과 같을 때만 저장 (compare-and-swap), 충돌하면 다시 읽어서 재시도
+        for _ in range(MAX_SKETCH_MERGE_ATTEMPTS):
+            result = await self.collection.find_one(
+                {"_id": ObjectId(post_id)}, {"viewers_hll": 1}
+            )
+            if result is None:
+                return
+
+            stored = result.get("viewers_hll")
+            merged = HyperLogLog(stored) if stored is not None else HyperLogLog()
+            if not merged.merge(sketch) and stored is not None:
+                # 이미 반영된 방문자만 있으면 쓰지 않음
+                return
+
+            update = await self.collection.update_one(
+                {
+                    "_id": ObjectId(post_id),
+                    "viewers_hll": Binary(stored) if stored is not None else None,
+                },
+                {
+                    "$set": {
+                        "viewers_hll": Binary(merged.to_bytes()),
+                        "unique_viewers": merged.estimate(),
+                    }
+                },
+            )
+            if update.matched_count > 0:
+                return
+
+        raise ConcurrentUpdateError()
@@ -1,26 +1,114 @@
+import hashlib
+from uuid import uuid4
+
 from src.domain.interfaces.refresh_token_repository import RefreshTokenRepository
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
-from typing import List
+from datetime import datetime, timedelta, timezone
+from src.infrastructure.index_registry import IndexSpec
 
 
 class MongoRefreshTokenRepository(RefreshTokenRepository):
+    """
+    Refresh tokens stored as SHA-256 digests, one document per device.
+
+    로그인할 때마다 새 family(기기)가 생기고, refresh 는 같은 family 의 문서를
+    find_one_and_update 한 번으로 교체한다. 이미 교체된 토큰은 다시 쓸 수 없다.
+    """
+
+    collection_name = "refresh_tokens"
+    indexes = [
+        # 토큰 검증/교체 (원문 대신 digest 로 조회)
+        IndexSpec(
+            name="token_hash_unique_idx",
+            keys=[("token_hash", 1)],
+            unique=True,
+            partial_filter={"token_hash": {"$exists": True}},
+            required=True,
+        ),
+        # 해싱 도입 이전에 발급된 토큰 조회 (모두 만료되면 제거 가능)
+        IndexSpec(name="refresh_token_idx", keys=[("refresh_token", 1)]),
+        # 유저별 토큰 삭제
+        IndexSpec(name="user_id_idx", keys=[("user_id", 1)]),
+        # 만료된 토큰은 MongoDB TTL monitor 가 자동 삭제
+        IndexSpec(
+            name="expires_at_ttl_idx", keys=[("expires_at", 1)], expire_after_seconds=0
+        ),
+    ]
+
     def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
-        self.collection: AsyncIOMotorCollection = db_client[db_name]["refresh_tokens"]
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
-    async def create(self, token: str, user_id: str):
-        await self.collection.insert_one({"user_id": user_id, "refresh_token": token})
+    async def create(self, token: str, user_id: str, expires_at: datetime):
+        await self.collection.insert_one(
+            {
+                "token_hash": self._hash(token),
+                "user_id": user_id,
+                "family_id": uuid4().hex,
+                "expires_at": expires_at,
+            }
+        )
+
+    async def rotate(
+        self, token: str, user_id: str, new_token: str, expires_at: datetime
+    ) -> bool:
+        # 조회와 교체를 한 번에 처리하므로 같은 토큰으로 동시에 refresh 해도 한 쪽만 성공
+        rotated = await self.collection.find_one_and_update(
+            {
+                "token_hash": self._hash(token),
+                "user_id": user_id,
+                "expires_at": {"$gt": datetime.now(timezone.utc)},
+            },
+            {"$set": {"token_hash": self._hash(new_token), "expires_at": expires_at}},
+            projection={"_id": 1},
+        )
+        if rotated is not None:
+            return True
+
+        # 해싱 도입 이전에 평문으로 저장된 토큰은 삭제 후 새 family 로 발급
+        legacy = await self.collection.find_one_and_delete(
+            {"refresh_token": token, "user_id": user_id}, projection={"_id": 1}
+        )
+        if legacy is None:
+            return False
+
+        await self.create(new_token, user_id, expires_at)
+        return True
+
+    async def backfill_expires_at(self, lifetime: timedelta) -> int:
+        """Set expires_at on tokens stored before it existed (from _id time)."""
+        result = await self.collection.update_many(
+            {"expires_at": {"$exists": False}},
+            [
+                {
+                    "$set": {
+                        "expires_at": {
+                            "$add": [
+                                {"$toDate": "$_id"},
+                                int(lifetime.total_seconds() * 1000),
+                            ]
+                        }
+                    }
+                }
+            ],
+        )
+        return result.modified_count
 
     async def delete(self, token: str):
-        await self.collection.delete_one({"refresh_token": token})
+        await self.collection.delete_one(
+            {"$or": [{"token_hash": self._hash(token)}, {"refresh_token": token}]}
+        )
 
     async def delete_by_user_id(self, user_id: str):
         await self.collection.delete_many({"user_id": user_id})
 
-    async def find_tokens_by_user_id(self, user_id: str) -> List[str]:
-        cursor = self.collection.find({"user_id": user_id})
-        documents = await cursor.to_list(length=None)
-        return [doc["refresh_token"] for doc in documents]
-
     async def exists(self, token: str) -> bool:
-        result = await self.collection.find_one({"refresh_token": token})
+        result = await self.collection.find_one(
+            {"token_hash": self._hash(token)}, {"_id": 1}
+        )
         return result is not None
@@ -4,37 +4,58 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 
 from src.domain.entities.user import User
 from src.domain.interfaces.user_repository import UserRepository
+from src.infrastructure.hydration import hydrate
+from src.infrastructure.index_registry import IndexSpec
+from src.infrastructure.partial_update import partial_update
 
 
 class MongoUserRepository(UserRepository):
+    collection_name = "users"
+    indexes = [
+        # 로그인/가입 시 이메일 조회 (이메일 중복 방지)
+        # 가입 시 find_by_email 로도 중복을 막으므로 기존 데이터에 중복 이메일이 있어
+        # 생성에 실패해도 서비스는 가능 (drift 로 보고됨)
+        IndexSpec(name="email_unique_idx", keys=[("email", 1)], unique=True),
+    ]
+
     def __init__(self, db_client: AsyncIOMotorClient, db_name: str = "dailylog"):
-        self.collection: AsyncIOMotorCollection = db_client[db_name]["users"]
+        self.collection: AsyncIOMotorCollection = db_client[db_name][
+            self.collection_name
+        ]
 
     async def create(self, user: User) -> User:
         user_dict = user.model_dump(mode="json", exclude={"id"})
         result = await self.collection.insert_one(user_dict)
-        return User(**user_dict, id=str(result.inserted_id))
+        user_dict["_id"] = result.inserted_id
+        return hydrate(User, user_dict)
 
     async def find_by_email(self, email: str) -> Optional[User]:
         result = await self.collection.find_one({"email": email})
         if result is None:
             return None
 
-        result["id"] = str(result.pop("_id"))
-        return User(**result)
+        return hydrate(User, result)
 
     async def find_by_id(self, id: str) -> Optional[User]:
         result = await self.collection.find_one({"_id": ObjectId(id)})
         if result is None:
             return None
 
-        result["id"] = str(result.pop("_id"))
-        return User(**result)
+        return hydrate(User, result)
 
-    async def update(self, user: User) -> User:
-        user_dict = user.model_dump(mode="json", exclude={"id"})
-        await self.collection.replace_one(
-            {"_id": ObjectId(user.id)},
-            user_dict
+    async def decrement_free_trial(self, user_id: str) -> bool:
+        # 읽지 않고 조건부 $inc 한 번으로 차감 (동시에 써도 0 아래로 내려가지 않음)
+        result = await self.collection.update_one(
+            {"_id": ObjectId(user_id), "free_trial_count": {"$gt": 0}},
+            {"$inc": {"free_trial_count": -1}},
         )
+        return result.modified_count > 0
+
+    async def update(self, user: User) -> User:
+        # 문서 전체를 교체하지 않고 바뀐 필드만 $set / $inc
+        update = partial_update(user)
+        if update is not None:
+            await self.collection.update_one({"_id": ObjectId(user.id)}, update)
+            user.mark_clean()
+
         return user
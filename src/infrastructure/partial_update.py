@@ -0,0 +1,27 @@
+from typing import Any, Optional
+
+from src.domain.entities.change_tracking import ChangeTracking
+
+
+def partial_update(entity: ChangeTracking, **extra_set: Any) -> Optional[dict]:
+    """
+    Minimal update document for an entity's recorded changes.
+
+    바뀐 필드는 $set, increment 한 필드는 $inc 로 만든다.
+    extra_set 은 파생 필드(검색 n-gram 등)처럼 함께 저장할 값.
+    바뀐 것이 없으면 None (쓰기를 생략).
+    """
+    update: dict = {}
+
+    fields = entity.changed_fields() - {"id"}
+    if fields or extra_set:
+        update["$set"] = {
+            **entity.model_dump(mode="json", include=set(fields)),
+            **extra_set,
+        }
+
+    increments = entity.increments()
+    if increments:
+        update["$inc"] = increments
+
+    return update or None
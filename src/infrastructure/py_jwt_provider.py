@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 import jwt
 
@@ -20,6 +21,10 @@ class PyJWTProvider(JWTProvider):
         self.access_token_expires_minutes = access_token_expires_minutes
         self.refresh_token_expires_days = refresh_token_expires_days
 
+    @property
+    def refresh_token_lifetime(self) -> timedelta:
+        return timedelta(days=self.refresh_token_expires_days)
+
     def generate_access_token(self, user_id: str) -> str:
         """Generate short-lived access token (15 minutes)"""
         payload = {
@@ -36,9 +41,10 @@ class PyJWTProvider(JWTProvider):
         payload = {
             "user_id": user_id,
             "type": "refresh",
-            "exp": datetime.now(timezone.utc)
-            + timedelta(days=self.refresh_token_expires_days),
+            "exp": datetime.now(timezone.utc) + self.refresh_token_lifetime,
             "iat": datetime.now(timezone.utc),
+            # 같은 초에 발급된 토큰도 서로 다른 digest 를 갖도록
+            "jti": uuid4().hex,
         }
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
 
@@ -0,0 +1,21 @@
+from src.domain.interfaces.email_sender import EmailSender
+from src.domain.interfaces.job_queue import JobQueue
+
+SEND_EMAIL_JOB = "email.send"
+
+
+class QueuedEmailSender(EmailSender):
+    """
+    EmailSender that defers delivery to the background job queue.
+
+    실제 발송은 워커가 SEND_EMAIL_JOB 핸들러(ResendEmailSender)로 수행한다.
+    """
+
+    def __init__(self, job_queue: JobQueue):
+        self.job_queue = job_queue
+
+    async def send_email(self, sender: str, to: str, title: str, contents: str):
+        await self.job_queue.enqueue(
+            SEND_EMAIL_JOB,
+            {"sender": sender, "to": to, "title": title, "contents": contents},
+        )
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import resend
 
@@ -29,8 +30,8 @@ class ResendEmailSender(EmailSender):
         }
 
         try:
-            # Resend SDK is synchronous, but it's I/O bound so acceptable in async context
-            response = resend.Emails.send(params)
+            # Resend SDK is synchronous: run it off the event loop
+            response = await asyncio.to_thread(resend.Emails.send, params)
             print(response)
         except Exception as e:
             # Re-raise with more context
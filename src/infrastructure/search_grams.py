@@ -0,0 +1,39 @@
+import unicodedata
+from typing import Iterable, List
+
+
+def normalize(text: str) -> str:
+    # 조합형(NFD)으로 입력된 한글도 같은 음절로 비교되도록 NFC 로 정규화
+    return unicodedata.normalize("NFC", text).lower()
+
+
+def text_grams(text: str) -> set[str]:
+    """
+    Character unigrams and bigrams of each whitespace-separated token.
+
+    한국어는 형태소 분석 없이도 음절 bigram 으로 부분 일치 검색이 가능하다.
+    unigram 은 한 글자 검색어(예: "꽃")를 위해 함께 저장한다.
+    """
+    grams: set[str] = set()
+    for token in normalize(text).split():
+        grams.update(token)
+        grams.update(token[i : i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+def document_grams(texts: Iterable[str]) -> List[str]:
+    grams: set[str] = set()
+    for text in texts:
+        grams |= text_grams(text)
+    return sorted(grams)
+
+
+def query_grams(query: str) -> List[str]:
+    """Grams that every matching document must contain."""
+    grams: set[str] = set()
+    for token in normalize(query).split():
+        if len(token) == 1:
+            grams.add(token)
+        else:
+            grams.update(token[i : i + 2] for i in range(len(token) - 1))
+    return sorted(grams)
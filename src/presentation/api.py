@@ -1,9 +1,17 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from src.infrastructure.database import close_mongo_connection, connect_to_mongo
+from src.domain.exceptions import HasherBusyError
+
+from src.infrastructure.database import (
+    close_mongo_connection,
+    connect_to_mongo,
+    get_database,
+)
+from src.presentation.container import Container
 from src.presentation.routers import auth, chat, diary, email, password, post, user
 
 
@@ -13,11 +21,19 @@ from src.presentation.routers import auth, chat, diary, email, password, post, u
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
+async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    database = get_database()
+    if database is None:
+        raise RuntimeError("Database connection not available")
+    # SDK 클라이언트와 서비스를 앱 수명 동안 공유하는 컨테이너
+    container = Container(database)
+    app.state.container = container
+    await container.start()
     yield
     # Shutdown
+    await container.close()
     await close_mongo_connection()
 
 
@@ -30,9 +46,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 브라우저 클라이언트가 읽을 수 있도록 노출할 응답 헤더
+    # (keyset 페이지네이션 커서, 조건부 요청용 ETag)
+    expose_headers=["X-Next-Cursor", "X-Has-More", "ETag"],
 )
 
 
+# ========================================
+# Exception Handlers
+# ========================================
+
+
+@app.exception_handler(HasherBusyError)
+async def hasher_busy_handler(_: Request, exc: HasherBusyError):
+    # 비밀번호 해싱 대기열이 가득 찬 경우: 잠시 후 재시도 요청
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 # ========================================
 # Routers
 # ========================================
@@ -54,3 +88,30 @@ app.include_router(post.router)
 @app.get("/api/v1", tags=["Health"])
 async def hello():
     return {"message": "hello world"}
+
+
+@app.get("/api/v1/ready", tags=["Health"])
+async def ready(request: Request):
+    """Readiness: database reachable and declared indexes built without drift"""
+    container: Container = request.app.state.container
+    try:
+        report = await container.index_registry.status()
+    except Exception as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"ok": False, "detail": str(e)},
+        )
+
+    # degraded: 성능용 인덱스만 실패한 경우 (요청 처리는 가능)
+    ready = report["ok"] and report["build"]["state"] in ("ready", "degraded")
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=report,
+    )
+
+
+@app.get("/api/v1/metrics", tags=["Health"])
+async def metrics(request: Request):
+    """In-process counters (cache hit/miss 등) for monitoring"""
+    container: Container = request.app.state.container
+    return container.metrics()
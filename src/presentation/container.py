@@ -0,0 +1,438 @@
+import os
+from functools import cached_property
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.domain.entities.entitlement import Entitlement
+from src.domain.entities.user import User
+from src.domain.interfaces.change_generation_repository import (
+    ChangeGenerationRepository,
+)
+from src.domain.interfaces.chat_repository import ChatRepository
+from src.domain.interfaces.conversation_summarizer import ConversationSummarizer
+from src.domain.interfaces.diary_repository import DiaryRepository
+from src.domain.interfaces.email_sender import EmailSender
+from src.domain.interfaces.email_verification_code_repository import (
+    EmailVerificationCodeRepository,
+)
+from src.domain.interfaces.emotion_analyzer import EmotionAnalyzer
+from src.domain.interfaces.emotion_rollup_repository import EmotionRollupRepository
+from src.domain.interfaces.entitlement_repository import EntitlementRepository
+from src.domain.interfaces.image_generator import ImageGenerator
+from src.domain.interfaces.jwt_provider import JWTProvider
+from src.domain.interfaces.payments_repository import PaymentsRepository
+from src.domain.interfaces.post_repository import PostRepository
+from src.domain.interfaces.random_name_generator import RandomNameGenerator
+from src.domain.interfaces.refresh_token_repository import RefreshTokenRepository
+from src.domain.interfaces.user_repository import UserRepository
+from src.domain.interfaces.verification_code_generator import VerificationCodeGenerator
+from src.domain.services.auth_service import AuthService
+from src.domain.services.change_password_service import ChangePasswordService
+from src.domain.services.chat_history_service import ChatHistoryService
+from src.domain.services.conversation_window import ConversationWindow
+from src.domain.services.diary_service import (
+    ANALYZE_DIARY_EMOTION_JOB,
+    SUMMARIZE_CHAT_SESSION_JOB,
+    DiaryService,
+)
+from src.domain.services.diary_statistics_service import DiaryStatisticsService
+from src.domain.services.email_verification_service import EmailVerificationService
+from src.domain.services.post_service import PostService
+from src.domain.services.user_profile_service import UserProfileService
+from src.infrastructure.anthropic_ai_chat_bot import AnthropicAIChatBot
+from src.infrastructure.anthropic_conversation_summarizer import (
+    AnthropicConversationSummarizer,
+)
+from src.infrastructure.anthropic_emotion_analyzer import AnthropicEmotionAnalyzer
+from src.infrastructure.bcrypt_hasher import BcryptHasher
+from src.infrastructure.buffered_post_repository import BufferedPostRepository
+from src.infrastructure.cached_entitlement_repository import (
+    CachedEntitlementRepository,
+)
+from src.infrastructure.cached_user_repository import CachedUserRepository
+from src.infrastructure.cloudflare_r2_storage import CloudflareR2Storage
+from src.infrastructure.dall_e_image_generator import DallEImageGenerator
+from src.infrastructure.faker_random_name_generator import FakerRandomNameGenerator
+from src.infrastructure.index_registry import IndexRegistry
+from src.infrastructure.job_worker import JobHandler, JobWorker
+from src.infrastructure.mongo_change_generation_repository import (
+    MongoChangeGenerationRepository,
+)
+from src.infrastructure.mongo_chat_repository import MongoChatRepository
+from src.infrastructure.mongo_diary_repository import MongoDiaryRepository
+from src.infrastructure.mongo_email_verification_code_repository import (
+    MongoEmailVerificationCodeRepository,
+)
+from src.infrastructure.mongo_emotion_rollup_repository import (
+    MongoEmotionRollupRepository,
+)
+from src.infrastructure.mongo_entitlement_repository import (
+    MongoEntitlementRepository,
+)
+from src.infrastructure.mongo_job_queue import MongoJobQueue
+from src.infrastructure.mongo_payments_repository import MongoPaymentsRepository
+from src.infrastructure.mongo_post_repository import MongoPostRepository
+from src.infrastructure.mongo_refresh_token_repository import (
+    MongoRefreshTokenRepository,
+)
+from src.infrastructure.mongo_user_repository import MongoUserRepository
+from src.infrastructure.py_jwt_provider import PyJWTProvider
+from src.infrastructure.queued_email_sender import SEND_EMAIL_JOB, QueuedEmailSender
+from src.infrastructure.random_number_code_generator import RandomNumberCodeGenerator
+from src.infrastructure.resend_email_sender import ResendEmailSender
+from src.infrastructure.ttl_cache import TTLCache
+
+
+class Container:
+    """
+    App-scoped dependency container.
+
+    lifespan 에서 한 번 생성되어 app.state 에 보관된다.
+    SDK 클라이언트(Anthropic, OpenAI, boto3 등)와 상태 없는 서비스들은
+    처음 사용될 때 한 번만 생성되고, 이후 모든 요청이 같은 인스턴스와
+    커넥션 풀을 공유한다.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        job_worker_concurrency: Optional[int] = None,
+    ):
+        self.db = db
+        # 별도 워커 프로세스(worker.py)는 API 의 JOB_WORKER_CONCURRENCY 대신 자체 값을 사용
+        self.job_worker_concurrency = job_worker_concurrency
+
+    # ========================================
+    # Repositories
+    # ========================================
+
+    @cached_property
+    def payments_repository(self) -> PaymentsRepository:
+        return MongoPaymentsRepository(self.db.client, self.entitlement_repository)
+
+    @cached_property
+    def entitlement_cache(self) -> TTLCache[str, Entitlement]:
+        # 구독 중인 유저의 구독 정보를 valid_until 까지 (최대 TTL) 캐싱
+        return TTLCache(
+            max_size=int(os.getenv("ENTITLEMENT_CACHE_MAX_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("ENTITLEMENT_CACHE_TTL_SECONDS", "300")),
+        )
+
+    @cached_property
+    def entitlement_negative_cache(self) -> TTLCache[str, bool]:
+        # 구독이 없는 유저는 짧게만 캐싱 (다른 곳에서 저장된 결제는 최대 이 TTL 만큼 늦게 반영)
+        return TTLCache(
+            max_size=int(os.getenv("ENTITLEMENT_CACHE_MAX_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("ENTITLEMENT_NEGATIVE_TTL_SECONDS", "60")),
+        )
+
+    @cached_property
+    def entitlement_repository(self) -> EntitlementRepository:
+        return CachedEntitlementRepository(
+            MongoEntitlementRepository(self.db.client),
+            self.entitlement_cache,
+            self.entitlement_negative_cache,
+        )
+
+    @cached_property
+    def diary_repository(self) -> DiaryRepository:
+        return MongoDiaryRepository(self.db.client)
+
+    @cached_property
+    def buffered_post_repository(self) -> BufferedPostRepository:
+        # 조회수 증가는 메모리에서 모았다가 주기적으로 한 번에 저장
+        return BufferedPostRepository(
+            MongoPostRepository(self.db.client),
+            flush_interval_seconds=float(os.getenv("POST_VIEW_FLUSH_SECONDS", "5")),
+        )
+
+    @cached_property
+    def post_repository(self) -> PostRepository:
+        return self.buffered_post_repository
+
+    @cached_property
+    def user_cache(self) -> TTLCache[str, User]:
+        # get_current_user 가 매 요청마다 조회하는 유저 정보를 캐싱
+        return TTLCache(
+            max_size=int(os.getenv("USER_CACHE_MAX_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("USER_CACHE_TTL_SECONDS", "30")),
+        )
+
+    @cached_property
+    def user_repository(self) -> UserRepository:
+        return CachedUserRepository(
+            MongoUserRepository(self.db.client), self.user_cache
+        )
+
+    @cached_property
+    def emotion_rollup_repository(self) -> EmotionRollupRepository:
+        return MongoEmotionRollupRepository(self.db.client)
+
+    @cached_property
+    def change_generation_repository(self) -> ChangeGenerationRepository:
+        return MongoChangeGenerationRepository(self.db.client)
+
+    @cached_property
+    def refresh_token_repository(self) -> RefreshTokenRepository:
+        return MongoRefreshTokenRepository(self.db.client)
+
+    @cached_property
+    def email_verification_code_repository(self) -> EmailVerificationCodeRepository:
+        return MongoEmailVerificationCodeRepository(self.db.client)
+
+    @cached_property
+    def chat_repository(self) -> ChatRepository:
+        return MongoChatRepository(
+            self.db.client,
+            idle_ttl_seconds=float(os.getenv("CHAT_SESSION_IDLE_TTL_HOURS", "168"))
+            * 3600,
+        )
+
+    @cached_property
+    def job_queue(self) -> MongoJobQueue:
+        return MongoJobQueue(
+            self.db.client,
+            visibility_timeout_seconds=float(
+                os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300")
+            ),
+            dead_job_retention_seconds=float(
+                os.getenv("JOB_DEAD_RETENTION_HOURS", "168")
+            )
+            * 3600,
+        )
+
+    # ========================================
+    # External clients / stateless helpers
+    # ========================================
+
+    @cached_property
+    def hasher(self) -> BcryptHasher:
+        return BcryptHasher()
+
+    @cached_property
+    def jwt_provider(self) -> JWTProvider:
+        jwt_secret = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
+        return PyJWTProvider(secret_key=jwt_secret)
+
+    @cached_property
+    def email_sender(self) -> EmailSender:
+        # 서비스는 큐에 넣기만 하고, 실제 발송은 워커가 resend_email_sender 로 수행
+        return QueuedEmailSender(self.job_queue)
+
+    @cached_property
+    def resend_email_sender(self) -> EmailSender:
+        return ResendEmailSender()
+
+    @cached_property
+    def random_name_generator(self) -> RandomNameGenerator:
+        return FakerRandomNameGenerator()
+
+    @cached_property
+    def verification_code_generator(self) -> VerificationCodeGenerator:
+        return RandomNumberCodeGenerator()
+
+    @cached_property
+    def ai_chat_bot(self) -> AnthropicAIChatBot:
+        return AnthropicAIChatBot()
+
+    @cached_property
+    def image_generator(self) -> ImageGenerator:
+        return DallEImageGenerator()
+
+    @cached_property
+    def image_storage(self) -> CloudflareR2Storage:
+        return CloudflareR2Storage()
+
+    @cached_property
+    def emotion_analyzer(self) -> EmotionAnalyzer:
+        return AnthropicEmotionAnalyzer()
+
+    @cached_property
+    def conversation_summarizer(self) -> ConversationSummarizer:
+        return AnthropicConversationSummarizer()
+
+    @cached_property
+    def conversation_window(self) -> ConversationWindow:
+        # 매 턴 LLM 에 보내는 대화(system 제외) 크기의 상한
+        return ConversationWindow(
+            token_budget=int(os.getenv("CHAT_WINDOW_TOKEN_BUDGET", "6000")),
+            min_recent_messages=int(os.getenv("CHAT_WINDOW_MIN_RECENT_MESSAGES", "6")),
+        )
+
+    # ========================================
+    # Services
+    # ========================================
+
+    @cached_property
+    def auth_service(self) -> AuthService:
+        return AuthService(
+            user_repository=self.user_repository,
+            jwt_provider=self.jwt_provider,
+            hasher=self.hasher,
+            refresh_token_repository=self.refresh_token_repository,
+            random_name_generator=self.random_name_generator,
+        )
+
+    @cached_property
+    def email_verification_service(self) -> EmailVerificationService:
+        return EmailVerificationService(
+            self.email_sender,
+            self.verification_code_generator,
+            self.email_verification_code_repository,
+            self.user_repository,
+        )
+
+    @cached_property
+    def change_password_service(self) -> ChangePasswordService:
+        return ChangePasswordService(
+            self.email_verification_code_repository,
+            self.user_repository,
+            self.verification_code_generator,
+            self.email_sender,
+            self.jwt_provider,
+            self.hasher,
+        )
+
+    @cached_property
+    def chat_history_service(self) -> ChatHistoryService:
+        return ChatHistoryService(self.chat_repository, self.diary_repository)
+
+    @cached_property
+    def user_profile_service(self) -> UserProfileService:
+        return UserProfileService(self.user_repository, self.image_storage)
+
+    @cached_property
+    def diary_service(self) -> DiaryService:
+        return DiaryService(
+            self.diary_repository,
+            self.chat_repository,
+            self.ai_chat_bot,
+            self.image_generator,
+            self.image_storage,
+            self.entitlement_repository,
+            self.user_repository,
+            self.emotion_analyzer,
+            self.job_queue,
+            self.conversation_window,
+            self.conversation_summarizer,
+            self.emotion_rollup_repository,
+            self.change_generation_repository,
+        )
+
+    @cached_property
+    def post_service(self) -> PostService:
+        return PostService(self.post_repository, self.user_repository)
+
+    @cached_property
+    def diary_statistics_service(self) -> DiaryStatisticsService:
+        return DiaryStatisticsService(
+            self.diary_repository, self.emotion_rollup_repository
+        )
+
+    # ========================================
+    # Background jobs
+    # ========================================
+
+    def job_handlers(self) -> dict[str, JobHandler]:
+        async def analyze_diary_emotion(payload: dict):
+            await self.diary_service.update_diary_emotion(payload["diary_id"])
+
+        async def summarize_chat_session(payload: dict):
+            await self.diary_service.summarize_chat_session(payload["session_id"])
+
+        async def send_email(payload: dict):
+            await self.resend_email_sender.send_email(**payload)
+
+        return {
+            ANALYZE_DIARY_EMOTION_JOB: analyze_diary_emotion,
+            SUMMARIZE_CHAT_SESSION_JOB: summarize_chat_session,
+            SEND_EMAIL_JOB: send_email,
+        }
+
+    @cached_property
+    def job_worker(self) -> JobWorker:
+        return JobWorker(
+            self.job_queue,
+            self.job_handlers(),
+            concurrency=(
+                self.job_worker_concurrency
+                if self.job_worker_concurrency is not None
+                else int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+            ),
+            poll_interval_seconds=float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1")),
+        )
+
+    # ========================================
+    # Indexes
+    # ========================================
+
+    @cached_property
+    def index_registry(self) -> IndexRegistry:
+        # 각 repository 가 선언한 인덱스 (collection_name, indexes)
+        return IndexRegistry(
+            self.db,
+            [
+                MongoUserRepository,
+                MongoRefreshTokenRepository,
+                MongoEmailVerificationCodeRepository,
+                MongoChatRepository,
+                MongoDiaryRepository,
+                MongoEmotionRollupRepository,
+                MongoChangeGenerationRepository,
+                MongoPaymentsRepository,
+                MongoEntitlementRepository,
+                MongoPostRepository,
+                MongoJobQueue,
+            ],
+        )
+
+    async def start(self, run_job_worker: bool = True):
+        """Start app-scoped background tasks."""
+        # 인덱스 생성은 기다리지 않음 (/api/v1/ready 에서 진행 상태 확인)
+        self.index_registry.start()
+
+        # JOB_WORKER_CONCURRENCY=0 이면 API 프로세스에서는 워커를 띄우지 않음
+        # (worker.py 를 별도 프로세스로 실행하는 경우)
+        if run_job_worker and self.job_worker.concurrency > 0:
+            await self.job_worker.start()
+
+    def metrics(self) -> dict:
+        """In-process runtime counters for monitoring."""
+        metrics: dict = {
+            "user_cache": self.user_cache.stats(),
+            "entitlement_cache": self.entitlement_cache.stats(),
+            "entitlement_negative_cache": self.entitlement_negative_cache.stats(),
+        }
+        if "image_storage" in self.__dict__:
+            metrics["image_storage"] = self.image_storage.metrics.snapshot()
+        if "ai_chat_bot" in self.__dict__:
+            metrics["ai_chat_bot_usage"] = dict(self.ai_chat_bot.usage)
+        if "buffered_post_repository" in self.__dict__:
+            metrics["post_views"] = self.buffered_post_repository.stats()
+        return metrics
+
+    async def close(self):
+        """Release resources held by app-scoped clients."""
+        if "index_registry" in self.__dict__:
+            await self.index_registry.stop()
+        if "job_worker" in self.__dict__:
+            await self.job_worker.stop()
+        if "buffered_post_repository" in self.__dict__:
+            # DB 연결을 닫기 전에 버퍼에 남은 조회수를 저장
+            await self.buffered_post_repository.stop()
+        if "hasher" in self.__dict__:
+            self.hasher.close()
+        if "image_storage" in self.__dict__:
+            self.image_storage.close()
+
+        # 실제로 생성된 클라이언트만 정리 (cached_property 는 __dict__ 에 저장됨)
+        for name in (
+            "ai_chat_bot",
+            "emotion_analyzer",
+            "image_generator",
+            "conversation_summarizer",
+        ):
+            client = getattr(self.__dict__.get(name), "client", None)
+            if client is not None:
+                await client.close()
@@ -1,9 +1,7 @@
-import os
 from typing import Annotated, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from src.domain.entities.user import User
 from src.domain.interfaces.ai_chat_bot import AIChatBot
@@ -32,237 +30,170 @@ from src.domain.services.diary_statistics_service import DiaryStatisticsService
 from src.domain.services.email_verification_service import EmailVerificationService
 from src.domain.services.post_service import PostService
 from src.domain.services.user_profile_service import UserProfileService
-from src.infrastructure.anthropic_ai_chat_bot import AnthropicAIChatBot
-from src.infrastructure.anthropic_emotion_analyzer import AnthropicEmotionAnalyzer
-from src.infrastructure.bcrypt_hasher import BcryptHasher
-from src.infrastructure.cloudflare_r2_storage import CloudflareR2Storage
-from src.infrastructure.dall_e_image_generator import DallEImageGenerator
-from src.infrastructure.database import get_database
-from src.infrastructure.faker_random_name_generator import FakerRandomNameGenerator
-from src.infrastructure.mongo_chat_repository import MongoChatRepository
-from src.infrastructure.mongo_diary_repository import MongoDiaryRepository
-from src.infrastructure.mongo_email_verification_code_repository import (
-    MongoEmailVerificationCodeRepository,
-)
-from src.infrastructure.mongo_payments_repository import MongoPaymentsRepository
-from src.infrastructure.mongo_post_repository import MongoPostRepository
-from src.infrastructure.mongo_refresh_token_repository import (
-    MongoRefreshTokenRepository,
-)
-from src.infrastructure.mongo_user_repository import MongoUserRepository
-from src.infrastructure.py_jwt_provider import PyJWTProvider
-from src.infrastructure.random_number_code_generator import RandomNumberCodeGenerator
-from src.infrastructure.resend_email_sender import ResendEmailSender
+from src.presentation.container import Container
 
 
-def get_db() -> AsyncIOMotorDatabase:
-    """Get database connection"""
-    db = get_database()
-    if db is None:
+def get_container(request: Request) -> Container:
+    """Get app-scoped dependency container created in lifespan"""
+    container: Optional[Container] = getattr(request.app.state, "container", None)
+    if container is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database connection not available",
         )
-    return db
+    return container
 
 
 def get_payments_repository(
-    db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> PaymentsRepository:
-    return MongoPaymentsRepository(db.client)
+    return container.payments_repository
 
 
 def get_diary_repository(
-    db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> DiaryRepository:
-    return MongoDiaryRepository(db.client)
+    return container.diary_repository
 
 
 def get_post_repository(
-    db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> PostRepository:
-    return MongoPostRepository(db.client)
+    return container.post_repository
 
 
 def get_user_repository(
-    db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> UserRepository:
     """Get user repository instance"""
-    return MongoUserRepository(db.client)
+    return container.user_repository
 
 
 def get_refresh_token_repository(
-    db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> RefreshTokenRepository:
     """Get refresh token repository instance"""
-    return MongoRefreshTokenRepository(db.client)
+    return container.refresh_token_repository
 
 
 def get_email_verification_code_repository(
-    db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> EmailVerificationCodeRepository:
-    return MongoEmailVerificationCodeRepository(db.client)
+    return container.email_verification_code_repository
 
 
 def get_chat_repository(
-    db: Annotated[AsyncIOMotorDatabase, Depends(get_db)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> ChatRepository:
-    return MongoChatRepository(db.client)
+    return container.chat_repository
 
 
-def get_hasher() -> Hasher:
+def get_hasher(container: Annotated[Container, Depends(get_container)]) -> Hasher:
     """Get password hasher instance"""
-    return BcryptHasher()
+    return container.hasher
 
 
-def get_jwt_provider() -> JWTProvider:
+def get_jwt_provider(
+    container: Annotated[Container, Depends(get_container)],
+) -> JWTProvider:
     """Get JWT provider instance"""
-    jwt_secret = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
-    return PyJWTProvider(secret_key=jwt_secret)
+    return container.jwt_provider
 
 
-def get_email_sender() -> EmailSender:
-    return ResendEmailSender()
+def get_email_sender(
+    container: Annotated[Container, Depends(get_container)],
+) -> EmailSender:
+    return container.email_sender
 
 
-def get_random_name_generator() -> RandomNameGenerator:
-    return FakerRandomNameGenerator()
+def get_random_name_generator(
+    container: Annotated[Container, Depends(get_container)],
+) -> RandomNameGenerator:
+    return container.random_name_generator
 
 
-def get_verification_code_generator() -> VerificationCodeGenerator:
-    return RandomNumberCodeGenerator()
+def get_verification_code_generator(
+    container: Annotated[Container, Depends(get_container)],
+) -> VerificationCodeGenerator:
+    return container.verification_code_generator
 
 
-def get_auth_service(
-    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
-    refresh_token_repo: Annotated[
-        RefreshTokenRepository, Depends(get_refresh_token_repository)
-    ],
-    hasher: Annotated[Hasher, Depends(get_hasher)],
-    jwt_provider: Annotated[JWTProvider, Depends(get_jwt_provider)],
-    random_name_generator: Annotated[
-        RandomNameGenerator, Depends(get_random_name_generator)
-    ],
-) -> AuthService:
-    """Get auth service instance with all dependencies injected"""
-    return AuthService(
-        user_repository=user_repo,
-        jwt_provider=jwt_provider,
-        hasher=hasher,
-        refresh_token_repository=refresh_token_repo,
-        random_name_generator=random_name_generator,
-    )
+def get_ai_chat_bot(
+    container: Annotated[Container, Depends(get_container)],
+) -> AIChatBot:
+    return container.ai_chat_bot
 
 
-def get_email_verification_service(
-    email_sender: Annotated[EmailSender, Depends(get_email_sender)],
-    verification_code_generator: Annotated[
-        VerificationCodeGenerator, Depends(get_verification_code_generator)
-    ],
-    email_verification_code_repository: Annotated[
-        EmailVerificationCodeRepository, Depends(get_email_verification_code_repository)
-    ],
-    user_repository: Annotated[UserRepository, Depends(get_user_repository)],
-) -> EmailVerificationService:
-    return EmailVerificationService(
-        email_sender,
-        verification_code_generator,
-        email_verification_code_repository,
-        user_repository,
-    )
+def get_image_generator(
+    container: Annotated[Container, Depends(get_container)],
+) -> ImageGenerator:
+    return container.image_generator
 
 
-def get_change_password_service(
-    email_verification_code_repository: Annotated[
-        EmailVerificationCodeRepository, Depends(get_email_verification_code_repository)
-    ],
-    user_repository: Annotated[UserRepository, Depends(get_user_repository)],
-    verification_code_generator: Annotated[
-        VerificationCodeGenerator, Depends(get_verification_code_generator)
-    ],
-    email_sender: Annotated[EmailSender, Depends(get_email_sender)],
-    jwt_provider: Annotated[JWTProvider, Depends(get_jwt_provider)],
-    hasher: Annotated[Hasher, Depends(get_hasher)],
-):
-    service = ChangePasswordService(
-        email_verification_code_repository,
-        user_repository,
-        verification_code_generator,
-        email_sender,
-        jwt_provider,
-        hasher,
-    )
+def get_image_storage(
+    container: Annotated[Container, Depends(get_container)],
+) -> ImageStorage:
+    return container.image_storage
+
 
-    return service
+def get_emotion_analyzer(
+    container: Annotated[Container, Depends(get_container)],
+) -> EmotionAnalyzer:
+    return container.emotion_analyzer
 
 
-def get_ai_chat_bot() -> AIChatBot:
-    return AnthropicAIChatBot()
+# 서비스들은 상태가 없으므로 컨테이너에서 한 번만 생성해 재사용한다.
+# 각 엔드포인트는 자신이 사용하는 서비스만 resolve 하고,
+# 서비스가 의존하는 SDK 클라이언트는 앱 전체에서 최초 1회만 생성된다.
 
 
-def get_image_generator() -> ImageGenerator:
-    return DallEImageGenerator()
+def get_auth_service(
+    container: Annotated[Container, Depends(get_container)],
+) -> AuthService:
+    """Get auth service instance with all dependencies injected"""
+    return container.auth_service
 
 
-def get_image_storage() -> ImageStorage:
-    return CloudflareR2Storage()
+def get_email_verification_service(
+    container: Annotated[Container, Depends(get_container)],
+) -> EmailVerificationService:
+    return container.email_verification_service
 
 
-def get_emotion_analyzer() -> EmotionAnalyzer:
-    return AnthropicEmotionAnalyzer()
+def get_change_password_service(
+    container: Annotated[Container, Depends(get_container)],
+) -> ChangePasswordService:
+    return container.change_password_service
 
 
 def get_chat_history_service(
-    chat_repository: Annotated[ChatRepository, Depends(get_chat_repository)],
-    diary_repository: Annotated[DiaryRepository, Depends(get_diary_repository)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> ChatHistoryService:
-    service = ChatHistoryService(chat_repository, diary_repository)
-    return service
+    return container.chat_history_service
 
 
 def get_user_profile_service(
-    user_repository: Annotated[UserRepository, Depends(get_user_repository)],
-    image_storage: Annotated[ImageStorage, Depends(get_image_storage)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> UserProfileService:
-    service = UserProfileService(user_repository, image_storage)
-    return service
+    return container.user_profile_service
 
 
 def get_diary_service(
-    diary_repository: Annotated[DiaryRepository, Depends(get_diary_repository)],
-    chat_repository: Annotated[ChatRepository, Depends(get_chat_repository)],
-    ai_chat_bot: Annotated[AIChatBot, Depends(get_ai_chat_bot)],
-    image_generator: Annotated[ImageGenerator, Depends(get_image_generator)],
-    image_storage: Annotated[ImageStorage, Depends(get_image_storage)],
-    payments_repository: Annotated[
-        PaymentsRepository, Depends(get_payments_repository)
-    ],
-    user_repository: Annotated[UserRepository, Depends(get_user_repository)],
-    emotion_analyzer: Annotated[EmotionAnalyzer, Depends(get_emotion_analyzer)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> DiaryService:
-    return DiaryService(
-        diary_repository,
-        chat_repository,
-        ai_chat_bot,
-        image_generator,
-        image_storage,
-        payments_repository,
-        user_repository,
-        emotion_analyzer,
-    )
+    return container.diary_service
 
 
 def get_post_service(
-    post_repository: Annotated[PostRepository, Depends(get_post_repository)],
-    user_repository: Annotated[UserRepository, Depends(get_user_repository)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> PostService:
-    return PostService(post_repository, user_repository)
+    return container.post_service
 
 
 def get_diary_statistics_service(
-    diary_repository: Annotated[DiaryRepository, Depends(get_diary_repository)],
+    container: Annotated[Container, Depends(get_container)],
 ) -> DiaryStatisticsService:
-    return DiaryStatisticsService(diary_repository)
+    return container.diary_statistics_service
 
 
 # HTTPBearer security scheme
@@ -301,7 +232,7 @@ async def get_current_user(
                 detail="Invalid token: user_id not found in payload",
             )
 
-        # Fetch user from database
+        # Fetch user (in-process 캐시 우선, 없으면 database 조회)
         user = await user_repository.find_by_id(user_id)
         if user is None:
             raise HTTPException(
@@ -317,3 +248,34 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid authentication credentials: {str(e)}",
         )
+
+
+# 인증이 선택인 엔드포인트용 (토큰이 없어도 401 을 내지 않음)
+optional_security = HTTPBearer(auto_error=False)
+
+
+async def get_viewer_id(
+    request: Request,
+    credentials: Annotated[
+        Optional[HTTPAuthorizationCredentials], Depends(optional_security)
+    ],
+    jwt_provider: Annotated[JWTProvider, Depends(get_jwt_provider)],
+) -> str:
+    """
+    Identify a viewer for unique-viewer counting.
+
+    유효한 access token 이 있으면 유저 id (유저 조회 없이 토큰만 검증),
+    없거나 유효하지 않으면 클라이언트 IP 로 식별한다.
+    프록시 뒤에서는 uvicorn 의 proxy_headers 설정(main.py)이 신뢰한 프록시의
+    X-Forwarded-For 로 request.client 를 실제 클라이언트 IP 로 바꿔준다.
+    """
+    if credentials is not None:
+        try:
+            user_id = jwt_provider.verify_token(credentials.credentials).get("user_id")
+            if user_id:
+                return f"user:{user_id}"
+        except Exception:
+            pass
+
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
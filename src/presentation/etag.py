@@ -0,0 +1,41 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the values that determine a response body."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    # 유저별 응답이므로 공유 캐시에는 저장하지 않고, 쓸 때마다 재검증
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match 는 weak 비교 (W/ 접두사 무시)
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+def conditional(request: Request, response: Response) -> Response:
+    """
+    ETag from the rendered body, for reads without a cheaper version source.
+
+    본문을 만든 뒤 비교하므로 DB 조회/직렬화는 줄지 않고 전송량만 줄어든다.
+    """
+    etag = make_etag(hashlib.sha256(response.body).hexdigest())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return response
@@ -0,0 +1,9 @@
+from src.domain.entities.page import Page
+
+
+def pagination_headers(page: Page) -> dict[str, str]:
+    """Expose the next-page cursor via headers, keeping list response bodies."""
+    headers = {"X-Has-More": "true" if page.has_more else "false"}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return headers
@@ -0,0 +1,39 @@
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def _adapter(type_: Any) -> TypeAdapter:
+    # 응답 타입별 직렬화기는 처음 사용할 때 한 번만 생성
+    if type_ not in _adapters:
+        _adapters[type_] = TypeAdapter(type_)
+    return _adapters[type_]
+
+
+class ModelResponse(Response):
+    """
+    JSON response serialized once by pydantic-core.
+
+    엔드포인트가 Response 를 반환하면 FastAPI 는 response_model 로 다시 검증하고
+    dict -> JSON 으로 변환하는 과정을 건너뛴다. 이미 만들어진 엔티티를 그대로
+    dump_json 하므로 큰 목록/대화 세션 응답의 비용이 줄어든다.
+    OpenAPI 스키마를 위해 라우트의 response_model 선언은 그대로 둔다.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        type_: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.type_ = type_
+        super().__init__(content, status_code, headers)
+
+    def render(self, content: Any) -> bytes:
+        return _adapter(self.type_).dump_json(content)
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 
 from src.domain.exceptions import (
     EmailAlreadyExistsError,
+    NotFoundError,
     PasswordLengthNotEnoughError,
     PasswordNotCorrectError,
     UserNotFoundError,
@@ -87,5 +88,12 @@ async def refresh_token(
     request: RefreshTokenRequest,
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
 ):
-    result = await auth_service.refresh_token(request.refreshToken)
-    return AuthTokenResponse(**result)
+    try:
+        result = await auth_service.refresh_token(request.refreshToken)
+        return AuthTokenResponse(**result)
+    except (NotFoundError, UserNotFoundError, ValueError):
+        # 만료/위조되었거나 이미 교체된(재사용된) refresh token
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
@@ -1,12 +1,22 @@
-from typing import Annotated
+import json
+from typing import Annotated, AsyncIterator
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.domain.entities.chat import ChatMessage, ChatSession
 from src.domain.entities.user import User
+from src.domain.exceptions import NotFoundError
 from src.domain.services.diary_service import DiaryService
 from src.presentation.dependencies import get_current_user, get_diary_service
+from src.presentation.etag import (
+    etag_headers,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from src.presentation.responses import ModelResponse
 
 router = APIRouter(prefix="/api/v1", tags=["Chat Sessions"])
 
@@ -32,11 +42,25 @@ class ChatSendMessageRequest(BaseModel):
     status_code=status.HTTP_200_OK,
 )
 async def get_current_chat_session(
+    request: Request,
     diary_service: Annotated[DiaryService, Depends(get_diary_service)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
+    # 세션 전체를 읽기 전에 (id, updated_at) 만 조회해 변경 여부 확인
+    version = await diary_service.get_chat_session_version(current_user)
+    if version is not None:
+        etag = make_etag(current_user.id, version)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
     current_session = await diary_service.get_chat_session(current_user)
-    return current_session
+
+    if version is None:
+        # 방금 새 세션이 만들어진 경우
+        version = await diary_service.get_chat_session_version(current_user)
+        etag = make_etag(current_user.id, version)
+
+    return ModelResponse(current_session, ChatSession, headers=etag_headers(etag))
 
 
 @router.delete("/chat-current-session")
@@ -56,5 +80,74 @@ async def send_message(
     request: ChatSendMessageRequest,
     diary_service: Annotated[DiaryService, Depends(get_diary_service)],
 ):
-    reply = await diary_service.send_chat_message(request.message, request.session_id)
+    try:
+        reply = await diary_service.send_chat_message(
+            request.message, request.session_id
+        )
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="채팅 세션을 찾을 수 없습니다.",
+        )
     return reply
+
+
+def _sse_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post(
+    "/chat/message/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def send_message_stream(
+    request: ChatSendMessageRequest,
+    diary_service: Annotated[DiaryService, Depends(get_diary_service)],
+):
+    """
+    Send a chat message and stream the reply as Server-Sent Events.
+
+    - `delta` events carry `{"text": ...}` chunks as they are generated
+    - a final `message` event carries the persisted ChatMessage
+    - an `error` event is sent if generation fails midway
+    - a missing session is a 404 before the stream starts
+    """
+    # 스트림을 시작하면 상태 코드를 바꿀 수 없으므로 세션은 미리 조회
+    try:
+        session = await diary_service.find_chat_session(request.session_id)
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="채팅 세션을 찾을 수 없습니다.",
+        )
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for item in diary_service.stream_chat_message(
+                request.message, session
+            ):
+                if isinstance(item, str):
+                    yield _sse_event(
+                        "delta", json.dumps({"text": item}, ensure_ascii=False)
+                    )
+                else:
+                    yield _sse_event("message", item.model_dump_json())
+        except Exception as e:
+            # 내부 오류 내용은 서버 로그에만 남기고 클라이언트에는 일반 메시지만 전달
+            print(f"⚠️  Chat stream failed: {e}")
+            yield _sse_event(
+                "error",
+                json.dumps(
+                    {"detail": "응답을 생성하지 못했습니다. 다시 시도해 주세요."},
+                    ensure_ascii=False,
+                ),
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # 프록시(nginx 등)가 응답을 버퍼링하지 않도록
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,12 +1,14 @@
 from datetime import date, timedelta
 from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel, Field
 
 from src.domain.entities.chat import ChatSession
-from src.domain.entities.diary import Diary, Emotion
+from src.domain.entities.diary import Diary, DiarySummary, Emotion
+from src.domain.entities.emotion_rollup import RollupGranularity
 from src.domain.entities.user import User
+from src.domain.exceptions import InvalidCursorError
 from src.domain.services.chat_history_service import ChatHistoryService
 from src.domain.services.diary_service import DiaryService
 from src.domain.services.diary_statistics_service import DiaryStatisticsService
@@ -16,6 +18,15 @@ from src.presentation.dependencies import (
     get_diary_service,
     get_diary_statistics_service,
 )
+from src.presentation.etag import (
+    conditional,
+    etag_headers,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from src.presentation.pagination import pagination_headers
+from src.presentation.responses import ModelResponse
 
 router = APIRouter(prefix="/api/v1", tags=["Diaries"])
 
@@ -43,8 +54,14 @@ class DiaryTagsUpdateRequest(BaseModel):
 
 
 class GetNextAndPrevDiariesResponse(BaseModel):
-    next: Optional[Diary]
-    prev: Optional[Diary]
+    next: Optional[DiarySummary]
+    prev: Optional[DiarySummary]
+
+
+class DiaryWithNeighboursResponse(Diary):
+    # include_neighbours=true 일 때만 포함
+    next: Optional[DiarySummary] = Field(default=None)
+    prev: Optional[DiarySummary] = Field(default=None)
 
 
 class WriteDiaryDirectRequest(BaseModel):
@@ -75,28 +92,67 @@ class EmotionTimelineResponse(BaseModel):
     summary: EmotionSummary
 
 
+class EmotionStatisticsBucket(BaseModel):
+    bucket: date = Field(description="First day of the day/week/month bucket")
+    total_count: int = Field(description="Diaries with analyzed emotion in bucket")
+    emotion_counts: dict[str, int] = Field(description="Count by emotion type")
+    average_score: float = Field(description="Average emotion score (0 to 10)")
+
+
+class EmotionStatisticsResponse(BaseModel):
+    group_by: RollupGranularity
+    buckets: List[EmotionStatisticsBucket]
+    total_count: int = Field(description="Total diaries across buckets")
+    emotion_counts: dict[str, int] = Field(description="Count by emotion type")
+    most_common_emotion: Optional[str] = Field(
+        default=None, description="Most frequent emotion"
+    )
+
+
 # ========================================
 # Endpoints
 # ========================================
 
 
+async def _diaries_etag(
+    request: Request, diary_service: DiaryService, user: User
+) -> str:
+    # 유저의 일기가 바뀔 때마다 올라가는 generation + 요청(경로, 쿼리)
+    generation = await diary_service.get_change_generation(user)
+    return make_etag(user.id, generation, request.url.path, request.url.query)
+
+
 @router.get(
     "/diaries",
     response_model=List[Diary],
     status_code=status.HTTP_200_OK,
 )
 async def get_diary_list(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     diary_service: Annotated[DiaryService, Depends(get_diary_service)],
     cursor_id: Annotated[
-        Optional[str], Query(description="Cursor ID for pagination")
+        Optional[str],
+        Query(description="Pagination cursor (X-Next-Cursor of the previous page)"),
     ] = None,
     size: Annotated[
         int, Query(ge=1, le=100, description="Number of diaries to fetch")
     ] = 30,
 ):
-    diaries = await diary_service.get_diary_list(current_user, cursor_id, size)
-    return diaries
+    etag = await _diaries_etag(request, diary_service, current_user)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    try:
+        page = await diary_service.get_diary_list(current_user, cursor_id, size)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return ModelResponse(
+        page.items,
+        List[Diary],
+        headers={**pagination_headers(page), **etag_headers(etag)},
+    )
 
 
 @router.get(
@@ -105,21 +161,33 @@ async def get_diary_list(
     status_code=status.HTTP_200_OK,
 )
 async def search_diaries(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     diary_service: Annotated[DiaryService, Depends(get_diary_service)],
     query: Annotated[str, Query(description="Search keyword for title or content")],
     cursor_id: Annotated[
-        Optional[str], Query(description="Cursor ID for pagination")
+        Optional[str],
+        Query(description="Pagination cursor (X-Next-Cursor of the previous page)"),
     ] = None,
     size: Annotated[
         int, Query(ge=1, le=100, description="Number of diaries to fetch")
     ] = 30,
 ):
+    etag = await _diaries_etag(request, diary_service, current_user)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
     try:
-        diaries = await diary_service.search_diaries(
+        page = await diary_service.search_diaries(
             current_user, query, cursor_id, size
         )
-        return diaries
+        return ModelResponse(
+            page.items,
+            List[Diary],
+            headers={**pagination_headers(page), **etag_headers(etag)},
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -133,18 +201,30 @@ async def search_diaries(
     status_code=status.HTTP_200_OK,
 )
 async def get_saved_diaries(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     diary_service: Annotated[DiaryService, Depends(get_diary_service)],
     cursor_id: Annotated[
-        Optional[str], Query(description="Cursor ID for pagination")
+        Optional[str],
+        Query(description="Pagination cursor (X-Next-Cursor of the previous page)"),
     ] = None,
     size: Annotated[
         int, Query(ge=1, le=100, description="Number of diaries to fetch")
     ] = 30,
 ):
+    etag = await _diaries_etag(request, diary_service, current_user)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
     try:
-        diaries = await diary_service.get_saved_diaries(current_user, cursor_id, size)
-        return diaries
+        page = await diary_service.get_saved_diaries(current_user, cursor_id, size)
+        return ModelResponse(
+            page.items,
+            List[Diary],
+            headers={**pagination_headers(page), **etag_headers(etag)},
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -158,7 +238,9 @@ async def get_saved_diaries(
     status_code=status.HTTP_200_OK,
 )
 async def get_emotion_timeline(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
+    diary_service: Annotated[DiaryService, Depends(get_diary_service)],
     statistics_service: Annotated[
         DiaryStatisticsService, Depends(get_diary_statistics_service)
     ],
@@ -187,27 +269,35 @@ async def get_emotion_timeline(
             detail="start_date must be before or equal to end_date",
         )
 
+    # 기본 날짜 범위는 오늘 기준이므로 쿼리 대신 실제 범위로 ETag 생성
+    generation = await diary_service.get_change_generation(current_user)
+    etag = make_etag(current_user.id, generation, "timeline", start_date, end_date)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
     try:
-        diaries, summary = await statistics_service.get_emotions_timeline(
+        entries, summary = await statistics_service.get_emotions_timeline(
             current_user.id, start_date, end_date
         )
 
-        # Response 형식으로 변환 (defensive check for None emotions)
-        timeline = []
-        for diary in diaries:
-            if diary.emotion is not None:  # Type narrowing for mypy
-                timeline.append(
-                    EmotionTimelinePoint(
-                        diary_date=diary.writed_at,
-                        emotion=diary.emotion,
-                        emotion_score=diary.emotion.score(),
-                        diary_id=diary.id,
-                        title=diary.title,
-                    )
-                )
-
-        return EmotionTimelineResponse(
-            timeline=timeline, summary=EmotionSummary(**summary)
+        # Response 형식으로 변환
+        timeline = [
+            EmotionTimelinePoint(
+                diary_date=entry.writed_at,
+                emotion=entry.emotion,
+                emotion_score=entry.emotion.score(),
+                diary_id=entry.diary_id,
+                title=entry.title,
+            )
+            for entry in entries
+        ]
+
+        return ModelResponse(
+            EmotionTimelineResponse(
+                timeline=timeline, summary=EmotionSummary(**summary)
+            ),
+            EmotionTimelineResponse,
+            headers=etag_headers(etag),
         )
     except Exception as e:
         raise HTTPException(
@@ -216,6 +306,50 @@ async def get_emotion_timeline(
         )
 
 
+@router.get(
+    "/diaries/statistics",
+    response_model=EmotionStatisticsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_emotion_statistics(
+    current_user: Annotated[User, Depends(get_current_user)],
+    statistics_service: Annotated[
+        DiaryStatisticsService, Depends(get_diary_statistics_service)
+    ],
+    group_by: Annotated[
+        RollupGranularity, Query(description="Bucket size: day, week or month")
+    ] = RollupGranularity.DAY,
+    start_date: Annotated[
+        Optional[date], Query(description="Filter start date (inclusive)")
+    ] = None,
+    end_date: Annotated[
+        Optional[date], Query(description="Filter end date (inclusive)")
+    ] = None,
+):
+    """
+    Get emotion statistics grouped by day, week or month.
+
+    Served from pre-aggregated rollups; buckets at the range edges cover
+    their whole week/month.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be before or equal to end_date",
+        )
+
+    try:
+        statistics = await statistics_service.get_statistics(
+            current_user.id, start_date, end_date, group_by
+        )
+        return EmotionStatisticsResponse(**statistics)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch emotion statistics: {str(e)}",
+        )
+
+
 @router.get("/diary", response_model=Diary)
 async def find_diary_by_date(
     diary_service: Annotated[DiaryService, Depends(get_diary_service)],
@@ -231,17 +365,33 @@ async def find_diary_by_date(
 
 @router.get(
     "/diary/{diary_id}",
-    response_model=Diary,
+    response_model=DiaryWithNeighboursResponse,
     status_code=status.HTTP_200_OK,
 )
 async def find_diary(
-    diary_service: Annotated[DiaryService, Depends(get_diary_service)], diary_id: str
+    request: Request,
+    diary_service: Annotated[DiaryService, Depends(get_diary_service)],
+    diary_id: str,
+    include_neighbours: Annotated[
+        bool, Query(description="Embed next/prev diary summaries")
+    ] = False,
 ):
     try:
-        return await diary_service.get_diary_by_id(diary_id)
+        if not include_neighbours:
+            diary = await diary_service.get_diary_by_id(diary_id)
+            return conditional(request, ModelResponse(diary, Diary))
+
+        diary, next, prev = await diary_service.get_diary_with_neighbours(diary_id)
     except Exception:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
+    response = DiaryWithNeighboursResponse(
+        **diary.model_dump(), next=next, prev=prev
+    )
+    return conditional(
+        request, ModelResponse(response, DiaryWithNeighboursResponse)
+    )
+
 
 @router.get(
     "/diary/{diary_id}/chat_session",
@@ -255,7 +405,7 @@ async def get_chat_session_from_diary_id(
 ):
     try:
         chat_session = await chat_history_service.find_session(diary_id)
-        return chat_session
+        return ModelResponse(chat_session, ChatSession)
     except Exception as e:
         raise e
 
@@ -1,11 +1,18 @@
 from typing import Annotated, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
 
 from src.domain.entities.post import Post
 from src.domain.entities.user import User
+from src.domain.exceptions import InvalidCursorError, NotFoundError
 from src.domain.services.post_service import PostService
-from src.presentation.dependencies import get_current_user, get_post_service
+from src.presentation.dependencies import (
+    get_current_user,
+    get_post_service,
+    get_viewer_id,
+)
+from src.presentation.pagination import pagination_headers
+from src.presentation.responses import ModelResponse
 
 
 router = APIRouter(prefix="/api/v1", tags=["Posts"])
@@ -30,19 +37,22 @@ class PostAndUserResponse(BaseModel):
 # ========================================
 
 
-@router.get("/post")
+@router.get("/post", response_model=List[Post])
 async def get_post_list(
     post_service: Annotated[PostService, Depends(get_post_service)],
     cursor_id: Annotated[
-        Optional[str], Query(description="Cursor ID for pagination")
+        Optional[str],
+        Query(description="Pagination cursor (X-Next-Cursor of the previous page)"),
     ] = None,
     size: Annotated[
         int, Query(ge=1, le=100, description="Number of posts to fetch")
     ] = 30,
-) -> List[Post]:
+) -> Response:
     try:
-        post_list = await post_service.get_post_list(cursor_id, size)
-        return post_list
+        page = await post_service.get_post_list(cursor_id, size)
+        return ModelResponse(page.items, List[Post], headers=pagination_headers(page))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -104,8 +114,13 @@ async def update_post(
 async def view_post(
     post_id: str,
     post_service: Annotated[PostService, Depends(get_post_service)],
+    viewer_id: Annotated[str, Depends(get_viewer_id)],
 ):
-    await post_service.view_post(post_id)
+    # 로그인한 유저는 유저 id, 아니면 IP 로 고유 방문자(unique_viewers)를 센다
+    try:
+        await post_service.view_post(post_id, viewer_id)
+    except NotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
 
 @router.delete("/post/{post_id}")
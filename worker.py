@@ -0,0 +1,41 @@
+import asyncio
+import os
+import signal
+
+from src.infrastructure.database import (
+    close_mongo_connection,
+    connect_to_mongo,
+    get_database,
+)
+from src.presentation.container import Container
+
+
+async def run():
+    await connect_to_mongo()
+    database = get_database()
+    if database is None:
+        raise RuntimeError("Database connection not available")
+
+    # API 프로세스의 JOB_WORKER_CONCURRENCY 와 별개로 워커 프로세스의 동시 실행 수를 설정
+    container = Container(
+        database,
+        job_worker_concurrency=int(os.getenv("WORKER_JOB_CONCURRENCY", "2")),
+    )
+    await container.job_worker.start()
+
+    # SIGTERM/SIGINT 을 받으면 진행 중인 작업을 마무리하고 종료
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await stop_event.wait()
+
+    await container.close()
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    # API 와 별도 프로세스로 백그라운드 작업 실행
+    # (이 경우 API 쪽은 JOB_WORKER_CONCURRENCY=0 으로 설정)
+    asyncio.run(run())